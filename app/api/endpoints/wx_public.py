@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Body, Response, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from app.services.wx_public import (
     fetch_wx_public, 
     fetch_wx_article_list, 
+    fetch_wx_all_articles_stream,
+    fetch_wx_rate_limit_budget,
     fetch_wx_article_detail_by_link,
+    fetch_wx_article_detail_batch,
+    fetch_oss_upload_job,
+    fetch_oss_upload_jobs,
     fetch_set_wx_cookie_token,
     fetch_prelogin,
     fetch_webreport,
@@ -18,9 +24,10 @@ from app.services.wx_public import (
     fetch_verify_user_info,
     export_articles_to_excel,
 )
-from app.schemas.wx_data import ArticleDetailRequest, ArticleListRequest, CookieTokenRequest, PreloginRequest, WebreportRequest, StartLoginRequest, RedirectLoginInfoRequest, EducationAnalyzeRequest, EducationAnalyzeByIdRequest, GetAllArticlesInfoByIdRequest, ExportArticlesToExcelRequest
+from app.schemas.wx_data import ArticleDetailRequest, ArticleDetailBatchRequest, ArticleListRequest, AllArticlesStreamRequest, CredentialPoolAddRequest, CredentialPoolRemoveRequest, CookieTokenRequest, PreloginRequest, WebreportRequest, StartLoginRequest, RedirectLoginInfoRequest, EducationAnalyzeRequest, EducationAnalyzeByIdRequest, GetAllArticlesInfoByIdRequest, ExportArticlesToExcelRequest
 from app.ai.code.education_analyze import analyze_education_articles, analyze_education_articles_by_id, get_all_articles_info_by_id
 from app.schemas.common_data import ApiResponseData
+from app.services.wx_credential_pool import wx_credential_pool
 from app.decorators.cache_decorator import ttl_cache, timed_cache, get_cache
 
 
@@ -43,6 +50,53 @@ async def get_wx_article_list(request: Request, params: ArticleListRequest):
     result = await fetch_wx_article_list(request, params)
     return result
 
+# 并发抓取公众号全部历史文章（NDJSON 流式返回）
+@router.post("/stream-wx-all-articles")
+async def stream_wx_all_articles(request: Request, params: AllArticlesStreamRequest):
+    """并发抓取公众号全部历史文章，按 aid 去重后以 NDJSON 流式返回
+
+    每行一个 JSON 对象，type 取值：meta / article / error / done
+
+    请求体示例:
+    ```json
+    {
+        "wx_public_id": "公众号ID",
+        "count": 20,
+        "concurrency": 5
+    }
+    ```
+    """
+    stream = await fetch_wx_all_articles_stream(request, params)
+    return StreamingResponse(stream, media_type="application/x-ndjson")
+
+# 查询微信请求限流预算
+@router.get("/rate-limit-budget", response_model=ApiResponseData)
+async def get_rate_limit_budget(request: Request,
+                                all_accounts: bool = Query(False, description="是否返回所有账号的限流预算")):
+    """查询当前凭证的限流预算（当前速率、可用令牌、冷却剩余时间、频控次数等）"""
+    result = await fetch_wx_rate_limit_budget(request, all_accounts)
+    return result
+
+# 多账号凭证池
+@router.get("/credential-pool", response_model=ApiResponseData)
+async def get_credential_pool():
+    """查询凭证池状态（账号列表、并发数、隔离状态）"""
+    return wx_credential_pool.status()
+
+@router.post("/credential-pool/add", response_model=ApiResponseData)
+async def add_credential_to_pool(params: CredentialPoolAddRequest):
+    """将一个已登录账号加入凭证池（重复加入会更新 cookies/token 并解除隔离）"""
+    key = wx_credential_pool.add(params.cookies, params.token, {"nick_name": params.nick_name})
+    if not key:
+        raise HTTPException(status_code=400, detail="cookies 或 token 不完整，无法加入凭证池")
+    return {"success": True, "key": key}
+
+@router.post("/credential-pool/remove", response_model=ApiResponseData)
+async def remove_credential_from_pool(params: CredentialPoolRemoveRequest):
+    """将账号移出凭证池"""
+    success = wx_credential_pool.remove(params.key)
+    return {"success": success}
+
 # 根据文章链接请求得到文章详情（需要传递公众号id以及公众号名称，做网站本地化保存使用）
 @router.post("/get-wx-article-detail-by-link", response_model=ApiResponseData)
 async def get_wx_article_detail_by_link(request: Request, params: ArticleDetailRequest):
@@ -62,6 +116,40 @@ async def get_wx_article_detail_by_link(request: Request, params: ArticleDetailR
     result = await fetch_wx_article_detail_by_link(request, params)
     return result
 
+# 批量下载文章详情
+@router.post("/get-wx-article-detail-batch", response_model=ApiResponseData)
+async def get_wx_article_detail_batch(request: Request, params: ArticleDetailBatchRequest):
+    """批量下载文章详情（保存到本地 / 上传阿里云），返回每篇文章的处理状态
+
+    请求体示例:
+    ```json
+    {
+        "items": [
+            {
+                "article_link": "文章链接",
+                "wx_public_id": "公众号ID",
+                "wx_public_name": "公众号名称",
+                "is_save_to_local": true
+            }
+        ],
+        "concurrency": 4
+    }
+    ```
+    """
+    result = await fetch_wx_article_detail_batch(request, params)
+    return result
+
+# 阿里云 OSS 后台上传任务
+@router.get("/oss-upload/jobs/{job_id}", response_model=ApiResponseData)
+async def get_oss_upload_job(job_id: str):
+    """查询 OSS 后台上传任务状态（pending / uploading / success / skipped / failed）"""
+    return fetch_oss_upload_job(job_id)
+
+@router.get("/oss-upload/jobs", response_model=ApiResponseData)
+async def get_oss_upload_jobs(limit: int = Query(50, ge=1, le=1000, description="返回的任务数")):
+    """查询最近的 OSS 后台上传任务"""
+    return fetch_oss_upload_jobs(limit)
+
 # 设置cookie、token接口
 @router.post("/set-wx-cookie-token", response_model=ApiResponseData)
 async def set_wx_cookie_token(params: CookieTokenRequest):
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, Request
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Response, Request, Query
 from loguru import logger
+from sse_starlette.sse import EventSourceResponse
 
 from app.services.xmly import (
     fetch_xmly_generate_qrcode,
@@ -16,6 +19,10 @@ from app.services.xmly import (
     get_subscribed_albums
 )
 from app.services.xmly_download import batch_get_tracks_download_info, get_track_play_url
+from app.services.xmly_download_jobs import xmly_download_jobs
+from app.utils.download_events import download_event_bus
+from app.utils.stream_ticket import stream_ticket_store
+from app.core.config import settings
 from app.services.system import system_manager
 from app.schemas.common_data import ApiResponseData
 from app.schemas.xmly_data import (
@@ -419,6 +426,115 @@ async def xmly_get_album_download_status(request: Request, params: dict):
         raise HTTPException(status_code=500, detail=f"查询专辑下载状态失败: {str(e)}")
 
 
+# 喜马拉雅专辑下载进度推送接口（SSE）
+@router.get("/album/download-events")
+async def xmly_album_download_events(request: Request,
+                                     albumId: str = Query("", description="专辑ID（为空时推送所有专辑的事件）")):
+    """
+    订阅专辑下载进度（Server-Sent Events，替代轮询 /album/download-status）
+
+    event 字段为事件类型，data 为事件 JSON：
+    - progress：{"track_id", "title", "bytes_written", "total_bytes"}，每个音频按间隔合并推送最新值
+    - completed / failed：单个音频下载结束（failed 附带 error）
+    - album：专辑下载汇总；job：专辑下载任务状态变化
+
+    鉴权：浏览器原生 EventSource 不能设置 Authorization / X-Device-Id 请求头，
+    先调用 /album/download-events/ticket 获取短期票据，再用 query 参数 ticket 连接
+    （见 PermissionMiddleware.TICKET_CREDENTIAL_PATHS，前端 xmlyService.subscribeAlbumDownloadEvents）；
+    基于 fetch 的 SSE 客户端仍可直接带请求头。
+    """
+    async def _event_stream():
+        async for event in download_event_bus.subscribe(albumId or None):
+            if await request.is_disconnected():
+                break
+            yield {"event": event["type"], "id": str(event["seq"]), "data": json.dumps(event, ensure_ascii=False)}
+
+    return EventSourceResponse(_event_stream(), ping=settings.DOWNLOAD_EVENTS_PING_INTERVAL)
+
+
+# 喜马拉雅专辑下载进度推送订阅票据接口
+@router.post("/album/download-events/ticket", response_model=ApiResponseData)
+async def xmly_album_download_events_ticket(request: Request):
+    """
+    签发 /album/download-events 的订阅票据（本接口按正常请求头做权限校验）
+
+    Returns:
+        ticket: 票据（作为 query 参数 ticket 连接 SSE）；expires_in: 有效期（秒）
+    """
+    events_path = request.url.path[:-len("/ticket")]
+    return stream_ticket_store.issue(events_path)
+
+
+# 喜马拉雅专辑下载任务列表接口
+@router.post("/album/download-jobs", response_model=ApiResponseData)
+async def xmly_list_album_download_jobs(params: dict):
+    """
+    查询专辑下载任务（按提交时间倒序）
+
+    Args:
+        status: 任务状态过滤（可选：queued / running / paused / completed / failed / cancelled）
+        albumId: 专辑ID过滤（可选）
+        limit: 返回数量（默认50）
+
+    Returns:
+        任务列表和队列状态
+    """
+    try:
+        jobs = xmly_download_jobs.list_jobs(
+            status=params.get("status") or None,
+            album_id=params.get("albumId") or None,
+            limit=int(params.get("limit", 50))
+        )
+        return {"jobs": jobs, "queue": xmly_download_jobs.status()}
+    except Exception as e:
+        logger.error(f"查询专辑下载任务失败: {e}")
+        raise HTTPException(status_code=500, detail=f"查询专辑下载任务失败: {str(e)}")
+
+
+async def _control_album_download_job(params: dict, action: str):
+    """暂停 / 恢复 / 取消专辑下载任务"""
+    job_id = params.get("jobId", "")
+    if not job_id:
+        raise HTTPException(status_code=400, detail="缺少参数 jobId")
+    return await getattr(xmly_download_jobs, action)(job_id)
+
+
+# 喜马拉雅暂停专辑下载任务接口
+@router.post("/album/download-job/pause", response_model=ApiResponseData)
+async def xmly_pause_album_download_job(params: dict):
+    """
+    暂停排队中或下载中的专辑下载任务（正在下载的音频下次断点续传）
+
+    Args:
+        jobId: 任务ID
+    """
+    return await _control_album_download_job(params, "pause")
+
+
+# 喜马拉雅恢复专辑下载任务接口
+@router.post("/album/download-job/resume", response_model=ApiResponseData)
+async def xmly_resume_album_download_job(params: dict):
+    """
+    恢复已暂停的任务，或重试有失败音频的任务（重新排队，只下载尚未成功的曲目）
+
+    Args:
+        jobId: 任务ID
+    """
+    return await _control_album_download_job(params, "resume")
+
+
+# 喜马拉雅取消专辑下载任务接口
+@router.post("/album/download-job/cancel", response_model=ApiResponseData)
+async def xmly_cancel_album_download_job(params: dict):
+    """
+    取消专辑下载任务（已下载的音频保留）
+
+    Args:
+        jobId: 任务ID
+    """
+    return await _control_album_download_job(params, "cancel")
+
+
 # 喜马拉雅获取音频播放链接接口
 @router.post("/track/play-url", response_model=ApiResponseData)
 async def xmly_get_track_play_url(request: Request, params: GetTrackPlayUrlRequest):
@@ -111,6 +111,107 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: Optional[int] = 3600
     DB_POOL_TIMEOUT: Optional[int] = 30
 
+    # HTTP 连接池配置（app/utils/http_client_manager.py，每个主机一个共享客户端）
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 50  # 单个主机最大连接数
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # 单个主机最大保活连接数
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # 保活连接空闲过期时间（秒）
+    HTTP_HTTP2_ENABLED: bool = False  # 是否启用 HTTP/2（需要安装 h2）
+    HTTP_TIMEOUT: float = 10.0  # 读写超时时间（秒）
+    HTTP_CONNECT_TIMEOUT: float = 5.0  # 建立连接超时时间（秒）
+    HTTP_POOL_TIMEOUT: float = 10.0  # 等待连接池空闲连接的超时时间（秒）
+
+    # 阻塞任务线程池配置（app/utils/blocking_executor.py，HTML 解析、文件写入、OSS 上传）
+    BLOCKING_POOL_MAX_WORKERS: int = 4  # 线程池大小
+    BLOCKING_POOL_QUEUE_SIZE: int = 64  # 最大排队任务数，超过后调用方等待
+
+    # 微信公众号文章抓取配置
+    WX_ARTICLE_CRAWL_MAX_CONCURRENCY: int = 8  # 全量文章列表抓取时的最大并发页数
+    WX_ARTICLE_INCREMENTAL_MAX_PAGES: int = 200  # 增量同步单次最多翻页数（首次同步时防止无限翻页）
+    WX_ARTICLE_BATCH_MAX_CONCURRENCY: int = 8  # 批量下载文章详情时的最大并发数
+
+    # 文章资源镜像配置（app/utils/asset_mirror.py，图片/CSS/JS 内容寻址去重存储）
+    ASSET_MIRROR_CONCURRENCY: int = 16  # 全局资源下载最大并发数
+    ASSET_MIRROR_MAX_BYTES: int = 20 * 1024 * 1024  # 单个资源最大字节数，超过则保留原始地址
+
+    # 阿里云 OSS 上传配置（app/utils/oss_uploader.py，复用客户端 + 后台队列）
+    OSS_UPLOAD_CONCURRENCY: int = 4  # 后台上传 worker 数（同时上传的文件数）
+    OSS_UPLOAD_MAX_RETRIES: int = 3  # 上传失败最大重试次数
+    OSS_UPLOAD_RETRY_BACKOFF: float = 2.0  # 重试退避基数（秒），第 n 次重试等待 base * 2^(n-1)
+    OSS_MULTIPART_THRESHOLD: int = 20 * 1024 * 1024  # 超过该大小使用分片上传（字节）
+    OSS_MULTIPART_PART_SIZE: int = 5 * 1024 * 1024  # 分片大小（字节）
+    OSS_MULTIPART_PARALLEL: int = 3  # 单个文件分片上传并发数
+    OSS_UPLOAD_JOB_HISTORY: int = 1000  # 内存中保留的上传任务记录数
+
+    # 喜马拉雅 xm-sign 签名配置（app/utils/sign_generator.py，常驻 Node.js worker 池 / QuickJS 进程内引擎）
+    XMLY_SIGN_BACKEND: str = "node"  # 签名后端：node / auto（没有 Node.js 时用 quickjs）/ quickjs（串行，较慢）
+    XMLY_SIGN_WORKER_POOL_SIZE: int = 2  # 常驻签名进程数
+    XMLY_SIGN_TIMEOUT: float = 30.0  # 单次签名超时时间（秒）
+    XMLY_SIGN_POOL_SIZE: int = 8  # 预生成签名池容量
+    XMLY_SIGN_MAX_AGE: float = 180.0  # 预生成签名最大有效期（秒），超过则丢弃
+    XMLY_SIGN_IDLE_SECONDS: float = 300.0  # 超过该时间（秒）没有取签名时签名池停止补充，下一个请求到来后恢复
+    XMLY_SIGN_RETRY_SECONDS: float = 5.0  # 预生成失败 / 签名后端不可用时的重试间隔（秒）
+
+    # 喜马拉雅滑块验证配置（app/utils/slider_coordinator.py，同一身份并发验证只解一次）
+    XMLY_SLIDER_COOKIE_TTL: float = 600.0  # 滑块验证后 cookies 的复用时间（秒）
+
+    # Playwright 浏览器池配置（app/utils/browser_pool.py，滑块验证 / Cookie 刷新共用一个常驻 Chromium）
+    BROWSER_POOL_ENABLED: bool = True  # 是否在启动时预热浏览器池（关闭后每次使用冷启动浏览器）
+    BROWSER_POOL_HEADLESS: bool = True  # 浏览器池是否使用无头模式
+    BROWSER_POOL_MAX_CONTEXTS: int = 4  # 同时打开的浏览器上下文上限
+    BROWSER_POOL_RECYCLE_AFTER: int = 50  # 浏览器使用多少次后回收重建（释放内存）
+    PLAYWRIGHT_BLOCK_RESOURCES: bool = True  # 滑块验证 / Cookie 刷新时拦截图片、媒体、字体和统计脚本
+
+    # 微信公众平台限流配置（app/utils/rate_limiter.py，按账号的令牌桶 + AIMD）
+    WX_RATE_LIMIT_RATE: float = 1.0  # 初始速率（请求/秒）
+    WX_RATE_LIMIT_BURST: int = 5  # 令牌桶容量（允许的突发请求数）
+    WX_RATE_LIMIT_MIN_RATE: float = 0.05  # 最低速率（请求/秒）
+    WX_RATE_LIMIT_MAX_RATE: float = 5.0  # 最高速率（请求/秒）
+    WX_RATE_LIMIT_INCREASE_STEP: float = 0.05  # 每次成功请求增加的速率（加性增）
+    WX_RATE_LIMIT_DECREASE_FACTOR: float = 0.5  # 触发频控时速率乘数（乘性减）
+    WX_RATE_LIMIT_PENALTY_SECONDS: float = 60.0  # 触发频控后的冷却时间（秒）
+
+    # 喜马拉雅曲目解析限流配置（app/services/xmly_download.py，按账号的令牌桶 + AIMD + 指数退避）
+    XMLY_RESOLVE_CONCURRENCY: int = 3  # 同时解析的曲目数
+    XMLY_RATE_LIMIT_RATE: float = 0.2  # 初始速率（请求/秒），保守起步
+    XMLY_RATE_LIMIT_BURST: int = 1  # 令牌桶容量（允许的突发请求数）
+    XMLY_RATE_LIMIT_MIN_RATE: float = 0.02  # 最低速率（请求/秒）
+    XMLY_RATE_LIMIT_MAX_RATE: float = 2.0  # 最高速率（请求/秒）
+    XMLY_RATE_LIMIT_INCREASE_STEP: float = 0.02  # 每次成功解析增加的速率（加性增）
+    XMLY_RATE_LIMIT_DECREASE_FACTOR: float = 0.5  # 返回"系统繁忙"时速率乘数（乘性减）
+    XMLY_RATE_LIMIT_PENALTY_SECONDS: float = 10.0  # 返回"系统繁忙"后的全局冷却时间（秒）
+    XMLY_RESOLVE_MAX_RETRIES: int = 5  # 单个曲目被限流后的最大重试次数
+    XMLY_RESOLVE_BACKOFF_BASE: float = 5.0  # 单个曲目重试的退避基数（秒），按 2^n 增长并加随机抖动
+    XMLY_RESOLVE_BACKOFF_MAX: float = 120.0  # 单个曲目重试的最大退避时间（秒）
+    XMLY_DOWNLOAD_WORKERS: int = 3  # 专辑下载流水线的下载 worker 数（边解析边下载）
+    XMLY_DOWNLOAD_JOB_CONCURRENCY: int = 2  # 同时执行的专辑下载任务数（app/services/xmly_download_jobs.py）
+    XMLY_DOWNLOAD_PREFETCH_TTL: float = 300.0  # 排队任务暂存的解析结果有效期（秒），任务开始时超过的曲目重新解析（下载链接有时效）
+
+    # 音频下载引擎配置（app/utils/audio_downloader.py，共享 aiohttp 会话，所有专辑共用）
+    AUDIO_DOWNLOAD_MAX_CONCURRENT: int = 8  # 同时下载的文件数上限
+    AUDIO_DOWNLOAD_PER_HOST_LIMIT: int = 4  # 单个主机（CDN 节点）的最大连接数
+    AUDIO_DOWNLOAD_BANDWIDTH_LIMIT: int = 0  # 全局带宽预算（字节/秒），0 表示不限速
+    AUDIO_DOWNLOAD_CHUNK_SIZE: int = 64 * 1024  # 流式写入的分块大小（字节）
+    AUDIO_DOWNLOAD_CONNECT_TIMEOUT: float = 15.0  # 建立连接超时时间（秒）
+    AUDIO_DOWNLOAD_READ_TIMEOUT: float = 60.0  # 单次读取超时时间（秒）
+
+    # 下载进度日志配置（app/utils/progress_journal.py，追加写 JSONL + 定期压缩为 JSON 快照）
+    DOWNLOAD_JOURNAL_COMPACT_EVERY: int = 200  # 日志累计多少条事件后压缩进快照
+
+    # 下载状态存储配置（app/utils/download_state_store.py，DownloadManager 的 SQLite 后端）
+    DOWNLOAD_STATE_BACKEND: str = "json"  # 专辑状态 / 下载进度 / 元数据的存储后端：json 或 sqlite
+    DOWNLOAD_STATE_DB_NAME: str = "download_state.db"  # SQLite 状态库文件名（位于下载目录下）
+
+    # 下载进度事件推送配置（app/utils/download_events.py，SSE 接口 /wx/public/xmly/album/download-events）
+    DOWNLOAD_EVENTS_MIN_INTERVAL: float = 0.5  # 同一订阅方两次进度推送的最小间隔（秒），间隔内的进度合并为最新值
+    DOWNLOAD_EVENTS_QUEUE_SIZE: int = 256  # 每个订阅方待发送事件的上限，超出时丢弃最旧的事件
+    DOWNLOAD_EVENTS_PING_INTERVAL: int = 15  # SSE 心跳间隔（秒）
+    DOWNLOAD_EVENTS_TICKET_TTL: int = 60  # SSE 订阅票据有效期（秒，app/utils/stream_ticket.py），只用于建立连接和断线重连
+
+    # 微信公众平台多账号凭证池配置（app/services/wx_credential_pool.py）
+    WX_CREDENTIAL_POOL_ENABLED: bool = False  # 是否启用凭证池（启用后搜索/文章列表请求由池中账号分摊）
+    WX_CREDENTIAL_POOL_STRATEGY: str = "least_loaded"  # 账号选择策略：least_loaded / round_robin
+    WX_CREDENTIAL_QUARANTINE_SECONDS: float = 600.0  # 账号触发频控后的隔离时间（秒）
+
     # @field_validator("DATABASE_URL")
     # def validate_database_url(cls, v: Optional[str]) -> Any:
     #     print('DATABASE_URL---', v)
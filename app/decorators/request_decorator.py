@@ -165,8 +165,8 @@ def add_xmly_sign(headers: Dict[str, str], keyword_param: str = 'keyword'):
     def decorator(func: Callable):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            # 导入 sign_generator
-            from app.utils.sign_generator import XimalayaSignNode
+            # 导入预生成签名池
+            from app.utils.sign_generator import xmly_sign_pool
             from fastapi import HTTPException
 
             # 从参数中获取关键词
@@ -186,14 +186,8 @@ def add_xmly_sign(headers: Dict[str, str], keyword_param: str = 'keyword'):
                 print(f'🔍 [DEBUG] 无法找到参数 {keyword_param}，将使用默认Referer')
                 # raise HTTPException(status_code=400, detail=f"无法找到参数 {keyword_param}")
 
-            # 初始化签名生成器
-            try:
-                sign_generator = XimalayaSignNode()
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"签名生成器初始化失败: {e}")
-
-            # 生成 xm-sign 和 Referer
-            success, xm_sign, error_msg = sign_generator.get_xm_sign()
+            # 从预生成池取 xm-sign（池为空时才同步生成），并生成 Referer
+            success, xm_sign, error_msg = await xmly_sign_pool.get_xm_sign()
             if not success:
                 raise HTTPException(status_code=400, detail=f"xm-sign 生成失败: {error_msg}")
 
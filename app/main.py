@@ -134,6 +134,22 @@ from app.api.endpoints.ai_assistant import init_ai_assistant
 # 导入 MCP Server 管理器
 from app.ai.mcp.mcp_server.server_manager import start_local_mcp_server, stop_local_mcp_server
 from app.core.logging_uru import logger
+# 导入 HTTP 客户端连接池管理器
+from app.utils.http_client_manager import http_client_manager
+# 导入阻塞任务线程池
+from app.utils.blocking_executor import blocking_executor
+# 导入 OSS 后台上传队列
+from app.utils.oss_uploader import oss_uploader
+# 导入 Playwright 浏览器池
+from app.utils.browser_pool import browser_pool
+# 导入音频下载引擎
+from app.utils.audio_downloader import audio_download_engine
+# 导入下载进度日志（关闭时压缩）
+from app.utils import progress_journal
+# 导入喜马拉雅专辑下载任务队列
+from app.services.xmly_download_jobs import xmly_download_jobs
+# 导入喜马拉雅预生成签名池（签名后端：常驻 Node.js worker / QuickJS）
+from app.utils.sign_generator import xmly_sign_pool
 
 
 # 创建 lifespan 上下文管理器
@@ -160,6 +176,60 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         database.connect()
         print("✅ 数据库连接完成")
 
+        # 初始化 HTTP 客户端连接池
+        print("🌐 初始化 HTTP 客户端连接池...")
+        try:
+            await http_client_manager.startup()
+            print("✅ HTTP 客户端连接池初始化完成")
+            logging.info("HTTP 客户端连接池初始化完成")
+        except Exception as e:
+            print(f"⚠️  HTTP 客户端连接池初始化失败: {e}")
+            logging.warning(f"HTTP 客户端连接池初始化失败: {e}")
+            logging.warning("应用将继续运行，客户端将在首次请求时创建")
+
+        # 启动 OSS 后台上传队列
+        print("☁️ 启动 OSS 后台上传队列...")
+        try:
+            await oss_uploader.start()
+            print("✅ OSS 后台上传队列已启动")
+            logging.info("OSS 后台上传队列已启动")
+        except Exception as e:
+            print(f"⚠️  OSS 后台上传队列启动失败: {e}")
+            logging.warning(f"OSS 后台上传队列启动失败: {e}")
+
+        # 预热 Playwright 浏览器池（滑块验证 / Cookie 刷新复用常驻 Chromium）
+        if settings.BROWSER_POOL_ENABLED:
+            print("🌐 启动 Playwright 浏览器池...")
+            try:
+                await browser_pool.start()
+                print("✅ Playwright 浏览器池已启动")
+                logging.info("Playwright 浏览器池已启动")
+            except Exception as e:
+                print(f"⚠️  Playwright 浏览器池启动失败: {e}")
+                logging.warning(f"Playwright 浏览器池启动失败: {e}")
+                logging.warning("应用将继续运行，浏览器将在每次使用时冷启动")
+
+        # 预热喜马拉雅签名后端并启动预生成签名池
+        print("✍️ 启动喜马拉雅签名池...")
+        try:
+            await xmly_sign_pool.start()
+            print("✅ 喜马拉雅签名池已启动")
+            logging.info("喜马拉雅签名池已启动")
+        except Exception as e:
+            print(f"⚠️  喜马拉雅签名池启动失败: {e}")
+            logging.warning(f"喜马拉雅签名池启动失败: {e}")
+            logging.warning("应用将继续运行，签名后端将在首次签名时加载")
+
+        # 启动专辑下载任务队列（恢复上次未完成的任务）
+        print("📦 启动专辑下载任务队列...")
+        try:
+            await xmly_download_jobs.start()
+            print("✅ 专辑下载任务队列已启动")
+            logging.info("专辑下载任务队列已启动")
+        except Exception as e:
+            print(f"⚠️  专辑下载任务队列启动失败: {e}")
+            logging.warning(f"专辑下载任务队列启动失败: {e}")
+
         # 1. 启动本地 MCP Server
         print("🔌 启动本地 MCP Server...")
         try:
@@ -230,6 +300,95 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         print(f"⚠️  清理 MCP Server 资源时出错: {e}")
         logging.warning(f"清理 MCP Server 资源时出错: {e}")
     
+    # 关闭 HTTP 客户端连接池
+    try:
+        print("🌐 关闭 HTTP 客户端连接池...")
+        await http_client_manager.shutdown()
+        print("✅ HTTP 客户端连接池已关闭")
+        logging.info("HTTP 客户端连接池已关闭")
+    except Exception as e:
+        print(f"⚠️  关闭 HTTP 客户端连接池失败: {e}")
+        logging.warning(f"关闭 HTTP 客户端连接池失败: {e}")
+    
+    # 关闭 Playwright 浏览器池
+    try:
+        print("🌐 关闭 Playwright 浏览器池...")
+        await browser_pool.stop()
+        print("✅ Playwright 浏览器池已关闭")
+        logging.info("Playwright 浏览器池已关闭")
+    except Exception as e:
+        print(f"⚠️  关闭 Playwright 浏览器池失败: {e}")
+        logging.warning(f"关闭 Playwright 浏览器池失败: {e}")
+
+    # 停止专辑下载任务队列（运行中的任务下次启动时恢复）
+    try:
+        print("📦 停止专辑下载任务队列...")
+        await xmly_download_jobs.stop()
+        print("✅ 专辑下载任务队列已停止")
+        logging.info("专辑下载任务队列已停止")
+    except Exception as e:
+        print(f"⚠️  停止专辑下载任务队列失败: {e}")
+        logging.warning(f"停止专辑下载任务队列失败: {e}")
+
+    # 关闭音频下载引擎的共享会话
+    try:
+        print("🎧 关闭音频下载引擎...")
+        await audio_download_engine.close()
+        print("✅ 音频下载引擎已关闭")
+        logging.info("音频下载引擎已关闭")
+    except Exception as e:
+        print(f"⚠️  关闭音频下载引擎失败: {e}")
+        logging.warning(f"关闭音频下载引擎失败: {e}")
+
+    # 把未压缩的下载进度日志写入快照
+    try:
+        print("📒 压缩下载进度日志...")
+        await progress_journal.compact_all()
+        print("✅ 下载进度日志已压缩")
+        logging.info("下载进度日志已压缩")
+    except Exception as e:
+        print(f"⚠️  压缩下载进度日志失败: {e}")
+        logging.warning(f"压缩下载进度日志失败: {e}")
+
+    # 关闭 SQLite 下载状态库
+    try:
+        from app.utils.download_state_store import close_all_stores
+        close_all_stores()
+        logging.info("下载状态库已关闭")
+    except Exception as e:
+        print(f"⚠️  关闭下载状态库失败: {e}")
+        logging.warning(f"关闭下载状态库失败: {e}")
+
+    # 关闭喜马拉雅签名池
+    try:
+        print("✍️ 关闭喜马拉雅签名池...")
+        await xmly_sign_pool.stop()
+        print("✅ 喜马拉雅签名池已关闭")
+        logging.info("喜马拉雅签名池已关闭")
+    except Exception as e:
+        print(f"⚠️  关闭喜马拉雅签名池失败: {e}")
+        logging.warning(f"关闭喜马拉雅签名池失败: {e}")
+
+    # 停止 OSS 后台上传队列
+    try:
+        print("☁️ 停止 OSS 后台上传队列...")
+        await oss_uploader.stop()
+        print("✅ OSS 后台上传队列已停止")
+        logging.info("OSS 后台上传队列已停止")
+    except Exception as e:
+        print(f"⚠️  停止 OSS 后台上传队列失败: {e}")
+        logging.warning(f"停止 OSS 后台上传队列失败: {e}")
+
+    # 关闭阻塞任务线程池（等待正在写入的文件完成）
+    try:
+        print("🧵 关闭阻塞任务线程池...")
+        blocking_executor.shutdown()
+        print("✅ 阻塞任务线程池已关闭")
+        logging.info("阻塞任务线程池已关闭")
+    except Exception as e:
+        print(f"⚠️  关闭阻塞任务线程池失败: {e}")
+        logging.warning(f"关闭阻塞任务线程池失败: {e}")
+    
     # 关闭数据库连接（如果需要）
     try:
         # 如果你的 database 类有断开连接的方法，在这里调用
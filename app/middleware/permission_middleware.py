@@ -11,6 +11,7 @@ import httpx
 
 from app.core.config import settings
 from app.schemas.common_data import PlatformEnum
+from app.utils.stream_ticket import stream_ticket_store
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -27,6 +28,11 @@ PATH_PERMISSION_MAPPING = [
 BLACKLIST_PERMISSION_PATH_PREFIXES = [
     "/api/v1/wx/public/system",
 ]
+# 浏览器原生 EventSource 无法设置请求头的 SSE 路由：请求头缺失时校验 query 参数 ticket
+# （由对应的 .../ticket 接口在权限校验通过后签发，短期有效，见 app/utils/stream_ticket.py）
+TICKET_CREDENTIAL_PATHS = [
+    "/api/v1/wx/public/xmly/album/download-events",
+]
 
 
 class PermissionMiddleware(BaseHTTPMiddleware):
@@ -57,6 +63,16 @@ class PermissionMiddleware(BaseHTTPMiddleware):
             
             # 从请求头获取 token
             token = request.headers.get("Authorization", "").replace("Bearer ", "")
+            if not token and path in TICKET_CREDENTIAL_PATHS:
+                # 票据签发时已校验过权限，不再调用卡密系统
+                if stream_ticket_store.verify(request.query_params.get("ticket", ""), path):
+                    return await call_next(request)
+                logger.warning(f"请求 {path} 的订阅票据无效或已过期")
+                return self._error_response(
+                    "订阅票据无效或已过期",
+                    status.HTTP_401_UNAUTHORIZED,
+                    path
+                )
             if not token:
                 logger.warning(f"请求 {path} 缺少 Authorization 头")
                 return self._error_response(
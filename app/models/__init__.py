@@ -2,3 +2,6 @@ from app.models.article import Article
 from app.models.search_tag import SearchTag
 from app.models.user_behavior import UserBehavior, BehaviorType
 from app.models.llm_configuration import LLMConfiguration, ModelType
+from app.models.wx_article_sync_state import WxArticleSyncState
+from app.models.wx_downloaded_article import WxDownloadedArticle
+from app.models.xmly_download_job import XmlyDownloadJob, XmlyDownloadJobStatus
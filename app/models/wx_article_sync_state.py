@@ -0,0 +1,23 @@
+"""
+公众号文章增量同步状态模型
+记录每个公众号已同步到的最新文章（高水位），用于增量拉取文章列表
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.db.sqlalchemy_db import Base
+from datetime import datetime
+
+
+class WxArticleSyncState(Base):
+    """公众号文章增量同步状态表"""
+    __tablename__ = "wx_article_sync_state"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    wx_public_id = Column(String(100), nullable=False, unique=True, index=True, comment="公众号ID（fakeid）")
+    last_publish_time = Column(Integer, nullable=False, default=0, comment="已同步的最新文章发布时间（秒级时间戳）")
+    last_aids = Column(Text, nullable=False, default="[]", comment="发布时间等于 last_publish_time 的文章aid列表（JSON）")
+    last_sync_at = Column(DateTime, default=datetime.now, comment="最近一次增量同步时间")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment="更新时间")
+
+    def __repr__(self):
+        return f"<WxArticleSyncState(wx_public_id={self.wx_public_id}, last_publish_time={self.last_publish_time})>"
@@ -0,0 +1,29 @@
+"""
+已下载文章索引模型
+记录保存到本地的文章（保存根目录 + 公众号目录 + 处理后的标题），供“是否已下载”检查走索引查询
+三个字段合计超过 MySQL 3072 字节的索引长度上限（utf8mb4），唯一约束建在它们的 SHA-256（path_hash）上
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from app.db.sqlalchemy_db import Base
+from datetime import datetime
+
+
+class WxDownloadedArticle(Base):
+    """已下载文章索引表"""
+    __tablename__ = "wx_downloaded_article"
+    __table_args__ = (
+        UniqueConstraint("path_hash", name="uq_wx_downloaded_article_path"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    path_hash = Column(String(64), nullable=False, comment="(保存根目录, 公众号目录, 标题) 的 SHA-256")
+    base_dir = Column(String(512), nullable=False, index=True, comment="保存根目录（规范化的绝对路径）")
+    account = Column(String(255), nullable=False, comment="公众号目录名（公众号名称或自定义目录名）")
+    title = Column(String(512), nullable=False, comment="处理非法字符后的文章标题（即文件名，不含 .html）")
+    aid = Column(String(100), nullable=True, index=True, comment="文章aid（下载时已知才记录）")
+    file_path = Column(Text, nullable=False, comment="HTML 文件完整路径")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment="更新时间")
+
+    def __repr__(self):
+        return f"<WxDownloadedArticle(account={self.account}, title={self.title})>"
@@ -0,0 +1,44 @@
+"""
+喜马拉雅专辑下载任务模型
+持久化的下载任务队列：应用重启后未完成的任务会从这里恢复
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.db.sqlalchemy_db import Base
+from datetime import datetime
+
+
+# 下载任务状态
+class XmlyDownloadJobStatus:
+    """下载任务状态常量"""
+    QUEUED = "queued"  # 排队中
+    RUNNING = "running"  # 下载中
+    PAUSED = "paused"  # 已暂停（可恢复）
+    COMPLETED = "completed"  # 全部下载成功
+    FAILED = "failed"  # 结束但有音频下载失败（可恢复重试）
+    CANCELLED = "cancelled"  # 已取消
+
+
+class XmlyDownloadJob(Base):
+    """喜马拉雅专辑下载任务表"""
+    __tablename__ = "xmly_download_job"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    job_id = Column(String(32), nullable=False, unique=True, index=True, comment="任务ID")
+    album_id = Column(String(50), nullable=False, index=True, comment="专辑ID")
+    album_name = Column(String(500), nullable=False, comment="专辑名称")
+    user_id = Column(String(100), nullable=False, default="", comment="用户ID")
+    download_path = Column(String(1000), nullable=False, default="", comment="下载路径（为空时使用默认路径）")
+    track_ids = Column(Text, nullable=False, default="[]", comment="曲目ID列表（JSON）")
+    cookies = Column(Text, nullable=False, default="{}", comment="提交任务时的喜马拉雅 cookies（明文 JSON，恢复任务时重新解析下载链接；与登录会话相同时为空，改用登录会话）")
+    status = Column(String(20), nullable=False, default=XmlyDownloadJobStatus.QUEUED, index=True, comment="任务状态")
+    total_count = Column(Integer, nullable=False, default=0, comment="曲目总数")
+    success_count = Column(Integer, nullable=False, default=0, comment="下载成功数")
+    failed_count = Column(Integer, nullable=False, default=0, comment="下载失败数")
+    error_message = Column(Text, nullable=True, comment="错误信息")
+    started_at = Column(DateTime, nullable=True, comment="最近一次开始时间")
+    finished_at = Column(DateTime, nullable=True, comment="结束时间")
+    created_at = Column(DateTime, default=datetime.now, comment="创建时间")
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment="更新时间")
+
+    def __repr__(self):
+        return f"<XmlyDownloadJob(job_id={self.job_id}, album_id={self.album_id}, status={self.status})>"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, List
 
 from pydantic import BaseModel, Field
 
@@ -13,12 +13,25 @@ class ArticleDetailRequest(BaseModel):
     is_save_to_local: bool = Field(False, description="是否保存到本地, 非必填")
     save_to_local_path: str = Field("", description="保存到本地路径, 非必填")
     save_to_local_file_name: str = Field("", description="保存到本地文件名, 非必填")
+    is_mirror_assets: bool = Field(False, description="是否把图片/CSS/JS镜像到本地并改写为相对路径（需要同时保存到本地）, 非必填")
+    aid: str = Field("", description="文章aid（记录到已下载文章索引）, 非必填")
+
+class ArticleDetailBatchRequest(BaseModel):
+    items: List[ArticleDetailRequest] = Field(..., min_length=1, description="文章列表（每项同单篇下载参数）, 必填")
+    concurrency: int = Field(4, ge=1, description="并发下载数, 受 WX_ARTICLE_BATCH_MAX_CONCURRENCY 限制, 非必填")
 
 class ArticleListRequest(BaseModel):
     wx_public_id: str = Field(..., description="公众号ID, 必填")
     begin: int = Field(0, description="开始位置, 必填")
     count: int = Field(5, description="数量, 必填")
     query: str = Field("", description="搜索关键词, 非必填")
+    incremental: bool = Field(False, description="增量模式：从第一页翻页到上次已同步的文章为止（忽略begin，query非空时不生效）, 非必填")
+
+class AllArticlesStreamRequest(BaseModel):
+    wx_public_id: str = Field(..., description="公众号ID, 必填")
+    count: int = Field(20, ge=1, le=20, description="每页数量（微信接口单页最多20）, 非必填")
+    concurrency: int = Field(5, ge=1, description="并发请求页数, 受 WX_ARTICLE_CRAWL_MAX_CONCURRENCY 限制, 非必填")
+    query: str = Field("", description="搜索关键词, 非必填")
 
 class WXCookie(BaseModel):
     slave_sid: str = Field(..., description="slave_sid, 必填")
@@ -28,6 +41,15 @@ class CookieTokenRequest(BaseModel):
     cookie: WXCookie = Field(..., description="cookie, 必填")
     token: str = Field(..., description="token, 必填")
 
+# 多账号凭证池相关请求体
+class CredentialPoolAddRequest(BaseModel):
+    cookies: Dict[str, str] = Field(..., description="登录后的完整cookies（需包含slave_user、slave_sid）, 必填")
+    token: str = Field(..., description="token, 必填")
+    nick_name: str = Field("", description="账号昵称, 非必填")
+
+class CredentialPoolRemoveRequest(BaseModel):
+    key: str = Field(..., description="账号标识（slave_user）, 必填")
+
 # 微信公众号登录相关请求体
 class PreloginRequest(BaseModel):
     action: str = Field("prelogin", description="预登录动作, 默认为prelogin")
@@ -66,6 +88,10 @@ class CheckDownloadRequest(BaseModel):
     wx_public_name: str = Field(..., description="公众号名称")
     articles: list[ArticleItem] = Field(..., description="文章列表")
 
+class RebuildDownloadIndexRequest(BaseModel):
+    base_path: str = Field(..., description="下载根目录")
+    wx_public_name: Optional[str] = Field(None, description="公众号名称，不传则重建根目录下所有公众号")
+
 
 class ArticleSimple(BaseModel):
     aid: str
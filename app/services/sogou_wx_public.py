@@ -2,6 +2,7 @@
 import httpx
 from fastapi import HTTPException
 from app.utils.wx_article_handle import parse_sogou_articles, save_html_to_local
+from app.utils.blocking_executor import run_blocking
 from app.schemas.wx_data import sogou_ArticleDetailRequest
 
 async def fetch_sogou_wx_public_list(query: str, page: int = 1):
@@ -66,7 +67,7 @@ async def fetch_wx_public_detail(params: sogou_ArticleDetailRequest):
                         "save_to_local_path": save_to_local_path,
                         "save_to_local_file_name": save_to_local_file_name
                     }
-                    local_file_path = save_html_to_local(final_response.text, **kwargs)
+                    local_file_path = await run_blocking(save_html_to_local, final_response.text, **kwargs)
                     # 暂无阿里云上传
                     # if local_file_path != "" and is_upload_to_aliyun:
                     #     oss_file_path = upload_to_aliyun(local_file_path)
@@ -635,7 +635,6 @@ class SystemManager:
         """
         try:
             from app.utils.src_path import get_writable_dir
-            import aiofiles
             import asyncio
 
             # 1. 获取下载路径
@@ -645,34 +644,20 @@ class SystemManager:
                 raise HTTPException(status_code=404, detail="专辑下载路径不存在")
                 return None
 
-            # 2. 获取全局专辑状态文件路径
-            status_file = os.path.join(download_path, "albums_status.json")
-            print(f'专辑的下载路径是 status_file {status_file}')
-            if not os.path.exists(status_file):
-                raise HTTPException(status_code=404, detail="专辑下载状态文件不存在")
-                return None
-
-            # 3. 异步读取全局状态
-            async with aiofiles.open(status_file, "r", encoding="utf-8") as f:
-                content = await f.read()
-                global_status = json.loads(content)
-
-            print(f'专辑的下载路径是 global_status {global_status}')
-            # 4. 查找专辑信息
-            album_key = str(album_id)
-            if album_key not in global_status:
+            # 2. 查询专辑的全局状态记录（JSON 后端读取 albums_status.json，SQLite 后端按主键查询）
+            from app.utils.download_manager import create_download_manager
+            download_manager = create_download_manager(download_path)
+            album_info = await download_manager.get_album_record(album_id)
+            if not album_info:
                 raise HTTPException(status_code=404, detail="专辑下载状态不存在")
                 return None
 
-            album_info = global_status[album_key]
             album_name = album_info.get("album_name")
             if not album_name:
                 raise HTTPException(status_code=404, detail="专辑名称不存在")
                 return None
 
-            # 5. 读取下载进度文件
-            from app.utils.download_manager import DownloadManager
-            download_manager = DownloadManager(download_path)
+            # 3. 读取下载进度
             progress = await download_manager.load_progress(album_name)
 
             if not progress:
@@ -685,14 +670,25 @@ class SystemManager:
                     "downloads": {}
                 }
 
-            # 6. 构建下载状态信息
+            # 4. 正在下载的音频附带已写入字节数（流式下载进度）
+            from app.services.xmly_download import get_track_download_progress
+            downloads = progress.get("downloads", {})
+            for track_id, info in downloads.items():
+                if info.get("status") == "success":
+                    continue
+                byte_progress = get_track_download_progress(track_id)
+                if byte_progress:
+                    info["bytes_written"] = byte_progress["bytes_written"]
+                    info["total_bytes"] = byte_progress["total_bytes"]
+
+            # 5. 构建下载状态信息
             return {
                 "album_id": album_id,
                 "album_name": album_name,
                 "total_count": progress.get("total_count", 0),
                 "success_count": progress.get("success_count", 0),
                 "failed_count": progress.get("failed_count", 0),
-                "downloads": progress.get("downloads", {})
+                "downloads": downloads
             }
 
         except Exception as e:
@@ -0,0 +1,227 @@
+"""
+已下载文章索引服务层
+save_html_to_local 保存文章时写入索引，/check-downloaded 通过一次索引查询判断文章是否已下载，
+不再对每篇文章做 os.path.exists。
+
+索引按 (保存根目录, 公众号目录, 处理后的标题) 唯一（唯一约束建在三者的 SHA-256 path_hash 上）：
+- 每个公众号目录在进程内首次检查时做一次目录扫描重建索引（兼容索引上线前下载的文章、手动删除的文件）
+- 也可以通过 /check-downloaded/rebuild-index 手动重建
+- 数据库不可用时回退为逐个文件检查
+- 首次使用时建表（MySQL 不会自动 create_all）
+"""
+import hashlib
+import os
+import re
+from typing import Optional, List, Dict, Any, Set, Tuple
+from loguru import logger
+from sqlalchemy import or_
+from app.db.sqlalchemy_db import database
+from app.models.wx_downloaded_article import WxDownloadedArticle
+from app.utils.asset_mirror import ASSET_DIR_NAME
+from app.utils.src_path import root_path
+
+
+TAG = "WX_ARTICLE_INDEX_SERVICE"
+
+# 文件名非法字符（与 save_html_to_local 保持一致）
+ILLEGAL_TITLE_CHARS_PATTERN = re.compile(r'[\\/*?:"<>|]')
+# 本进程内已扫描重建过的 (保存根目录, 公众号目录)
+_indexed_scopes: Set[Tuple[str, str]] = set()
+# 本进程内是否已建过索引表
+_table_checked = False
+
+
+def sanitize_article_title(title: str) -> str:
+    """处理标题中的非法字符（文件名不能包含的字符）"""
+    return ILLEGAL_TITLE_CHARS_PATTERN.sub("_", title)
+
+
+def resolve_base_dir(base_path: str) -> str:
+    """保存根目录 -> 规范化的绝对路径（相对路径相对于项目根目录）"""
+    if not os.path.isabs(base_path):
+        base_path = os.path.join(root_path, base_path)
+    return os.path.normcase(os.path.abspath(base_path))
+
+
+def article_path_hash(base_dir: str, account: str, title: str) -> str:
+    """(保存根目录, 公众号目录, 处理后的标题) -> 唯一约束使用的 SHA-256"""
+    return hashlib.sha256("\0".join((base_dir, account, title)).encode("utf-8")).hexdigest()
+
+
+def _ensure_table(session):
+    """建表（只有 SQLite 会在连接时 create_all，MySQL 等数据库在首次使用时补建）"""
+    global _table_checked
+    if _table_checked:
+        return
+    WxDownloadedArticle.__table__.create(bind=session.get_bind(), checkfirst=True)
+    _table_checked = True
+
+
+def _open_session():
+    try:
+        session = next(database.get_session())
+    except Exception as e:
+        logger.bind(tag=TAG).warning(f"数据库不可用，跳过文章索引: {e}")
+        return None
+    try:
+        _ensure_table(session)
+    except Exception as e:
+        session.close()
+        logger.bind(tag=TAG).warning(f"文章索引表不可用，跳过文章索引: {e}")
+        return None
+    return session
+
+
+def record_downloaded_article(base_dir: str, account: str, title: str, file_path: str, aid: Optional[str] = None) -> bool:
+    """
+    记录一篇已保存的文章（已存在则更新）
+
+    Args:
+        base_dir: 保存根目录
+        account: 公众号目录名
+        title: 处理后的标题（文件名，不含 .html）
+        file_path: HTML 文件完整路径
+        aid: 文章aid，可选
+
+    Returns:
+        bool: 是否记录成功
+    """
+    session = _open_session()
+    if session is None:
+        return False
+    base_dir = resolve_base_dir(base_dir)
+    path_hash = article_path_hash(base_dir, account, title)
+    try:
+        record = session.query(WxDownloadedArticle).filter(WxDownloadedArticle.path_hash == path_hash).first()
+        if not record:
+            record = WxDownloadedArticle(path_hash=path_hash, base_dir=base_dir, account=account, title=title)
+            session.add(record)
+        record.file_path = file_path
+        if aid:
+            record.aid = aid
+        session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.bind(tag=TAG).error(f"记录已下载文章失败 - {account}/{title}: {e}")
+        return False
+    finally:
+        session.close()
+
+
+def rebuild_article_index(base_path: str, account: Optional[str] = None) -> Dict[str, Any]:
+    """
+    扫描保存目录重建索引（只扫描公众号目录下的 *.html，已记录的 aid 会保留）
+
+    Args:
+        base_path: 保存根目录
+        account: 公众号目录名，不传则重建根目录下所有公众号
+
+    Returns:
+        {"accounts": 重建的公众号目录数, "articles": 索引的文章数}
+    """
+    session = _open_session()
+    if session is None:
+        return {"accounts": 0, "articles": 0}
+    base_dir = resolve_base_dir(base_path)
+    if account is not None:
+        accounts = [account]
+    elif os.path.isdir(base_dir):
+        accounts = [entry.name for entry in os.scandir(base_dir) if entry.is_dir() and entry.name != ASSET_DIR_NAME]
+    else:
+        accounts = []
+
+    total = 0
+    try:
+        for account_name in accounts:
+            account_dir = os.path.join(base_dir, account_name)
+            files = {}
+            if os.path.isdir(account_dir):
+                files = {
+                    entry.name[:-len(".html")]: entry.path
+                    for entry in os.scandir(account_dir) if entry.is_file() and entry.name.endswith(".html")
+                }
+            scope = session.query(WxDownloadedArticle).filter(
+                WxDownloadedArticle.base_dir == base_dir,
+                WxDownloadedArticle.account == account_name
+            )
+            aids = {record.title: record.aid for record in scope if record.aid}
+            scope.delete(synchronize_session=False)
+            session.add_all([
+                WxDownloadedArticle(path_hash=article_path_hash(base_dir, account_name, title),
+                                    base_dir=base_dir, account=account_name, title=title,
+                                    file_path=file_path, aid=aids.get(title))
+                for title, file_path in files.items()
+            ])
+            session.commit()
+            _indexed_scopes.add((base_dir, account_name))
+            total += len(files)
+        logger.bind(tag=TAG).info(f"文章索引重建完成 - 根目录: {base_dir}, 公众号目录数: {len(accounts)}, 文章数: {total}")
+        return {"accounts": len(accounts), "articles": total}
+    except Exception as e:
+        session.rollback()
+        logger.bind(tag=TAG).error(f"文章索引重建失败 - 根目录: {base_dir}, 错误: {e}")
+        raise
+    finally:
+        session.close()
+
+
+def query_downloaded_aids(base_path: str, account: str, articles: List[Any]) -> Optional[List[str]]:
+    """
+    一次索引查询得到已下载文章的 aid 列表
+
+    Args:
+        base_path: 保存根目录
+        account: 公众号目录名
+        articles: 带 aid / title 属性的文章列表
+
+    Returns:
+        已下载的 aid 列表（保持请求顺序），数据库不可用时返回 None
+    """
+    base_dir = resolve_base_dir(base_path)
+    if (base_dir, account) not in _indexed_scopes:
+        try:
+            rebuild_article_index(base_path, account)
+        except Exception:
+            return None
+
+    session = _open_session()
+    if session is None:
+        return None
+    titles = {article.aid: sanitize_article_title(article.title) for article in articles}
+    try:
+        rows = session.query(WxDownloadedArticle.title, WxDownloadedArticle.aid).filter(
+            WxDownloadedArticle.base_dir == base_dir,
+            WxDownloadedArticle.account == account,
+            or_(
+                WxDownloadedArticle.title.in_(set(titles.values())),
+                WxDownloadedArticle.aid.in_(set(titles.keys()))
+            )
+        ).all()
+    except Exception as e:
+        logger.bind(tag=TAG).error(f"查询已下载文章失败 - {account}: {e}")
+        return None
+    finally:
+        session.close()
+    downloaded_titles = {row.title for row in rows}
+    downloaded_aids = {row.aid for row in rows if row.aid}
+    return [
+        article.aid for article in articles
+        if titles[article.aid] in downloaded_titles or article.aid in downloaded_aids
+    ]
+
+
+def check_downloaded_aids(base_path: str, account: str, articles: List[Any]) -> List[str]:
+    """检查文章是否已下载：优先走索引，数据库不可用时逐个检查文件"""
+    if not base_path:
+        return []  # 没有路径则默认未下载
+    downloaded_aids = query_downloaded_aids(base_path, account, articles)
+    if downloaded_aids is not None:
+        return downloaded_aids
+    account_dir = os.path.join(resolve_base_dir(base_path), account)
+    if not os.path.exists(account_dir):
+        return []
+    return [
+        article.aid for article in articles
+        if os.path.exists(os.path.join(account_dir, f"{sanitize_article_title(article.title)}.html"))
+    ]
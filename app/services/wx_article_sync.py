@@ -0,0 +1,125 @@
+"""
+公众号文章增量同步服务层
+维护每个公众号的高水位（最新已同步文章的发布时间 + aid），供增量拉取文章列表使用
+"""
+import json
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from loguru import logger
+from app.db.sqlalchemy_db import database
+from app.models.wx_article_sync_state import WxArticleSyncState
+
+
+TAG = "WX_ARTICLE_SYNC_SERVICE"
+
+# 本进程内是否已建过同步状态表
+_table_checked = False
+
+
+def get_article_publish_time(article: Dict[str, Any]) -> int:
+    """获取文章发布时间（优先 create_time，编辑文章会改变 update_time）"""
+    return int(article.get('create_time') or article.get('update_time') or 0)
+
+
+def _open_session(action: str):
+    """打开数据库会话，首次使用时建表（只有 SQLite 会在连接时 create_all）"""
+    global _table_checked
+    try:
+        session = next(database.get_session())
+    except Exception as e:
+        logger.bind(tag=TAG).warning(f"数据库不可用，{action}: {e}")
+        return None
+    if not _table_checked:
+        try:
+            WxArticleSyncState.__table__.create(bind=session.get_bind(), checkfirst=True)
+            _table_checked = True
+        except Exception as e:
+            session.close()
+            logger.bind(tag=TAG).warning(f"同步状态表不可用，{action}: {e}")
+            return None
+    return session
+
+
+def load_sync_state(wx_public_id: str) -> Optional[Tuple[int, List[str]]]:
+    """
+    读取公众号的同步高水位
+
+    Args:
+        wx_public_id: 公众号ID
+
+    Returns:
+        (last_publish_time, last_aids)，没有记录或数据库不可用时返回 None
+    """
+    session = _open_session("增量同步将按全量处理")
+    if session is None:
+        return None
+    try:
+        state = session.query(WxArticleSyncState).filter(
+            WxArticleSyncState.wx_public_id == wx_public_id
+        ).first()
+        if not state:
+            return None
+        return state.last_publish_time or 0, json.loads(state.last_aids or "[]")
+    except Exception as e:
+        logger.bind(tag=TAG).error(f"读取同步状态失败 - 公众号: {wx_public_id}, 错误: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def save_sync_state(wx_public_id: str, last_publish_time: int, last_aids: List[str]) -> bool:
+    """
+    保存公众号的同步高水位（不存在则创建）
+
+    Args:
+        wx_public_id: 公众号ID
+        last_publish_time: 最新文章发布时间
+        last_aids: 发布时间等于 last_publish_time 的文章aid列表
+
+    Returns:
+        bool: 是否保存成功
+    """
+    session = _open_session("跳过保存同步状态")
+    if session is None:
+        return False
+    try:
+        state = session.query(WxArticleSyncState).filter(
+            WxArticleSyncState.wx_public_id == wx_public_id
+        ).first()
+        if not state:
+            state = WxArticleSyncState(wx_public_id=wx_public_id)
+            session.add(state)
+        state.last_publish_time = last_publish_time
+        state.last_aids = json.dumps(last_aids)
+        state.last_sync_at = datetime.now()
+        session.commit()
+        logger.bind(tag=TAG).info(
+            f"保存同步状态成功 - 公众号: {wx_public_id}, 发布时间: {last_publish_time}, aid数: {len(last_aids)}"
+        )
+        return True
+    except Exception as e:
+        session.rollback()
+        logger.bind(tag=TAG).error(f"保存同步状态失败 - 公众号: {wx_public_id}, 错误: {e}")
+        return False
+    finally:
+        session.close()
+
+
+def is_article_seen(article: Dict[str, Any], last_publish_time: int, last_aids: List[str]) -> bool:
+    """判断文章是否已在上次同步中出现（早于高水位，或与高水位同一时间且 aid 已记录）"""
+    publish_time = get_article_publish_time(article)
+    if publish_time < last_publish_time:
+        return True
+    return publish_time == last_publish_time and article.get('aid') in last_aids
+
+
+def compute_high_water_mark(articles: List[Dict[str, Any]]) -> Optional[Tuple[int, List[str]]]:
+    """根据本次拉取到的文章计算新的高水位，没有文章时返回 None"""
+    if not articles:
+        return None
+    newest_time = max(get_article_publish_time(article) for article in articles)
+    newest_aids = [
+        article.get('aid') for article in articles
+        if get_article_publish_time(article) == newest_time and article.get('aid')
+    ]
+    return newest_time, newest_aids
@@ -0,0 +1,209 @@
+"""
+微信公众平台多账号凭证池
+
+持有多个已登录的公众号后台会话（cookies + token），把搜索 / 文章列表请求分摊到不同账号上：
+- 会话通过 system_manager.save_platform_session / load_platform_session 持久化，
+  每个账号一个 wx_pool_<key> 会话文件，另有一个 wx_pool 索引会话记录账号列表
+- 选择策略：least_loaded（当前并发最少）或 round_robin（轮询），由 WX_CREDENTIAL_POOL_STRATEGY 配置
+- 账号触发频控时隔离一段时间，登录失效时一直隔离直到重新加入
+"""
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+
+from app.core.config import settings
+from app.services.system import system_manager
+from app.utils.rate_limiter import WX_FREQ_CONTROL_RETS
+
+
+TAG = "WX_CREDENTIAL_POOL"
+
+# 凭证池索引会话的平台标识，账号会话为 f"{POOL_PLATFORM}_{key}"
+POOL_PLATFORM = "wx_pool"
+
+# 登录失效相关返回码（base_resp.ret）：invalid session / invalid csrf token
+WX_SESSION_EXPIRED_RETS = {200003, 200040}
+
+
+class WxCredential:
+    """凭证池中的单个账号"""
+
+    def __init__(self, key: str, cookies: Dict[str, str], token: str, user_info: Optional[Dict[str, Any]] = None):
+        self.key = key
+        self.cookies = cookies
+        self.token = token
+        self.user_info = user_info or {}
+        self.in_flight = 0
+        self.total_requests = 0
+        self.quarantined_until = 0.0
+        self.quarantine_reason = ""
+        self.expired = False
+
+    def is_available(self, now: float) -> bool:
+        return not self.expired and now >= self.quarantined_until
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "key": self.key,
+            "nick_name": self.user_info.get('nick_name', ''),
+            "available": self.is_available(now),
+            "expired": self.expired,
+            "in_flight": self.in_flight,
+            "total_requests": self.total_requests,
+            "quarantine_seconds": round(max(0.0, self.quarantined_until - now), 3) if not self.expired else None,
+            "quarantine_reason": self.quarantine_reason,
+        }
+
+
+class WxCredentialPool:
+    """多账号凭证池单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._credentials = {}
+            cls._instance._loaded = False
+            cls._instance._rr_index = 0
+        return cls._instance
+
+    @staticmethod
+    def make_key(cookies: Dict[str, str], token: str) -> str:
+        """账号标识：优先使用 slave_user，否则使用 token"""
+        return (cookies or {}).get('slave_user') or token
+
+    def _ensure_loaded(self):
+        """首次使用时从会话文件加载账号"""
+        if self._loaded:
+            return
+        self._loaded = True
+        index = system_manager.load_platform_session(POOL_PLATFORM)
+        members = (index or {}).get('user_info', {}).get('members', [])
+        for key in members:
+            session = system_manager.load_platform_session(f"{POOL_PLATFORM}_{key}")
+            if session and session.get('cookies') and session.get('token'):
+                self._credentials[key] = WxCredential(key, session['cookies'], session['token'], session.get('user_info'))
+        logger.bind(tag=TAG).info(f"凭证池加载完成，可用账号数: {len(self._credentials)}")
+
+    def _save_index(self):
+        system_manager.save_platform_session(
+            POOL_PLATFORM,
+            user_info={'members': list(self._credentials.keys())},
+            expires_days=3650
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """凭证池是否启用（开启配置且至少有一个账号）"""
+        if not settings.WX_CREDENTIAL_POOL_ENABLED:
+            return False
+        self._ensure_loaded()
+        return len(self._credentials) > 0
+
+    def add(self, cookies: Dict[str, str], token: str, user_info: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        加入（或更新）一个账号，同时持久化到会话文件
+
+        Returns:
+            Optional[str]: 账号标识，缺少 cookies/token 时返回 None
+        """
+        self._ensure_loaded()
+        key = self.make_key(cookies, token)
+        if not key or not cookies or not token:
+            return None
+        system_manager.save_platform_session(f"{POOL_PLATFORM}_{key}", user_info or {}, cookies, token)
+        self._credentials[key] = WxCredential(key, cookies, token, user_info)
+        self._save_index()
+        logger.bind(tag=TAG).info(f"账号已加入凭证池: {key}")
+        return key
+
+    def remove(self, key: str) -> bool:
+        """从凭证池移除账号并删除其会话文件"""
+        self._ensure_loaded()
+        if key not in self._credentials:
+            return False
+        del self._credentials[key]
+        system_manager.clear_platform_session(f"{POOL_PLATFORM}_{key}")
+        self._save_index()
+        logger.bind(tag=TAG).info(f"账号已移出凭证池: {key}")
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """凭证池状态"""
+        self._ensure_loaded()
+        return {
+            "enabled": settings.WX_CREDENTIAL_POOL_ENABLED,
+            "strategy": settings.WX_CREDENTIAL_POOL_STRATEGY,
+            "credentials": [credential.to_dict() for credential in self._credentials.values()],
+        }
+
+    def _select(self, exclude: Optional[List[str]] = None) -> Optional[WxCredential]:
+        """按配置的策略选出一个可用账号"""
+        now = time.monotonic()
+        candidates = [
+            credential for credential in self._credentials.values()
+            if credential.is_available(now) and credential.key not in (exclude or [])
+        ]
+        if not candidates:
+            return None
+        if settings.WX_CREDENTIAL_POOL_STRATEGY == "round_robin":
+            credential = candidates[self._rr_index % len(candidates)]
+            self._rr_index += 1
+            return credential
+        return min(candidates, key=lambda c: (c.in_flight, c.total_requests))
+
+    def has_available(self, exclude: Optional[List[str]] = None) -> bool:
+        """除 exclude 外是否还有可用账号"""
+        now = time.monotonic()
+        return any(
+            credential.is_available(now) and credential.key not in (exclude or [])
+            for credential in self._credentials.values()
+        )
+
+    @asynccontextmanager
+    async def lease(self, exclude: Optional[List[str]] = None):
+        """
+        租用一个账号执行请求，退出时归还
+
+        Raises:
+            HTTPException: 凭证池中没有可用账号（全部被隔离）
+        """
+        credential = self._select(exclude)
+        if credential is None:
+            raise HTTPException(status_code=503, detail="凭证池中暂无可用账号（均已触发频控或登录失效）")
+        credential.in_flight += 1
+        credential.total_requests += 1
+        try:
+            yield credential
+        finally:
+            credential.in_flight -= 1
+
+    def report_result(self, credential: WxCredential, ret: int) -> bool:
+        """
+        根据微信返回码更新账号状态
+
+        Returns:
+            bool: 账号是否因此被隔离（调用方可以换一个账号重试）
+        """
+        if ret in WX_FREQ_CONTROL_RETS:
+            credential.quarantined_until = time.monotonic() + settings.WX_CREDENTIAL_QUARANTINE_SECONDS
+            credential.quarantine_reason = "freq_control"
+            logger.bind(tag=TAG).warning(
+                f"账号触发频控，隔离 {settings.WX_CREDENTIAL_QUARANTINE_SECONDS}s: {credential.key}"
+            )
+            return True
+        if ret in WX_SESSION_EXPIRED_RETS:
+            credential.expired = True
+            credential.quarantine_reason = "session_expired"
+            logger.bind(tag=TAG).warning(f"账号登录失效，已隔离（重新登录后加入即可恢复）: {credential.key}")
+            return True
+        return False
+
+
+# 全局单例
+wx_credential_pool = WxCredentialPool()
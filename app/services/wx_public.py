@@ -1,18 +1,27 @@
+import asyncio
 import httpx
 import urllib.parse
 import time
 import math
 import random
-from typing import Dict, Any
+from typing import Dict, Any, List, AsyncIterator, Optional, Callable
 from fastapi import HTTPException, Request
 import logging
 from loguru import logger
-from app.schemas.wx_data import ArticleDetailRequest, ArticleListRequest, CookieTokenRequest, PreloginRequest, WebreportRequest, StartLoginRequest
+from app.schemas.wx_data import ArticleDetailRequest, ArticleDetailBatchRequest, ArticleListRequest, AllArticlesStreamRequest, CookieTokenRequest, PreloginRequest, WebreportRequest, StartLoginRequest
 import json
-from app.utils.wx_article_handle import save_html_to_local, parse_wx_common_data, upload_to_aliyun
+from app.utils.wx_article_handle import save_html_to_local, parse_wx_common_data, get_article_save_dirs
+from app.utils.asset_mirror import mirror_article_assets
 from bs4 import BeautifulSoup
 from app.utils.src_path import get_temp_file_path
 from app.decorators.request_decorator import extract_wx_credentials
+from app.utils.http_client_manager import get_wx_client
+from app.utils.blocking_executor import run_blocking
+from app.utils.oss_uploader import oss_uploader
+from app.utils.rate_limiter import AdaptiveRateLimiter, WX_FREQ_CONTROL_RETS, wx_rate_limiters, get_wx_credential_key
+from app.core.config import settings
+from app.services.wx_credential_pool import wx_credential_pool
+from app.services.wx_article_sync import load_sync_state, save_sync_state, is_article_seen, compute_high_water_mark
 # from PIL import Image
 cookies = {
     # "appmsglist_action_3964406050": "card",
@@ -38,13 +47,68 @@ cookies = {
 token = "159333899"
 
 # 错误处理
-def handle_error(base_resp):
+def handle_error(base_resp, limiter: Optional[AdaptiveRateLimiter] = None):
     ret = base_resp.get('ret',0)
     err_msg = base_resp.get('err_msg','')
+    if limiter is not None:
+        # 频控返回码触发限流器降速，只有成功的请求（ret == 0）才提速
+        if ret in WX_FREQ_CONTROL_RETS:
+            limiter.on_throttle()
+            raise HTTPException(status_code=429, detail=f"请求过于频繁，已触发微信频控: {err_msg}")
+        if ret == 0:
+            limiter.on_success()
     if ret != 0:
         raise HTTPException(status_code=400, detail=f"HTTP错误: {err_msg}")
     return base_resp
 
+
+async def _acquire_wx_limiter(merged_cookies: Dict[str, str], final_token: str) -> AdaptiveRateLimiter:
+    """获取当前凭证的限流器并等待令牌"""
+    limiter = wx_rate_limiters.get(get_wx_credential_key(merged_cookies, final_token))
+    await limiter.acquire()
+    return limiter
+
+
+async def _wx_api_get_once(url: str, request_cookies: Dict[str, str], request_token: str,
+                           headers: Optional[Dict[str, str]] = None):
+    """使用指定凭证请求一次微信公众平台 JSON 接口，返回 (json_data, limiter)"""
+    print('url', url)
+    client = await get_wx_client()
+    limiter = await _acquire_wx_limiter(request_cookies, request_token)
+    response = await client.get(url, headers=headers, cookies=request_cookies)
+    response.raise_for_status()
+    return json.loads(response.text), limiter
+
+
+async def _wx_api_get_json(build_url: Callable[[str], str], merged_cookies: Dict[str, str], final_token: str,
+                           headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """请求微信公众平台 JSON 接口（限流 + 凭证池），base_resp 出错时抛 HTTPException
+
+    build_url 接收 token 返回请求地址（token 拼在 URL 上，换账号时需要重新构造）。
+    启用凭证池时请求在池中账号之间分摊，账号触发频控或登录失效会被隔离，并换一个可用账号重试。
+    """
+    if not wx_credential_pool.enabled:
+        json_data, limiter = await _wx_api_get_once(build_url(final_token), merged_cookies, final_token, headers)
+        handle_error(json_data.get('base_resp', {}), limiter)
+        return json_data
+
+    tried = []
+    while True:
+        async with wx_credential_pool.lease(exclude=tried) as credential:
+            json_data, limiter = await _wx_api_get_once(
+                build_url(credential.token), credential.cookies, credential.token, headers
+            )
+        base_resp = json_data.get('base_resp', {})
+        quarantined = wx_credential_pool.report_result(credential, base_resp.get('ret', 0))
+        try:
+            handle_error(base_resp, limiter)
+            return json_data
+        except HTTPException:
+            tried.append(credential.key)
+            if not (quarantined and wx_credential_pool.has_available(exclude=tried)):
+                raise
+            logger.info(f"账号 {credential.key} 已被隔离，换一个账号重试")
+
 @extract_wx_credentials(cookies, token)
 async def fetch_wx_public(request: Request, query: str, begin: int, count: int):
     """获取微信公众号"""
@@ -57,20 +121,19 @@ async def fetch_wx_public(request: Request, query: str, begin: int, count: int):
     url = f"https://mp.weixin.qq.com/cgi-bin/searchbiz?action=search_biz&begin={begin}&count={count}&query={query}&token={final_token}&lang=zh_CN&f=json&ajax=1"
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            logging.info(f"正在请求URL: {url}")
-            logger.info(f"正在请求cookies: {merged_cookies}，token: {final_token}")
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            }
-            # 使用合并后的 cookies
-            response = await client.get(url, headers=headers, timeout=10, cookies=merged_cookies)
-            response.raise_for_status()
-            # 整理成json
-            json_data = json.loads(response.text)
-            base_resp = json_data.get('base_resp', {})
-            handle_error(base_resp)
-            return json_data.get('list', [])
+        logging.info(f"正在请求URL: {url}")
+        logger.info(f"正在请求cookies: {merged_cookies}，token: {final_token}")
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        }
+        # 使用合并后的 cookies（启用凭证池时由凭证池分配账号）
+        json_data = await _wx_api_get_json(
+            lambda t: f"https://mp.weixin.qq.com/cgi-bin/searchbiz?action=search_biz&begin={begin}&count={count}&query={query}&token={t}&lang=zh_CN&f=json&ajax=1",
+            merged_cookies, final_token, headers=headers
+        )
+        return json_data.get('list', [])
+    except HTTPException:
+        raise
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"HTTP错误: {e}")
     except httpx.RequestError as e:
@@ -78,85 +141,362 @@ async def fetch_wx_public(request: Request, query: str, begin: int, count: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"未知错误: {e}")
 
+def _build_article_list_url(final_token: str, wx_public_id: str, begin: int, count: int, query: str = "") -> str:
+    """构造 appmsgpublish 文章列表（或文章搜索）请求地址"""
+    if len(query) <= 0:
+        return f"https://mp.weixin.qq.com/cgi-bin/appmsgpublish?sub=list&begin={begin}&count={count}&fakeid={wx_public_id}&type=101_1&free_publish_type=1&sub_action=list_ex&token={final_token}&lang=zh_CN&f=json&ajax=1"
+    return f"https://mp.weixin.qq.com/cgi-bin/appmsgpublish?sub=search&search_field=7&begin={begin}&count={count}&query={query}&fakeid={wx_public_id}&type=101_1&free_publish_type=1&sub_action=list_ex&token={final_token}&lang=zh_CN&f=json&ajax=1"
+
+
+async def _request_article_publish_page(merged_cookies: Dict[str, str], final_token: str, wx_public_id: str,
+                                        begin: int, count: int, query: str = "") -> Dict[str, Any]:
+    """请求 appmsgpublish 单页数据，并将 publish_page / publish_info 解析为对象"""
+    json_data = await _wx_api_get_json(
+        lambda t: _build_article_list_url(t, wx_public_id, begin, count, query),
+        merged_cookies, final_token
+    )
+    publish_page = json_data.get('publish_page',"")
+    publish_page_obj = json.loads(publish_page,)
+    publish_page_obj['publish_list'] = [json.loads(item["publish_info"]) for item in publish_page_obj['publish_list']]
+    return publish_page_obj
+
+
+def _extract_publish_articles(publish_page_obj: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """从解析后的 publish_page 中取出所有文章（一次群发可能包含多篇文章）"""
+    articles = []
+    for publish_info in publish_page_obj.get('publish_list', []):
+        articles.extend(publish_info.get('appmsgex', []) or [])
+    return articles
+
+
 @extract_wx_credentials(cookies, token)
 async def fetch_wx_article_list(request: Request, params: ArticleListRequest):
     """使用Query参数获取微信公众号文章详情"""
     # 从 request.state 中获取装饰器处理后的 cookies 和 token
     merged_cookies = request.state.wx_cookies
     final_token = request.state.wx_token
-    if len(params.query) <= 0:
-        url = f"https://mp.weixin.qq.com/cgi-bin/appmsgpublish?sub=list&begin={params.begin}&count={params.count}&fakeid={params.wx_public_id}&type=101_1&free_publish_type=1&sub_action=list_ex&token={final_token}&lang=zh_CN&f=json&ajax=1"
-    else:
-        url = f"https://mp.weixin.qq.com/cgi-bin/appmsgpublish?sub=search&search_field=7&begin={params.begin}&count={params.count}&query={params.query}&fakeid={params.wx_public_id}&type=101_1&free_publish_type=1&sub_action=list_ex&token={final_token}&lang=zh_CN&f=json&ajax=1"
-    print('url', url)
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            response = await client.get(url,timeout=10,cookies=merged_cookies)
-            response.raise_for_status()
-            json_data = json.loads(response.text)
-            base_resp = json_data.get('base_resp',{})
-            handle_error(base_resp)
-            publish_page = json_data.get('publish_page',"")
-            publish_page_obj = json.loads(publish_page,)
-            publish_page_obj['publish_list'] = [json.loads(item["publish_info"]) for item in publish_page_obj['publish_list']]
-            return publish_page_obj
+        if params.incremental and len(params.query) <= 0:
+            return await _fetch_wx_article_list_incremental(merged_cookies, final_token, params)
+        return await _request_article_publish_page(
+            merged_cookies, final_token, params.wx_public_id, params.begin, params.count, params.query
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"HTTP错误: {e}")
 
 
+async def _fetch_wx_article_list_incremental(merged_cookies: Dict[str, str], final_token: str,
+                                             params: ArticleListRequest) -> Dict[str, Any]:
+    """增量拉取文章列表：从第一页开始翻页，遇到上次已同步过的文章即停止
+
+    返回结构与普通文章列表一致（publish_list 中只保留新文章），
+    额外带上 incremental / new_count / pages_fetched / truncated 字段。
+    全部页面拉取成功后才推进高水位，避免中途失败导致漏同步；
+    已有高水位时，达到 WX_ARTICLE_INCREMENTAL_MAX_PAGES 仍未翻到已同步的文章（truncated）不推进高水位，
+    否则翻页上限与旧高水位之间的文章会被永久跳过；首次同步（没有高水位）即使 truncated 也保存最新文章的高水位，
+    更早的历史文章需要全量抓取，不然每次增量同步都会重新翻完全部页数。
+    """
+    state = load_sync_state(params.wx_public_id)
+    last_publish_time, last_aids = state if state else (0, [])
+
+    new_publish_list = []
+    new_articles = []
+    total_count = 0
+    pages_fetched = 0
+    begin = 0
+    reached_seen = False
+    reached_end = False
+    while not reached_seen and pages_fetched < settings.WX_ARTICLE_INCREMENTAL_MAX_PAGES:
+        page = await _request_article_publish_page(
+            merged_cookies, final_token, params.wx_public_id, begin, params.count
+        )
+        pages_fetched += 1
+        total_count = int(page.get('total_count', 0) or 0)
+        publish_list = page.get('publish_list', [])
+        for publish_info in publish_list:
+            fresh = []
+            for article in publish_info.get('appmsgex', []) or []:
+                if state and is_article_seen(article, last_publish_time, last_aids):
+                    reached_seen = True
+                    continue
+                fresh.append(article)
+            if fresh:
+                new_publish_list.append({**publish_info, 'appmsgex': fresh})
+                new_articles.extend(fresh)
+        begin += params.count
+        if len(publish_list) < params.count or begin >= total_count:
+            reached_end = True
+            break
+
+    truncated = not (reached_seen or reached_end)
+    high_water_mark = compute_high_water_mark(new_articles)
+    if truncated and state:
+        logger.warning(f"增量同步达到翻页上限 {pages_fetched} 页仍未遇到已同步的文章，不推进高水位: wx_public_id={params.wx_public_id}")
+    elif high_water_mark:
+        new_time, new_aids = high_water_mark
+        if new_time == last_publish_time:
+            new_aids = list(dict.fromkeys(last_aids + new_aids))
+        save_sync_state(params.wx_public_id, new_time, new_aids)
+    logger.info(f"增量同步完成: wx_public_id={params.wx_public_id}, 新文章={len(new_articles)}, 请求页数={pages_fetched}")
+
+    return {
+        "total_count": total_count,
+        "publish_list": new_publish_list,
+        "incremental": True,
+        "new_count": len(new_articles),
+        "pages_fetched": pages_fetched,
+        "truncated": truncated,
+    }
+
+
+@extract_wx_credentials(cookies, token)
+async def fetch_wx_all_articles_stream(request: Request, params: AllArticlesStreamRequest) -> AsyncIterator[str]:
+    """并发抓取公众号全部历史文章，返回 NDJSON 行的异步迭代器
+
+    先同步请求第一页拿到 total_count（失败时直接抛 HTTPException，由全局异常处理返回），
+    再按 begin 偏移量并发请求剩余页面，按 aid 去重后逐行输出：
+        {"type": "meta", ...}     总数、分页信息
+        {"type": "article", ...}  单篇文章
+        {"type": "error", ...}    某一页请求失败（不中断其他页面）
+        {"type": "done", ...}     汇总信息，failed_begins 可用于客户端重试
+    """
+    merged_cookies = request.state.wx_cookies
+    final_token = request.state.wx_token
+    page_size = params.count
+    concurrency = max(1, min(params.concurrency, settings.WX_ARTICLE_CRAWL_MAX_CONCURRENCY))
+
+    try:
+        first_page = await _request_article_publish_page(
+            merged_cookies, final_token, params.wx_public_id, 0, page_size, params.query
+        )
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"HTTP错误: {e}")
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=500, detail=f"请求错误: {e}")
+
+    total_count = int(first_page.get('total_count', 0) or 0)
+    begins = list(range(page_size, total_count, page_size))
+
+    async def _fetch_page(semaphore: asyncio.Semaphore, begin: int):
+        async with semaphore:
+            try:
+                page = await _request_article_publish_page(
+                    merged_cookies, final_token, params.wx_public_id, begin, page_size, params.query
+                )
+                return begin, _extract_publish_articles(page), None
+            except HTTPException as e:
+                return begin, [], str(e.detail)
+            except Exception as e:
+                return begin, [], str(e)
+
+    def _line(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, ensure_ascii=False) + "\n"
+
+    async def _stream() -> AsyncIterator[str]:
+        start_time = time.monotonic()
+        seen_aids = set()
+        failed_begins = []
+
+        def _new_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            result = []
+            for article in articles:
+                aid = article.get('aid')
+                if aid in seen_aids:
+                    continue
+                if aid:
+                    seen_aids.add(aid)
+                result.append(article)
+            return result
+
+        yield _line({
+            "type": "meta",
+            "wx_public_id": params.wx_public_id,
+            "total_count": total_count,
+            "page_size": page_size,
+            "pages": len(begins) + 1,
+            "concurrency": concurrency,
+        })
+        for article in _new_articles(_extract_publish_articles(first_page)):
+            yield _line({"type": "article", "data": article})
+
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = [asyncio.create_task(_fetch_page(semaphore, begin)) for begin in begins]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                begin, articles, error = await finished
+                if error is not None:
+                    failed_begins.append(begin)
+                    logger.warning(f"抓取文章列表分页失败: begin={begin}, error={error}")
+                    yield _line({"type": "error", "begin": begin, "message": error})
+                    continue
+                for article in _new_articles(articles):
+                    yield _line({"type": "article", "data": article})
+        finally:
+            # 客户端断开连接时取消尚未完成的分页请求
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        yield _line({
+            "type": "done",
+            "article_count": len(seen_aids),
+            "failed_begins": sorted(failed_begins),
+            "elapsed": round(time.monotonic() - start_time, 3),
+        })
+
+    return _stream()
+
+
+@extract_wx_credentials(cookies, token)
+async def fetch_wx_rate_limit_budget(request: Request, all_accounts: bool = False):
+    """查询当前凭证（或全部账号）的限流预算"""
+    if all_accounts:
+        return wx_rate_limiters.snapshot()
+    merged_cookies = request.state.wx_cookies
+    final_token = request.state.wx_token
+    return wx_rate_limiters.snapshot(get_wx_credential_key(merged_cookies, final_token))
+
+
 @extract_wx_credentials(cookies, token)
 async def fetch_wx_article_detail_by_link(request: Request, request_data: ArticleDetailRequest):
     """根据文章链接请求得到文章详情（需要传递公众号id以及公众号名称，做网站本地化保存使用）"""
     # 从 request.state 中获取装饰器处理后的 cookies 和 token
     merged_cookies = request.state.wx_cookies
-    final_token = request.state.wx_token
-    article_link = request_data.article_link
-    wx_public_id = request_data.wx_public_id
-    wx_public_name = request_data.wx_public_name
-    is_upload_to_aliyun = request_data.is_upload_to_aliyun # 是否上传到阿里云
-    is_save_to_local = request_data.is_save_to_local # 是否保存到本地
-    save_to_local_path = request_data.save_to_local_path # 保存到本地路径
-    save_to_local_file_name = request_data.save_to_local_file_name # 保存到本地文件名
     
     try:
         # 主动抛出异常，设置返回相应体
         # raise HTTPException(status_code=400, detail="测试异常")
         # 抛出一个业务异常
-        async with httpx.AsyncClient(verify=False) as client:
-            logging.info(f"正在请求文章详情URL: {article_link}")
-            
-            headers = {
-                "Referer": article_link,
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = await client.get(article_link, headers=headers, cookies=merged_cookies)
-            response.raise_for_status()
-            # 返回一个html
-            html_content = response.text
-            oss_file_path = ""
-            local_file_path = ""
-            if is_save_to_local:
-                # 存储html到本地
-                kwargs = {
-                    "wx_public_name": wx_public_name,
-                    "wx_public_id": wx_public_id,
-                    "path_name": 'wx_public' if save_to_local_path == '' else '',
-                    "save_to_local_path": save_to_local_path,
-                    "save_to_local_file_name": save_to_local_file_name
-                }
-                local_file_path = save_html_to_local(html_content, **kwargs)
-            if local_file_path != "" and is_upload_to_aliyun:
-                oss_file_path = upload_to_aliyun(local_file_path)
-            return {
-                "local_file_path": local_file_path,
-                "oss_file_path": oss_file_path
-            }
+        html_content = await _download_article_html(request_data.article_link, merged_cookies)
+        html_content = await _mirror_article_assets_if_needed(html_content, request_data)
+        # 保存放到有界线程池中执行，上传提交到 OSS 后台队列，避免阻塞事件循环
+        return await _save_and_upload_article(html_content, request_data)
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"HTTP错误: {e}")
     except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"请求错误: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"未知错误: {e}")
+
+
+async def _download_article_html(article_link: str, merged_cookies: Dict[str, str]) -> str:
+    """下载文章页面 HTML（文章页是公开页面，不走接口限流）"""
+    client = await get_wx_client()
+    logging.info(f"正在请求文章详情URL: {article_link}")
+    
+    headers = {
+        "Referer": article_link,
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+    response = await client.get(article_link, headers=headers, cookies=merged_cookies)
+    response.raise_for_status()
+    # 返回一个html
+    return response.text
+
+
+async def _mirror_article_assets_if_needed(html_content: str, request_data: ArticleDetailRequest) -> str:
+    """按需把文章资源镜像到保存根目录的共享资源库（只在保存到本地时生效）"""
+    if not (request_data.is_mirror_assets and request_data.is_save_to_local):
+        return html_content
+    save_to_local_path = request_data.save_to_local_path
+    base_dir, article_dir = get_article_save_dirs(
+        request_data.wx_public_name,
+        'wx_public' if save_to_local_path == '' else '',
+        save_to_local_path,
+        request_data.save_to_local_file_name
+    )
+    return await mirror_article_assets(html_content, base_dir, article_dir)
+
+
+async def _save_and_upload_article(html_content: str, request_data: ArticleDetailRequest) -> Dict[str, str]:
+    """按请求参数保存 HTML 到本地，并可选提交阿里云后台上传任务
+
+    保存是同步阻塞操作，放到有界线程池中执行；上传提交到 OSS 后台队列后立即返回任务 ID，
+    上传结果通过 /oss-upload/jobs/{job_id} 查询。
+    """
+    local_file_path = await run_blocking(_save_article_to_local, html_content, request_data)
+    oss_upload_job_id = ""
+    if local_file_path != "" and request_data.is_upload_to_aliyun:
+        oss_upload_job_id = oss_uploader.submit(local_file_path)
+    return {
+        "local_file_path": local_file_path,
+        "oss_file_path": "",
+        "oss_upload_job_id": oss_upload_job_id
+    }
+
+
+def _save_article_to_local(html_content: str, request_data: ArticleDetailRequest) -> str:
+    """按请求参数保存 HTML 到本地（同步阻塞操作），未保存时返回空字符串"""
+    save_to_local_path = request_data.save_to_local_path # 保存到本地路径
+    if not request_data.is_save_to_local:
+        return ""
+    # 存储html到本地
+    kwargs = {
+        "wx_public_name": request_data.wx_public_name,
+        "wx_public_id": request_data.wx_public_id,
+        "path_name": 'wx_public' if save_to_local_path == '' else '',
+        "save_to_local_path": save_to_local_path,
+        "save_to_local_file_name": request_data.save_to_local_file_name,
+        "aid": request_data.aid or None
+    }
+    return save_html_to_local(html_content, **kwargs)
+
+
+def fetch_oss_upload_job(job_id: str) -> Dict[str, Any]:
+    """查询 OSS 后台上传任务状态"""
+    job = oss_uploader.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"上传任务不存在: {job_id}")
+    return job
+
+
+def fetch_oss_upload_jobs(limit: int = 50) -> Dict[str, Any]:
+    """最近的 OSS 后台上传任务"""
+    return {"jobs": oss_uploader.list_jobs(limit)}
+
+
+@extract_wx_credentials(cookies, token)
+async def fetch_wx_article_detail_batch(request: Request, params: ArticleDetailBatchRequest):
+    """批量下载文章详情，返回每篇文章的处理结果
+
+    下载（网络，信号量限制并发）与保存/上传（磁盘、OSS，放到有界线程池执行）流水线处理，
+    某篇文章下载时其他文章可以同时落盘；单篇失败不影响其他文章。
+    """
+    merged_cookies = request.state.wx_cookies
+    concurrency = max(1, min(params.concurrency, settings.WX_ARTICLE_BATCH_MAX_CONCURRENCY))
+    download_semaphore = asyncio.Semaphore(concurrency)
+    start_time = time.monotonic()
+
+    async def _process(index: int, item: ArticleDetailRequest) -> Dict[str, Any]:
+        result = {"index": index, "article_link": item.article_link, "success": False,
+                  "local_file_path": "", "oss_file_path": "", "oss_upload_job_id": "", "error": ""}
+        try:
+            async with download_semaphore:
+                html_content = await _download_article_html(item.article_link, merged_cookies)
+            html_content = await _mirror_article_assets_if_needed(html_content, item)
+            saved = await _save_and_upload_article(html_content, item)
+            result.update(saved)
+            result["success"] = True
+        except httpx.HTTPStatusError as e:
+            result["error"] = f"HTTP错误: {e}"
+        except httpx.RequestError as e:
+            result["error"] = f"请求错误: {e}"
+        except Exception as e:
+            result["error"] = f"未知错误: {e}"
+        if not result["success"]:
+            logger.warning(f"批量下载文章失败: {item.article_link}, {result['error']}")
+        return result
+
+    results = await asyncio.gather(*[_process(index, item) for index, item in enumerate(params.items)])
+    succeeded = sum(1 for item in results if item["success"])
+    logger.info(f"批量下载文章完成: 共{len(results)}篇, 成功{succeeded}篇, 耗时{time.monotonic() - start_time:.2f}s")
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed": round(time.monotonic() - start_time, 3),
+        "results": results,
+    }
     
 async def fetch_set_wx_cookie_token(params: CookieTokenRequest):
     """设置cookie、token"""
@@ -221,20 +561,20 @@ async def fetch_prelogin(request_data: PreloginRequest):
     
     
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            logging.info(f"正在请求预登录URL: {url}")
-            response = await client.post(url, data=data, headers=headers, timeout=10)
-            print('第一步：预登录获取忽略密码列表---response', response.text)
-            print('第一步：预登录获取忽略密码列表---cookie', response.cookies)
-            response.raise_for_status()
-            
-            # 解析响应
-            json_data = json.loads(response.text)
-            base_resp = json_data.get('base_resp', {})
-            handle_error(base_resp)
-            
-            # 返回预登录结果
-            return json_data
+        client = await get_wx_client()
+        logging.info(f"正在请求预登录URL: {url}")
+        response = await client.post(url, data=data, headers=headers)
+        print('第一步：预登录获取忽略密码列表---response', response.text)
+        print('第一步：预登录获取忽略密码列表---cookie', response.cookies)
+        response.raise_for_status()
+        
+        # 解析响应
+        json_data = json.loads(response.text)
+        base_resp = json_data.get('base_resp', {})
+        handle_error(base_resp)
+        
+        # 返回预登录结果
+        return json_data
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"HTTP错误: {e}")
     except httpx.RequestError as e:
@@ -265,30 +605,30 @@ async def fetch_startlogin(request_data: StartLoginRequest):
     }
     
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            logging.info(f"正在请求获取二维码URL: {url}")
-            response = await client.post(url, data=data, headers=headers, timeout=10)
-            print('第二步：获取二维码---response', response.text)
-            print('第二步：获取二维码---cookie---data', response.cookies, data)
-            global cookies
-            cookies = {cookie[0]: cookie[1] for cookie in response.cookies.items()}
-            # 构建cookie字符串
-            cookie_str = '; '.join([f"{k}={v}" for k, v in cookies.items()])
-            print('第二步：获取二维码---cookie_str', cookie_str)
-            print('第二步：获取二维码---cookies', cookies)
-            response.raise_for_status()
-            
-            # 解析响应
-            json_data = json.loads(response.text)
-            base_resp = json_data.get('base_resp', {})
-            handle_error(base_resp)
-            
-            # 返回二维码信息
-            return {
-                **json_data,
-                'cookie_str': cookie_str,
-                'cookies': cookies
-            }
+        client = await get_wx_client()
+        logging.info(f"正在请求获取二维码URL: {url}")
+        response = await client.post(url, data=data, headers=headers)
+        print('第二步：获取二维码---response', response.text)
+        print('第二步：获取二维码---cookie---data', response.cookies, data)
+        global cookies
+        cookies = {cookie[0]: cookie[1] for cookie in response.cookies.items()}
+        # 构建cookie字符串
+        cookie_str = '; '.join([f"{k}={v}" for k, v in cookies.items()])
+        print('第二步：获取二维码---cookie_str', cookie_str)
+        print('第二步：获取二维码---cookies', cookies)
+        response.raise_for_status()
+        
+        # 解析响应
+        json_data = json.loads(response.text)
+        base_resp = json_data.get('base_resp', {})
+        handle_error(base_resp)
+        
+        # 返回二维码信息
+        return {
+            **json_data,
+            'cookie_str': cookie_str,
+            'cookies': cookies
+        }
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"HTTP错误: {e}")
     except httpx.RequestError as e:
@@ -321,17 +661,17 @@ async def fetch_webreport(request_data: WebreportRequest):
     }
     
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            logging.info(f"正在请求上报URL: {url}")
-            response = await client.post(url, data=data, headers=headers, timeout=10)
-            # print('response--------', response.json())
-            print('第三步：上报信息---response', response.text)
-            print('第三步：上报信息---cookie', response.cookies)
-            print('第三步：上报信息---data', data)
-            response.raise_for_status()
-            
-            # 返回上报结果
-            return {**response.json(), "newsessionid": report_json["newsessionid"]}
+        client = await get_wx_client()
+        logging.info(f"正在请求上报URL: {url}")
+        response = await client.post(url, data=data, headers=headers)
+        # print('response--------', response.json())
+        print('第三步：上报信息---response', response.text)
+        print('第三步：上报信息---cookie', response.cookies)
+        print('第三步：上报信息---data', data)
+        response.raise_for_status()
+        
+        # 返回上报结果
+        return {**response.json(), "newsessionid": report_json["newsessionid"]}
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"HTTP错误: {e}")
     except httpx.RequestError as e:
@@ -366,31 +706,31 @@ async def fetch_get_wx_login_qrcode(request: Request):
     logger.info(f"第四步：获取微信登录二维码---cookies: {cookies}")
     
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            response = await client.get(url, timeout=10, cookies=cookies)
-            
-            # 检查响应状态
-            if response.status_code != 200:
-                logger.error(f"获取二维码失败，状态码: {response.status_code}")
-                raise HTTPException(status_code=response.status_code, 
-                                  detail=f"获取二维码失败: {response.text}")
-            
-            # 记录二维码大小
-            logger.info(f"二维码大小: {len(response.content)} bytes")
+        client = await get_wx_client()
+        response = await client.get(url, cookies=cookies)
+        
+        # 检查响应状态
+        if response.status_code != 200:
+            logger.error(f"获取二维码失败，状态码: {response.status_code}")
+            raise HTTPException(status_code=response.status_code, 
+                              detail=f"获取二维码失败: {response.text}")
+        
+        # 记录二维码大小
+        logger.info(f"二维码大小: {len(response.content)} bytes")
+        
+        # 保存二维码到本地文件用于调试
+        # 获取临时文件路径
+        # 在 .app 包模式下：
+        # 当前工作目录 (CWD) 被设置为 .app 包内部
+        # 这个目录是只读的（macOS 安全机制）
+        # 所以无法写入文件
+        qrcode_file_path = get_temp_file_path('qrcode.png')
+        with open(qrcode_file_path, 'wb') as f:
+            f.write(response.content)
+        print('二维码保存路径:', qrcode_file_path)
             
-            # 保存二维码到本地文件用于调试
-            # 获取临时文件路径
-            # 在 .app 包模式下：
-            # 当前工作目录 (CWD) 被设置为 .app 包内部
-            # 这个目录是只读的（macOS 安全机制）
-            # 所以无法写入文件
-            qrcode_file_path = get_temp_file_path('qrcode.png')
-            with open(qrcode_file_path, 'wb') as f:
-                f.write(response.content)
-            print('二维码保存路径:', qrcode_file_path)
-                
-            # 直接返回二进制内容
-            return response.content
+        # 直接返回二进制内容
+        return response.content
     except Exception as e:
         logger.error(f"获取二维码时发生错误: {e}")
         raise HTTPException(status_code=500, detail=f"获取二维码失败: {str(e)}")
@@ -400,18 +740,18 @@ async def fetch_get_wx_login_qrcode(request: Request):
 async def fetch_get_qrcode_status(request: Request):
     """获取二维码状态"""
     url = "https://mp.weixin.qq.com/cgi-bin/scanloginqrcode?action=ask&fingerprint=9b1ea719e1ba482a27d45364d3c7f877&token=&lang=zh_CN&f=json"
-    async with httpx.AsyncClient(verify=False) as client:
-        cookies =  request.headers.get('Cookie')
-        # 转换成对象
-        cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in cookies.split(';')}
-        response = await client.get(url, timeout=10, cookies=cookies)
-        print('第五步：获取二维码状态---cookies-----', cookies)
-        print('第五步：获取二维码状态---response', response.text)
-        response.raise_for_status()
-        json_data = json.loads(response.text)
-        base_resp = json_data.get('base_resp', {})
-        handle_error(base_resp)
-        return json_data
+    client = await get_wx_client()
+    cookies =  request.headers.get('Cookie')
+    # 转换成对象
+    cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in cookies.split(';')}
+    response = await client.get(url, cookies=cookies)
+    print('第五步：获取二维码状态---cookies-----', cookies)
+    print('第五步：获取二维码状态---response', response.text)
+    response.raise_for_status()
+    json_data = json.loads(response.text)
+    base_resp = json_data.get('base_resp', {})
+    handle_error(base_resp)
+    return json_data
 
 # 微信公众号登录流程 - 第六步：获取登录信息
 async def fetch_get_login_info(request: Request):
@@ -428,40 +768,43 @@ async def fetch_get_login_info(request: Request):
         "fingerprint": "",
         "token": "",
     }
-    async with httpx.AsyncClient(verify=False) as client:
-        request_cookies =  request.headers.get('Cookie')
-        # 转换成对象
-        request_cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in request_cookies.split(';')}
-        response = await client.post(url, data=data, timeout=10, headers=headers, cookies=request_cookies)
-        print('第六步：获取登录信息---response', response.text)
-        print('第六步：获取登录信息---cookie', request_cookies)
-        print('第六步：获取登录信息---data', data)
-        response.raise_for_status()
+    client = await get_wx_client()
+    request_cookies =  request.headers.get('Cookie')
+    # 转换成对象
+    request_cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in request_cookies.split(';')}
+    response = await client.post(url, data=data, headers=headers, cookies=request_cookies)
+    print('第六步：获取登录信息---response', response.text)
+    print('第六步：获取登录信息---cookie', request_cookies)
+    print('第六步：获取登录信息---data', data)
+    response.raise_for_status()
 
-        response_cookies = {cookie[0]: cookie[1] for cookie in response.cookies.items()}
-        # 构建cookie字符串
-        cookie_str = '; '.join([f"{k}={v}" for k, v in response_cookies.items()])
-        print('第六步：获取登录信息---response-cookie_str', cookie_str)
-        print('第六步：获取登录信息---response-cookies', response_cookies)
-        response.raise_for_status()
-        
-        # 解析响应
-        json_data = json.loads(response.text)
-        base_resp = json_data.get('base_resp', {})
-        handle_error(base_resp)
-        redirect_url = json_data.get('redirect_url', '')
-        # /cgi-bin/home?t=home/index&lang=zh_CN&token=21304194"
-        # 获取token
-        global token, cookies
-        token = redirect_url.split('token=')[1]
-        cookies = response_cookies
-        print('第六步：获取登录信息---global token', token)
-        print('第六步：获取登录信息---global cookies', cookies)
-        return {
-            **json_data,
-            'cookie_str': cookie_str,
-            'token': token
-        }
+    response_cookies = {cookie[0]: cookie[1] for cookie in response.cookies.items()}
+    # 构建cookie字符串
+    cookie_str = '; '.join([f"{k}={v}" for k, v in response_cookies.items()])
+    print('第六步：获取登录信息---response-cookie_str', cookie_str)
+    print('第六步：获取登录信息---response-cookies', response_cookies)
+    response.raise_for_status()
+    
+    # 解析响应
+    json_data = json.loads(response.text)
+    base_resp = json_data.get('base_resp', {})
+    handle_error(base_resp)
+    redirect_url = json_data.get('redirect_url', '')
+    # /cgi-bin/home?t=home/index&lang=zh_CN&token=21304194"
+    # 获取token
+    global token, cookies
+    token = redirect_url.split('token=')[1]
+    cookies = response_cookies
+    if settings.WX_CREDENTIAL_POOL_ENABLED:
+        # 登录成功的账号自动加入凭证池
+        wx_credential_pool.add(response_cookies, token)
+    print('第六步：获取登录信息---global token', token)
+    print('第六步：获取登录信息---global cookies', cookies)
+    return {
+        **json_data,
+        'cookie_str': cookie_str,
+        'token': token
+    }
 # 微信公众号登录流程 - 第七步：验证用户信息
 async def fetch_verify_user_info(request: Request, rq_token: str):
     """验证用户信息"""
@@ -470,37 +813,37 @@ async def fetch_verify_user_info(request: Request, rq_token: str):
         rq_token = token
     print('第七步：验证用户信息---rq_token', rq_token)
     url = f"https://mp.weixin.qq.com/cgi-bin/home?action=get_finder_live_info&fingerprint=77d0c4a6149482d13b8a9b1dea06ad99&token={rq_token}&lang=zh_CN&f=json&ajax=1"
-    async with httpx.AsyncClient(verify=False) as client:
-        request_cookies =  request.headers.get('Cookie')
-        # 转换成对象
-        request_cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in request_cookies.split(';')}
-        response = await client.get(url, timeout=10, cookies=request_cookies)
-        print('第七步：验证用户信息---response', response.text)
-        print('第七步：验证用户信息---cookie', request_cookies)
-        response.raise_for_status()
-        return response.text
+    client = await get_wx_client()
+    request_cookies =  request.headers.get('Cookie')
+    # 转换成对象
+    request_cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in request_cookies.split(';')}
+    response = await client.get(url, cookies=request_cookies)
+    print('第七步：验证用户信息---response', response.text)
+    print('第七步：验证用户信息---cookie', request_cookies)
+    response.raise_for_status()
+    return response.text
     
 # 微信公众号登录流程 - 第八步：根据重定向获取微信公众号个人登录信息
 async def fetch_redirect_login_info(request: Request, redirect_url: str):
     """根据重定向获取微信公众号个人登录信息"""
         # 请求重定向地址根据重定向地址获取微信公众号个人登录信息
     url = f"https://mp.weixin.qq.com{redirect_url}"
-    async with httpx.AsyncClient(verify=False) as client:
-        request_cookies =  request.headers.get('Cookie')
-        # 转换成对象
-        request_cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in request_cookies.split(';')}
-        response = await client.get(url, timeout=10, cookies=request_cookies, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        # 解析HTML获取wx.commonData
-        wx_data = parse_wx_common_data(response.text)
-        # 解析出
-        print('第七步：根据重定向获取微信公众号个人登录信息---重定向地址--wx_data', wx_data)
-        return {
-            "userInfo": wx_data,
-            "cookies": request_cookies,
-            "token": token
-        }
+    client = await get_wx_client()
+    request_cookies =  request.headers.get('Cookie')
+    # 转换成对象
+    request_cookies = {cookie.split('=')[0]: cookie.split('=')[1] for cookie in request_cookies.split(';')}
+    response = await client.get(url, cookies=request_cookies, headers=headers)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, 'lxml')
+    # 解析HTML获取wx.commonData
+    wx_data = parse_wx_common_data(response.text)
+    # 解析出
+    print('第七步：根据重定向获取微信公众号个人登录信息---重定向地址--wx_data', wx_data)
+    return {
+        "userInfo": wx_data,
+        "cookies": request_cookies,
+        "token": token
+    }
     
 
 async def generate_session_id():
@@ -31,7 +31,7 @@ from app.schemas.xmly_data import (
 from app.services.system import system_manager
 from app.decorators.request_decorator import extract_wx_credentials, add_xmly_sign
 from app.utils.slider_solver import SliderSolver
-from app.utils.sign_generator import XimalayaSignNode
+from app.utils.sign_generator import xmly_sign_pool
 from app.utils.xmly_helper import handle_xmly_risk_verification
 
 
@@ -46,12 +46,8 @@ except Exception as e:
     logger.error(f"❌ 滑块验证器初始化失败: {e}")
     slider_solver = None
 
-try:
-    sign_generator = XimalayaSignNode()
-    logger.info("✅ 签名生成器初始化成功")
-except Exception as e:
-    logger.error(f"❌ 签名生成器初始化失败: {e}")
-    sign_generator = None
+# 签名生成器：预生成 xm-sign 池（在 lifespan 中启动）
+sign_generator = xmly_sign_pool
 
 # 公共请求头
 headers = {
@@ -5,13 +5,17 @@ import httpx
 import time
 import asyncio
 import os
+import random
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, Callable, Awaitable
 from fastapi import HTTPException, Request
 from loguru import logger
 from app.utils.xmly_helper import decrypt_url
-import aiofiles
-from app.utils.download_manager import DownloadManager
+from app.utils.download_manager import DownloadManager, create_download_manager
+from app.utils.audio_downloader import audio_download_engine, ProgressCallback
+from app.utils.download_events import download_event_bus
+from app.utils.rate_limiter import AdaptiveRateLimiter, xmly_rate_limiters, get_xmly_credential_key
+from app.core.config import settings
 from app.services.system import system_manager
 
 
@@ -267,126 +271,89 @@ async def batch_get_tracks_download_info(request: Request, track_ids: List[str],
     if not download_path:
         logger.warning(f"用户 {user_id} 未设置下载路径，使用默认路径")
         # 使用 DownloadManager 默认路径
-        download_manager = DownloadManager()
+        download_manager = create_download_manager()
     else:
         logger.info(f"使用下载路径: {download_path}")
-        download_manager = DownloadManager(download_path)
+        download_manager = create_download_manager(download_path)
+
+    # 提供了专辑信息时提交专辑下载任务（持久化队列，全局并发上限）：
+    # 每解析出一个曲目就交给任务，任务已开始时立即下载，不等全部曲目解析完成
+    job = None
+    pipeline = None
+    if album_id and album_name:
+        from app.services.xmly_download_jobs import xmly_download_jobs
+        try:
+            job = xmly_download_jobs.submit(
+                album_id, album_name, track_ids, user_id=user_id,
+                download_path=download_path or "", cookies=merged_cookies
+            )
+        except Exception as e:
+            # 任务队列不可用（未启动 / 任务表不可用）：直接启动本次请求的下载流水线（不持久化）
+            logger.warning(f"提交专辑下载任务失败，直接启动下载流水线: {e}")
+            pipeline = AlbumDownloadPipeline(int(album_id), album_name, download_manager)
+            pipeline.start()
+        if job and not job["attached"]:
+            # 任务需要排队：不在请求中解析（开始时下载链接可能已过期），任务开始时自行解析
+            return {
+                "success": [],
+                "failed": [],
+                "total": len(track_ids),
+                "success_count": 0,
+                "failed_count": 0,
+                "downloading": True,
+                "queued": True,
+                "job_id": job["job_id"],
+                "message": "下载任务已排队"
+            }
 
-    # 串行获取多个曲目的下载信息（避免触发限速）
+    async def _on_resolved(sound_info: Dict):
+        sound = _build_sound_data(sound_info, album_id, album_name)
+        if job:
+            await xmly_download_jobs.offer(job["job_id"], sound)
+        else:
+            await pipeline.put(sound)
+
+    # 并发获取多个曲目的下载信息（按账号自适应限流，触发"系统繁忙"时降速并退避重试）
     import aiohttp
     session = aiohttp.ClientSession()
-    sounds = []
     success_results = []
     failed_results = []
 
-    for idx, track_id in enumerate(track_ids, 1):
-        try:
-            logger.info(f"[{idx}/{len(track_ids)}] 获取曲目 {track_id} 下载信息")
-
-            # 解析音频详情(获取下载URL)
-            sound_info = await _async_analyze_sound(track_id, session, headers, merged_cookies)
-            logger.info(f"音频详情解析结果: {sound_info}")
-
-            # 检测是否触发速率限制
-            if sound_info == "RATE_LIMITED":
-                logger.warning("触发速率限制，等待到下个2分钟节点")
-                await download_manager.wait_until_next_minute(2)
-                # 重试当前音频
-                logger.info(f"重试音频: {track_id}")
-                sound_info = await _async_analyze_sound(track_id, session, headers, merged_cookies)
-                logger.info(f"重试后音频详情解析结果: {sound_info}")
-
-                # 如果重试后还是限速，标记为失败
-                if sound_info == "RATE_LIMITED":
-                    logger.error(f"曲目 {track_id} 经过重试后仍然触发限速")
-                    failed_results.append({
-                        "trackId": track_id,
-                        "error": "触发速率限制",
-                        "status": "failed",
-                        "progress": 0
-                    })
-                    continue
-
-            if sound_info is False or sound_info == 0:
-                logger.error(f"音频详情解析失败: {sound_info}")
-                failed_results.append({
-                    "trackId": track_id,
-                    "error": "解析失败或未授权",
-                    "status": "failed",
-                    "progress": 0
-                })
-                continue
-
-            # 解析成功，构建适合下载管理器的音频信息
-            sound_data = {
-                "trackId": sound_info.get("trackId", ""),
-                "title": sound_info.get("name", ""),
-                "albumTitle": album_name,
-                "albumId": album_id,
-                "intro": sound_info.get("intro", ""),
-                "duration": 0,
-                "coverSmall": sound_info.get("coverSmall", ""),
-                "anchorName": "",
-                0: sound_info.get(0, ""),
-                1: sound_info.get(1, ""),
-                2: sound_info.get(2, "")
-            }
-            sounds.append(sound_data)
-
-            success_results.append({
+    try:
+        resolved = await _resolve_tracks(
+            track_ids, session, merged_cookies, download_manager,
+            on_resolved=_on_resolved if job or pipeline else None
+        )
+    finally:
+        await session.close()
+        if job:
+            # 解析结束，任务下载完已交付的曲目后汇总专辑状态
+            xmly_download_jobs.resolution_finished(job["job_id"])
+        elif pipeline:
+            # 解析结束，下载 worker 处理完队列后汇总专辑状态
+            pipeline.close()
+
+    for track_id, sound_info in zip(track_ids, resolved):
+        if isinstance(sound_info, str):
+            failed_results.append({
                 "trackId": track_id,
-                "data": sound_info,
-                "albumId": album_id,
-                "albumName": album_name,
-                "status": "success",
-                "progress": 100
+                "error": sound_info,
+                "status": "failed",
+                "progress": 0
             })
+            continue
 
-            # 请求间隔，避免触发限速（除了最后一个）
-            if idx < len(track_ids):
-                logger.info("等待10秒后处理下一个曲目...")
-                await asyncio.sleep(10)
+        success_results.append({
+            "trackId": track_id,
+            "data": sound_info,
+            "albumId": album_id,
+            "albumName": album_name,
+            "status": "success",
+            "progress": 100
+        })
 
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"获取曲目 {track_id} 下载信息时出错: {error_msg}")
-
-            # 检测速率限制
-            if download_manager.is_rate_limited(error_msg):
-                logger.warning("检测到速率限制错误，等待到下个2分钟节点")
-                await download_manager.wait_until_next_minute(2)
-                # 不标记为失败，继续下一个
-                continue
-            else:
-                failed_results.append({
-                    "trackId": track_id,
-                    "error": error_msg,
-                    "status": "failed",
-                    "progress": 0
-                })
-
-    await session.close()
     logger.info(f"批量获取曲目下载信息完成：成功 {len(success_results)} 个，失败 {len(failed_results)} 个")
-
-    # 如果有成功的音频且提供了专辑信息，启动后台下载任务
-    if sounds and album_id and album_name:
-        try:
-            # 创建后台任务启动下载
-            logger.info(f"启动后台下载任务：专辑 {album_name} ({album_id})，共 {len(sounds)} 个音频")
-
-            # 使用 asyncio.create_task 启动后台下载
-            asyncio.create_task(
-                _background_download_album(
-                    sounds=sounds,
-                    album_id=int(album_id),
-                    album_name=album_name,
-                    merged_cookies=merged_cookies,
-                    download_manager=download_manager
-                )
-            )
-        except Exception as e:
-            logger.error(f"启动后台下载任务失败: {e}")
-            # 不影响返回结果，只记录错误
+    downloading = bool((job or pipeline) and success_results)
 
     return {
         "success": success_results,
@@ -394,162 +361,357 @@ async def batch_get_tracks_download_info(request: Request, track_ids: List[str],
         "total": len(track_ids),
         "success_count": len(success_results),
         "failed_count": len(failed_results),
-        "downloading": True if sounds and album_id and album_name else False,
-        "message": "下载任务已启动" if sounds and album_id and album_name else "下载信息获取成功"
+        "downloading": downloading,
+        "queued": False,
+        "job_id": job["job_id"] if job else None,
+        "message": "下载任务已启动" if downloading else "下载信息获取成功"
     }
 
 
-async def _background_download_album(sounds: List[Dict], album_id: int, album_name: str,
-                                   merged_cookies: Dict, download_manager: DownloadManager):
+async def _resolve_tracks(track_ids: List[str], session, merged_cookies: Dict,
+                          download_manager: DownloadManager,
+                          on_resolved: Optional[Callable[[Dict], Awaitable[None]]] = None) -> List[Union[Dict, str]]:
     """
-    后台下载专辑音频的任务
+    并发解析多个曲目的下载信息
+
+    - 同时解析 XMLY_RESOLVE_CONCURRENCY 个曲目
+    - 每次请求前从账号的令牌桶（xmly_rate_limiters）获取令牌：从保守速率起步，
+      没有"系统繁忙"时逐步提速，出现时速率减半并全局冷却
+    - 被限流的曲目按指数退避（加随机抖动）重试，最多 XMLY_RESOLVE_MAX_RETRIES 次
 
     Args:
-        sounds: 音频列表
-        album_id: 专辑ID
-        album_name: 专辑名称
+        track_ids: 曲目ID列表
+        session: aiohttp会话
         merged_cookies: cookies字典
-        download_manager: 下载管理器实例
+        download_manager: 下载管理器（用于识别速率限制错误）
+        on_resolved: 每个曲目解析成功后立即调用（用于边解析边下载）
+
+    Returns:
+        List: 与 track_ids 顺序一致，成功为音频信息字典，失败为失败原因字符串
     """
-    try:
-        logger.info(f"开始后台下载专辑: {album_name}")
+    limiter = xmly_rate_limiters.get(get_xmly_credential_key(merged_cookies))
+    semaphore = asyncio.Semaphore(settings.XMLY_RESOLVE_CONCURRENCY)
+    total = len(track_ids)
 
-        # 1. 获取专辑封面
-        album_cover = sounds[0].get("coverSmall", "") if sounds else ""
+    async def _resolve(idx: int, track_id: str) -> Union[Dict, str]:
+        async with semaphore:
+            sound_info = await _resolve_track(idx, total, track_id, session, merged_cookies, limiter, download_manager)
+        if on_resolved is not None and not isinstance(sound_info, str):
+            await on_resolved(sound_info)
+        return sound_info
 
-        # 2. 保存专辑解析结果到 JSON 文件
-        await download_manager.save_album_info(
-            album_id, album_name, album_cover, sounds, "audio"
-        )
+    return await asyncio.gather(*[_resolve(idx, track_id) for idx, track_id in enumerate(track_ids, 1)])
 
-        # 3. 加载下载进度
-        progress = await download_manager.load_progress(album_name)
-        if not progress:
-            logger.error("无法加载下载进度文件")
-            return
 
-        logger.info(f"下载进度: {download_manager.get_download_summary(progress)}")
+async def _resolve_track(idx: int, total: int, track_id: str, session, merged_cookies: Dict,
+                         limiter: AdaptiveRateLimiter, download_manager: DownloadManager) -> Union[Dict, str]:
+    """
+    解析单个曲目（限流 + 指数退避重试，每次请求使用新的 xm-sign）
 
-        # 4. 获取待下载列表
-        pending_ids = download_manager.get_pending_downloads(progress)
-        logger.info(f"待下载列表: {pending_ids}")
-        if not pending_ids:
-            logger.info("所有音频已下载完成!")
-            return
+    Returns:
+        成功返回音频信息字典，失败返回失败原因字符串
+    """
+    max_retries = settings.XMLY_RESOLVE_MAX_RETRIES
+    for attempt in range(max_retries + 1):
+        await limiter.acquire()
+        logger.info(f"[{idx}/{total}] 获取曲目 {track_id} 下载信息（第{attempt + 1}次）")
+        try:
+            request_headers = await _signed_headers()
+            sound_info = await _async_analyze_sound(track_id, session, request_headers, merged_cookies)
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"获取曲目 {track_id} 下载信息时出错: {error_msg}")
+            if not download_manager.is_rate_limited(error_msg):
+                return error_msg
+            sound_info = "RATE_LIMITED"
+
+        if sound_info != "RATE_LIMITED":
+            if sound_info is False or sound_info == 0:
+                logger.error(f"音频详情解析失败: {sound_info}")
+                return "解析失败或未授权"
+            limiter.on_success()
+            return sound_info
+
+        # 系统繁忙：整体降速（同时在途的请求一起被限流时只降一次），当前曲目退避后重试
+        limiter.on_throttle(coalesce=True)
+        if attempt >= max_retries:
+            break
+        delay = min(settings.XMLY_RESOLVE_BACKOFF_MAX, settings.XMLY_RESOLVE_BACKOFF_BASE * (2 ** attempt))
+        delay = random.uniform(delay / 2, delay)
+        logger.warning(f"曲目 {track_id} 触发速率限制，{delay:.1f}s 后重试")
+        await asyncio.sleep(delay)
+
+    logger.error(f"曲目 {track_id} 经过{max_retries}次重试后仍然触发限速")
+    return "触发速率限制"
+
+
+async def resolve_tracks_in_background(track_ids: List[str], merged_cookies: Dict,
+                                       download_manager: DownloadManager, album_id: str, album_name: str,
+                                       on_resolved: Callable[[Dict], Awaitable[None]]) -> List[Union[Dict, str]]:
+    """
+    在请求之外解析曲目（下载任务使用），解析成功的曲目转换成音频信息后交给 on_resolved
 
-        logger.info(f"开始下载 {len(pending_ids)} 个音频...")
+    Returns:
+        List: 与 track_ids 顺序一致，成功为音频信息字典，失败为失败原因字符串
+    """
+    async def _on_resolved(sound_info: Dict):
+        await on_resolved(_build_sound_data(sound_info, album_id, album_name))
 
-        # 5. 创建会话
-        import aiohttp
-        session = aiohttp.ClientSession()
+    import aiohttp
+    async with aiohttp.ClientSession() as session:
+        return await _resolve_tracks(track_ids, session, merged_cookies, download_manager, on_resolved=_on_resolved)
 
-        # 6. 逐个下载音频
-        for idx, track_id in enumerate(pending_ids, 1):
-            # 查找对应的sound信息
-            sound = next((s for s in sounds if str(s.get("trackId")) == track_id), None)
-            if not sound:
-                continue
-
-            try:
-                # 从sounds中查找对应的sound信息（已经解析好的）
-                # 不需要再解析，直接下载
-                sound_info = {
-                    "name": sound.get("title", ""),
-                    "intro": sound.get("intro", ""),
-                    "trackId": sound.get("trackId", ""),
-                    "coverSmall": sound.get("coverSmall", ""),
-                    0: sound.get(0, ""),
-                    1: sound.get(1, ""),
-                    2: sound.get(2, "")
-                }
 
-                # 6.2 下载音频文件
-                # 优先使用最高音质(2)，降级到中等音质(1)
-                quality = 2
-                sound_url = sound_info.get(quality, "")
-                if not sound_url and quality == 2:
-                    sound_url = sound_info.get(1, "")  # 降级到中等音质
-                    quality = 1
-
-                if not sound_url:
-                    await download_manager.update_download_status(
-                        album_name, track_id, "failed", "无可用下载链接", album_id
-                    )
-                    continue
-
-                # 执行下载
-                download_success = await _download_single_audio(
-                    sound_info["name"], sound_url, album_name, session, download_manager
-                )
-
-                if download_success:
-                    # 6.3 下载成功 - 更新进度并写入metadata
-                    await download_manager.update_download_status(
-                        album_name, track_id, "success", None, album_id
-                    )
-
-                    # 构建metadata条目
-                    process_title = _replace_invalid_chars(sound_info["name"])
-                    local_path = f"{_replace_invalid_chars(album_name)}/{process_title}.mp3"
-
-                    track_metadata = {
-                        "track_id": str(sound_info.get("trackId", "")),
-                        "title": sound_info.get("name", ""),
-                        "cover_url": sound_info.get("coverSmall", ""),
-                        "local_path": local_path,
-                        "author": sound.get("anchorName", ""),
-                        "duration": sound.get("duration", 0),
-                        "intro": sound_info.get("intro", "")
-                    }
-
-                    # 追加到metadata.json
-                    await download_manager.append_to_metadata(album_name, track_metadata)
-
-                    logger.info(f"[{idx}/{len(pending_ids)}] 下载成功: {sound_info['name']}")
-                else:
-                    # 下载失败
-                    await download_manager.update_download_status(
-                        album_name, track_id, "failed", "下载文件失败", album_id
-                    )
-                    logger.error(f"[{idx}/{len(pending_ids)}] 下载失败: {sound_info['name']}")
-
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(f"下载音频 {track_id} 时出错: {error_msg}")
-                await download_manager.update_download_status(
-                    album_name, track_id, "failed", error_msg, album_id
-                )
+async def _signed_headers() -> Dict[str, str]:
+    """
+    单次解析请求的请求头：模块级 headers 的副本 + 从预生成池取的新 xm-sign
+
+    解析一个专辑可能持续很久，不能一直沿用同一个签名；也不修改模块级 headers，
+    避免并发的请求和下载任务互相覆盖签名
+    """
+    from app.utils.sign_generator import xmly_sign_pool
+    success, xm_sign, error_msg = await xmly_sign_pool.get_xm_sign()
+    if not success:
+        raise RuntimeError(f"xm-sign 生成失败: {error_msg}")
+    return {**headers, "Xm-Sign": xm_sign, "Referer": "https://www.ximalaya.com/"}
+
+
+def _build_sound_data(sound_info: Dict, album_id: str, album_name: str) -> Dict:
+    """解析结果 -> 下载管理器使用的音频信息"""
+    return {
+        "trackId": sound_info.get("trackId", ""),
+        "title": sound_info.get("name", ""),
+        "albumTitle": album_name,
+        "albumId": album_id,
+        "intro": sound_info.get("intro", ""),
+        "duration": 0,
+        "coverSmall": sound_info.get("coverSmall", ""),
+        "anchorName": "",
+        0: sound_info.get(0, ""),
+        1: sound_info.get(1, ""),
+        2: sound_info.get(2, "")
+    }
 
-        await session.close()
 
+# 正在运行的下载流水线任务（保持引用，避免后台任务被回收）
+_pipeline_tasks = set()
 
-        # 7. 显示最终统计
-        final_progress = await download_manager.load_progress(album_name)
-        summary = download_manager.get_download_summary(final_progress)
-        logger.info(summary)
 
-        # 8. 检查是否全部完成
-        if download_manager.is_album_complete(final_progress):
-            logger.info("专辑下载完成!")
-            # 更新全局状态为 completed
-            await download_manager.update_album_status(
-                album_id, album_name, "completed",
-                total_count=final_progress["total_count"],
-                success_count=final_progress["success_count"]
+class AlbumDownloadPipeline:
+    """
+    专辑"解析 → 下载"流水线
+
+    解析阶段每解析出一个曲目就 put() 进队列，XMLY_DOWNLOAD_WORKERS 个下载 worker 并发消费，
+    第一个下载链接解密后就开始下载；close() 表示解析结束，worker 处理完队列后汇总专辑状态。
+    整个专辑的耗时接近 max(解析, 下载)，而不是两者之和。
+    """
+
+    def __init__(self, album_id: int, album_name: str, download_manager: DownloadManager):
+        self.album_id = album_id
+        self.album_name = album_name
+        self.download_manager = download_manager
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker_count = settings.XMLY_DOWNLOAD_WORKERS
+        self._album_cover = ""
+        self._registered_count = 0
+        self._enqueued = set()  # 已放入队列的曲目（同一曲目只下载一次）
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """启动下载 worker（后台任务）"""
+        task = asyncio.create_task(self._run())
+        _pipeline_tasks.add(task)
+        task.add_done_callback(_pipeline_tasks.discard)
+        self._task = task
+
+    async def join(self):
+        """等待 worker 处理完队列并汇总专辑状态（需先 close）"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def cancel(self):
+        """中止下载（正在下载的音频保留 .part，下次继续）"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def put(self, sound: Dict):
+        """登记一个已解析的曲目（增量写入专辑信息和下载进度），需要下载时放入队列"""
+        track_id = str(sound.get("trackId"))
+        try:
+            if not self._album_cover:
+                self._album_cover = sound.get("coverSmall", "")
+            await self.download_manager.save_album_info(
+                self.album_id, self.album_name, self._album_cover, [sound], "audio"
             )
+            self._registered_count += 1
+            progress = await self.download_manager.load_progress(self.album_name)
+        except Exception as e:
+            logger.error(f"登记曲目 {track_id} 失败: {e}")
+            return
+
+        if track_id in self._enqueued:
+            logger.info(f"曲目 {track_id} 已在下载队列中，跳过")
+        elif progress and self.download_manager.is_download_pending(progress, track_id):
+            self._enqueued.add(track_id)
+            self._queue.put_nowait(sound)
         else:
-            logger.warning("部分音频下载失败,可重新运行继续下载")
-            # 保持 processing 状态
-            await download_manager.update_album_status(
-                album_id, album_name, "processing",
-                total_count=final_progress["total_count"],
-                success_count=final_progress["success_count"]
+            logger.info(f"曲目 {track_id} 已下载，跳过")
+
+    def close(self):
+        """解析结束：每个 worker 收到一个结束标记"""
+        for _ in range(self._worker_count):
+            self._queue.put_nowait(None)
+
+    async def _run(self):
+        await asyncio.gather(*[self._worker() for _ in range(self._worker_count)])
+
+        if not self._registered_count:
+            logger.warning(f"专辑 {self.album_name} 没有解析成功的曲目，跳过下载")
+            return
+        try:
+            await _finalize_album_download(self.album_id, self.album_name, self.download_manager)
+        except Exception as e:
+            logger.error(f"后台下载任务异常: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+
+    async def _worker(self):
+        while True:
+            sound = await self._queue.get()
+            if sound is None:
+                return
+            await _download_album_track(sound, self.album_id, self.album_name, self.download_manager)
+
+
+async def _download_album_track(sound: Dict, album_id: int, album_name: str,
+                                download_manager: DownloadManager) -> bool:
+    """
+    下载专辑中的单个音频，并更新下载进度和 metadata
+
+    Args:
+        sound: 已解析的音频信息
+        album_id: 专辑ID
+        album_name: 专辑名称
+        download_manager: 下载管理器实例
+
+    Returns:
+        bool: 是否下载成功
+    """
+    track_id = str(sound.get("trackId", ""))
+    title = sound.get("title", "")
+
+    async def _fail(error_msg: str):
+        await download_manager.update_download_status(
+            album_name, track_id, "failed", error_msg, album_id
+        )
+        download_event_bus.publish("failed", album_id, track_id=track_id, title=title, error=error_msg)
+
+    try:
+        # 已经解析好的音频信息，不需要再解析，直接下载
+        sound_info = {
+            "name": sound.get("title", ""),
+            "intro": sound.get("intro", ""),
+            "trackId": sound.get("trackId", ""),
+            "coverSmall": sound.get("coverSmall", ""),
+            0: sound.get(0, ""),
+            1: sound.get(1, ""),
+            2: sound.get(2, "")
+        }
+
+        # 优先使用最高音质(2)，降级到中等音质(1)
+        quality = 2
+        sound_url = sound_info.get(quality, "")
+        if not sound_url and quality == 2:
+            sound_url = sound_info.get(1, "")  # 降级到中等音质
+            quality = 1
+
+        if not sound_url:
+            await _fail("无可用下载链接")
+            return False
+
+        # 执行下载
+        download_success = await _download_single_audio(
+            sound_info["name"], sound_url, album_name, download_manager, track_id=track_id,
+            on_progress=lambda written, total: download_event_bus.publish_progress(
+                album_id, track_id, title, written, total
             )
+        )
+
+        if not download_success:
+            await _fail("下载文件失败")
+            logger.error(f"下载失败: {sound_info['name']}")
+            return False
 
+        # 下载成功 - 更新进度并写入metadata
+        await download_manager.update_download_status(
+            album_name, track_id, "success", None, album_id
+        )
+
+        # 构建metadata条目
+        process_title = _replace_invalid_chars(sound_info["name"])
+        local_path = f"{_replace_invalid_chars(album_name)}/{process_title}.mp3"
+
+        track_metadata = {
+            "track_id": str(sound_info.get("trackId", "")),
+            "title": sound_info.get("name", ""),
+            "cover_url": sound_info.get("coverSmall", ""),
+            "local_path": local_path,
+            "author": sound.get("anchorName", ""),
+            "duration": sound.get("duration", 0),
+            "intro": sound_info.get("intro", "")
+        }
+
+        # 追加到metadata.json
+        await download_manager.append_to_metadata(album_name, track_metadata)
+
+        download_event_bus.publish("completed", album_id, track_id=track_id, title=title, local_path=local_path)
+        logger.info(f"下载成功: {sound_info['name']}")
+        return True
+
+    except asyncio.CancelledError:
+        # 任务暂停 / 取消：保持 pending，下次继续
+        download_event_bus.discard_progress(album_id, track_id)
+        raise
     except Exception as e:
-        logger.error(f"后台下载任务异常: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        error_msg = str(e)
+        logger.error(f"下载音频 {track_id} 时出错: {error_msg}")
+        await _fail(error_msg)
+        return False
+
+
+async def _finalize_album_download(album_id: int, album_name: str, download_manager: DownloadManager):
+    """显示最终统计，并根据是否全部完成更新专辑全局状态"""
+    await download_manager.flush(album_name)
+    final_progress = await download_manager.load_progress(album_name)
+    if not final_progress:
+        logger.error("无法加载下载进度文件")
+        return
+    summary = download_manager.get_download_summary(final_progress)
+    logger.info(summary)
+    complete = download_manager.is_album_complete(final_progress)
+    download_event_bus.publish(
+        "album", album_id, album_name=album_name, status="completed" if complete else "processing",
+        total_count=final_progress["total_count"], success_count=final_progress["success_count"],
+        failed_count=final_progress["failed_count"]
+    )
+
+    if complete:
+        logger.info("专辑下载完成!")
+        # 更新全局状态为 completed
+        await download_manager.update_album_status(
+            album_id, album_name, "completed",
+            total_count=final_progress["total_count"],
+            success_count=final_progress["success_count"]
+        )
+    else:
+        logger.warning("部分音频下载失败,可重新运行继续下载")
+        # 保持 processing 状态
+        await download_manager.update_album_status(
+            album_id, album_name, "processing",
+            total_count=final_progress["total_count"],
+            success_count=final_progress["success_count"]
+        )
 
 
 async def _async_analyze_sound(sound_id: str, session, headers: Dict, merged_cookies: Dict) -> Dict:
@@ -635,21 +797,22 @@ async def _async_analyze_sound(sound_id: str, session, headers: Dict, merged_coo
 
 
 async def _download_single_audio(sound_name: str, sound_url: str, album_name: str,
-                              session, download_manager: DownloadManager) -> bool:
+                                 download_manager: DownloadManager, track_id: str = "",
+                                 on_progress: Optional[ProgressCallback] = None) -> bool:
     """
-    下载单个音频文件
+    下载单个音频文件（由共享的音频下载引擎执行，受全局并发、单主机连接数和带宽预算限制）
 
     Args:
         sound_name: 音频名称
         sound_url: 下载URL
         album_name: 专辑名称
-        session: aiohttp会话
         download_manager: 下载管理器
+        track_id: 曲目ID（作为下载进度的查询 key，见 get_track_download_progress）
+        on_progress: 每写入一个分块后调用，参数为 (已写入字节数, 总字节数或 None)
 
     Returns:
         bool: 下载是否成功
     """
-    retries = 3
     logger.debug(f'开始下载声音{sound_name}')
 
     sound_name = _replace_invalid_chars(sound_name)
@@ -663,39 +826,30 @@ async def _download_single_audio(sound_name: str, sound_url: str, album_name: st
     cache_path = download_manager._get_album_cache_path(album_name)
     file_path = f"{cache_path}/{sound_name}.{file_type}"
 
-    # 检查文件是否已存在
+    # 检查文件是否已存在（下载引擎只在大小校验通过后才生成目标文件，未完成的下载保存在 .part 中）
     if os.path.exists(file_path):
         logger.info(f'{sound_name}已存在,跳过下载')
         return True
 
-    # 重试下载
-    while retries > 0:
-        try:
-            import aiohttp
-            async with session.get(sound_url, headers=headers, timeout=120) as response:
-                if response.status == 429:  # Too Many Requests
-                    raise Exception("请求过于频繁")
-
-                async with aiofiles.open(file_path, mode="wb") as f:
-                    await f.write(await response.content.read())
-
-            logger.debug(f'{sound_name}下载完成')
-            return True
+    # 速率限制错误（429）由下载引擎向上传播；已有 .part 时断点续传
+    if await audio_download_engine.download(sound_url, file_path, headers=headers,
+                                            on_progress=on_progress,
+                                            progress_key=_track_progress_key(track_id) if track_id else None):
+        logger.debug(f'{sound_name}下载完成')
+        return True
 
-        except Exception as e:
-            logger.debug(f'{sound_name}第{4 - retries}次下载失败: {str(e)}')
+    logger.debug(f'{sound_name}经过三次重试后下载失败')
+    return False
 
-            # 检测速率限制错误
-            if download_manager.is_rate_limited(str(e)):
-                raise  # 向上传播速率限制错误
 
-            retries -= 1
+def _track_progress_key(track_id: str) -> str:
+    """曲目在音频下载引擎中的进度 key"""
+    return f"xmly:{track_id}"
 
-            if retries > 0:
-                await asyncio.sleep(2)  # 重试前等待2秒
 
-    logger.debug(f'{sound_name}经过三次重试后下载失败')
-    return False
+def get_track_download_progress(track_id: str) -> Optional[Dict[str, Any]]:
+    """正在下载的曲目已写入的字节数和总字节数（未在下载时返回 None）"""
+    return audio_download_engine.get_progress(_track_progress_key(track_id))
 
 
 def _replace_invalid_chars(name: str) -> str:
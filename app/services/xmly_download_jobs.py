@@ -0,0 +1,431 @@
+"""
+喜马拉雅专辑下载任务队列
+持久化的专辑下载任务 + 全局并发上限 + 暂停 / 恢复 / 取消
+
+原来 batch_get_tracks_download_info 为每个专辑直接启动一个后台下载流水线：重启后任务丢失、
+无法取消，同时下载的专辑数也没有上限。现在每个专辑下载是一条 xmly_download_job 记录：
+- XMLY_DOWNLOAD_JOB_CONCURRENCY 个 worker 按提交顺序执行排队中的任务
+- 有空闲 worker 时，提交方（批量下载接口）同步解析曲目并返回下载信息，解析结果交给任务；
+  排队超过 XMLY_DOWNLOAD_PREFETCH_TTL 的解析结果（下载链接可能已过期）在任务开始时重新解析
+- 需要排队的任务不在提交时解析（开始时链接可能已过期，会解析两次），接口直接返回 job_id，
+  任务开始时再解析
+- 暂停 / 取消会中止正在下载的音频（保留 .part，恢复后断点续传）；恢复的任务和重启后恢复的任务
+  只重新解析尚未下载成功的曲目（下载链接有时效，不持久化）
+- 同一专辑的任务串行执行，避免两个流水线同时写同一个文件
+- 任务表的 cookies 字段明文保存提交时的喜马拉雅登录 cookies（与 {platform}_session.json 登录会话一样），
+  用于恢复任务时重新解析；与已保存的登录会话相同时不重复保存，恢复时改用登录会话
+worker 在 app/main.py 的 lifespan 中启动，启动时把上次未结束的任务重新排队。
+"""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+from fastapi import HTTPException
+from loguru import logger
+
+from app.core.config import settings
+from app.db.sqlalchemy_db import database
+from app.models.xmly_download_job import XmlyDownloadJob, XmlyDownloadJobStatus
+from app.services.xmly import load_xmly_session
+from app.services.xmly_download import AlbumDownloadPipeline, resolve_tracks_in_background
+from app.utils.download_events import download_event_bus
+from app.utils.download_manager import create_download_manager
+
+
+TAG = "XMLY_DOWNLOAD_JOBS"
+
+# 未结束的任务状态（同一专辑同时只执行一个）
+ACTIVE_STATUSES = (XmlyDownloadJobStatus.QUEUED, XmlyDownloadJobStatus.RUNNING)
+
+
+class _JobRuntime:
+    """任务的运行期状态（不持久化）"""
+
+    def __init__(self, attached: bool):
+        # 提交方正在同步解析曲目：任务不自行解析，等待提交方把解析结果交过来
+        self.attached = attached
+        self.resolution_done = asyncio.Event()
+        if not attached:
+            self.resolution_done.set()
+        self.prefetched: List[Tuple[float, Dict]] = []  # 任务开始前交过来的音频（解析时间, 音频信息）
+        self.pipeline: Optional[AlbumDownloadPipeline] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class XmlyDownloadJobManager:
+    """喜马拉雅专辑下载任务管理器单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._queue = None
+            cls._instance._workers = []
+            cls._instance._runtimes = {}  # job_id -> _JobRuntime
+            cls._instance._album_locks = {}  # (下载路径, 专辑ID) -> asyncio.Lock
+        return cls._instance
+
+    # ------------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _to_dict(job: XmlyDownloadJob) -> Dict[str, Any]:
+        def _format(value: Optional[datetime]) -> Optional[str]:
+            return value.strftime("%Y-%m-%d %H:%M:%S") if value else None
+
+        return {
+            "job_id": job.job_id,
+            "album_id": job.album_id,
+            "album_name": job.album_name,
+            "user_id": job.user_id,
+            "download_path": job.download_path,
+            "track_ids": json.loads(job.track_ids or "[]"),
+            "status": job.status,
+            "total_count": job.total_count,
+            "success_count": job.success_count,
+            "failed_count": job.failed_count,
+            "error_message": job.error_message,
+            "started_at": _format(job.started_at),
+            "finished_at": _format(job.finished_at),
+            "created_at": _format(job.created_at),
+            "updated_at": _format(job.updated_at),
+        }
+
+    def _create_job(self, album_id: str, album_name: str, track_ids: List[str], user_id: str,
+                    download_path: str, cookies: Dict[str, str]) -> Dict[str, Any]:
+        session = next(database.get_session())
+        try:
+            job = XmlyDownloadJob(
+                job_id=uuid.uuid4().hex,
+                album_id=str(album_id),
+                album_name=album_name,
+                user_id=user_id or "",
+                download_path=download_path or "",
+                track_ids=json.dumps([str(track_id) for track_id in track_ids]),
+                cookies=json.dumps(cookies or {}, ensure_ascii=False),
+                status=XmlyDownloadJobStatus.QUEUED,
+                total_count=len(track_ids),
+            )
+            session.add(job)
+            session.commit()
+            return self._to_dict(job)
+        finally:
+            session.close()
+
+    def _update_job(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        session = next(database.get_session())
+        try:
+            job = session.query(XmlyDownloadJob).filter(XmlyDownloadJob.job_id == job_id).first()
+            if not job:
+                return None
+            for name, value in fields.items():
+                setattr(job, name, value)
+            session.commit()
+            job_info = self._to_dict(job)
+        finally:
+            session.close()
+        if "status" in fields:
+            download_event_bus.publish(
+                "job", job_info["album_id"], job_id=job_id, status=job_info["status"],
+                success_count=job_info["success_count"], failed_count=job_info["failed_count"],
+                total_count=job_info["total_count"], error_message=job_info["error_message"]
+            )
+        return job_info
+
+    def _load_cookies(self, job_id: str) -> Dict[str, str]:
+        session = next(database.get_session())
+        try:
+            job = session.query(XmlyDownloadJob).filter(XmlyDownloadJob.job_id == job_id).first()
+            return json.loads(job.cookies or "{}") if job else {}
+        finally:
+            session.close()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """查询下载任务"""
+        session = next(database.get_session())
+        try:
+            job = session.query(XmlyDownloadJob).filter(XmlyDownloadJob.job_id == job_id).first()
+            return self._to_dict(job) if job else None
+        finally:
+            session.close()
+
+    def list_jobs(self, status: Optional[str] = None, album_id: Optional[str] = None,
+                  limit: int = 50) -> List[Dict[str, Any]]:
+        """最近的下载任务（按提交时间倒序）"""
+        session = next(database.get_session())
+        try:
+            query = session.query(XmlyDownloadJob)
+            if status:
+                query = query.filter(XmlyDownloadJob.status == status)
+            if album_id:
+                query = query.filter(XmlyDownloadJob.album_id == str(album_id))
+            jobs = query.order_by(XmlyDownloadJob.id.desc()).limit(limit).all()
+            return [self._to_dict(job) for job in jobs]
+        finally:
+            session.close()
+
+    # ------------------------------------------------------------
+    # worker
+    # ------------------------------------------------------------
+
+    async def start(self):
+        """启动 worker，并把上次未结束的任务重新排队"""
+        if self._workers:
+            return
+        queue = asyncio.Queue()
+        session = next(database.get_session())
+        try:
+            # 只有 SQLite 会在连接时 create_all，MySQL 等数据库在这里补建任务表
+            XmlyDownloadJob.__table__.create(bind=session.get_bind(), checkfirst=True)
+            jobs = session.query(XmlyDownloadJob).filter(
+                XmlyDownloadJob.status.in_(ACTIVE_STATUSES)
+            ).order_by(XmlyDownloadJob.id).all()
+            for job in jobs:
+                # 上次运行中的任务被关闭中断，重新排队
+                job.status = XmlyDownloadJobStatus.QUEUED
+                queue.put_nowait(job.job_id)
+            session.commit()
+        finally:
+            session.close()
+
+        self._queue = queue
+        concurrency = settings.XMLY_DOWNLOAD_JOB_CONCURRENCY
+        self._workers = [asyncio.create_task(self._worker(index)) for index in range(concurrency)]
+        logger.bind(tag=TAG).info(f"📦 专辑下载任务队列已启动: workers={concurrency}, 恢复任务数={len(jobs)}")
+
+    async def stop(self):
+        """停止 worker（运行中的任务保持 running 状态，下次启动时重新排队）"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._runtimes.clear()
+        logger.bind(tag=TAG).info("📦 专辑下载任务队列已停止")
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.get_job(job_id)
+                # 排队期间被暂停 / 取消的任务跳过
+                if job is None or job["status"] != XmlyDownloadJobStatus.QUEUED:
+                    continue
+                runtime = self._runtimes.setdefault(job_id, _JobRuntime(attached=False))
+                runtime.task = asyncio.create_task(self._run_job(job, runtime))
+                await asyncio.gather(runtime.task, return_exceptions=True)
+            except Exception as e:
+                logger.bind(tag=TAG).error(f"❌ 专辑下载 worker-{index} 异常: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: Dict[str, Any], runtime: _JobRuntime):
+        job_id = job["job_id"]
+        album_key = (job["download_path"], job["album_id"])
+        album_lock = self._album_locks.setdefault(album_key, asyncio.Lock())
+        try:
+            async with album_lock:
+                self._update_job(job_id, status=XmlyDownloadJobStatus.RUNNING, started_at=datetime.now(),
+                                 finished_at=None, error_message=None)
+                logger.bind(tag=TAG).info(f"📦 开始专辑下载任务 {job_id}: {job['album_name']} ({job['album_id']})")
+                success_count = await self._execute(job, runtime)
+            failed_count = job["total_count"] - success_count
+            status = XmlyDownloadJobStatus.COMPLETED if failed_count == 0 else XmlyDownloadJobStatus.FAILED
+            self._update_job(
+                job_id, status=status, success_count=success_count, failed_count=failed_count,
+                finished_at=datetime.now(),
+                error_message=f"{failed_count} 个音频未下载成功" if failed_count else None,
+            )
+            logger.bind(tag=TAG).info(f"📦 专辑下载任务 {job_id} 结束: {status}，成功 {success_count}/{job['total_count']}")
+        except asyncio.CancelledError:
+            # 暂停 / 取消时状态已由调用方写入；应用关闭时保持 running，下次启动重新排队
+            raise
+        except Exception as e:
+            logger.bind(tag=TAG).error(f"❌ 专辑下载任务 {job_id} 失败: {e}")
+            self._update_job(job_id, status=XmlyDownloadJobStatus.FAILED, error_message=str(e),
+                             finished_at=datetime.now())
+        finally:
+            # 暂停后又恢复的任务可能已经登记了新的运行期状态，只清理自己的
+            if self._runtimes.get(job_id) is runtime:
+                self._runtimes.pop(job_id, None)
+
+    async def _execute(self, job: Dict[str, Any], runtime: _JobRuntime) -> int:
+        """执行下载流水线，返回任务中下载成功的曲目数"""
+        album_id, album_name = job["album_id"], job["album_name"]
+        download_manager = create_download_manager(job["download_path"])
+        pipeline = AlbumDownloadPipeline(int(album_id), album_name, download_manager)
+        pipeline.start()
+        runtime.pipeline = pipeline
+        try:
+            # 排队期间暂存的解析结果：超过有效期的下载链接可能已失效，重新解析
+            expired_before = time.monotonic() - settings.XMLY_DOWNLOAD_PREFETCH_TTL
+            expired = []
+            for resolved_at, sound in runtime.prefetched:
+                if resolved_at < expired_before:
+                    expired.append(str(sound.get("trackId")))
+                else:
+                    await pipeline.put(sound)
+            runtime.prefetched.clear()
+
+            if runtime.attached:
+                # 提交方仍在解析：之后的解析结果由 offer 直接放入流水线
+                await runtime.resolution_done.wait()
+                if expired:
+                    logger.bind(tag=TAG).info(f"📦 任务 {job['job_id']} 有 {len(expired)} 个暂存的下载链接已过期，重新解析")
+                    await self._resolve(job, download_manager, pipeline, expired)
+            else:
+                # 恢复的任务：重新解析尚未下载成功的曲目
+                progress = await download_manager.load_progress(album_name)
+                downloads = progress["downloads"] if progress else {}
+                pending = [track_id for track_id in job["track_ids"]
+                           if downloads.get(track_id, {}).get("status") != "success"]
+                if pending:
+                    await self._resolve(job, download_manager, pipeline, pending)
+
+            pipeline.close()
+            await pipeline.join()
+        except asyncio.CancelledError:
+            await pipeline.cancel()
+            raise
+
+        progress = await download_manager.load_progress(album_name)
+        downloads = progress["downloads"] if progress else {}
+        return sum(1 for track_id in job["track_ids"] if downloads.get(track_id, {}).get("status") == "success")
+
+    async def _resolve(self, job: Dict[str, Any], download_manager, pipeline: AlbumDownloadPipeline,
+                       track_ids: List[str]):
+        """在任务中（重新）解析曲目，解析结果直接放入流水线"""
+        cookies = self._load_cookies(job["job_id"])
+        if not cookies:
+            session = load_xmly_session()
+            cookies = session["cookies"] if session else {}
+        await resolve_tracks_in_background(
+            track_ids, cookies, download_manager, job["album_id"], job["album_name"], on_resolved=pipeline.put
+        )
+
+    # ------------------------------------------------------------
+    # 提交 / 控制
+    # ------------------------------------------------------------
+
+    def _can_start_now(self, download_path: str, album_id: str) -> bool:
+        """新提交的任务能否立即开始（有空闲 worker 且同一专辑没有正在执行的任务）"""
+        busy = sum(1 for runtime in self._runtimes.values()
+                   if runtime.task is not None and not runtime.task.done())
+        if len(self._workers) - busy <= self._queue.qsize():
+            return False
+        album_lock = self._album_locks.get((download_path, str(album_id)))
+        return album_lock is None or not album_lock.locked()
+
+    def submit(self, album_id: str, album_name: str, track_ids: List[str], user_id: str = "",
+               download_path: str = "", cookies: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        提交专辑下载任务
+
+        任务能立即开始时 attached 为 True：调用方解析曲目，通过 offer 交付解析结果，解析结束时调用
+        resolution_finished；否则任务排队，开始时自行解析，调用方不需要解析。
+
+        Returns:
+            任务信息（额外包含 attached）
+
+        Raises:
+            RuntimeError: 任务队列未启动（调用方可退回直接下载）
+        """
+        if self._queue is None:
+            raise RuntimeError("专辑下载任务队列未启动")
+        # 与已保存的登录会话相同的 cookies 不再明文保存一份，恢复时从登录会话读取
+        session = load_xmly_session()
+        if cookies and session and session.get("cookies") == cookies:
+            cookies = {}
+        attached = self._can_start_now(download_path, album_id)
+        job = self._create_job(album_id, album_name, track_ids, user_id, download_path, cookies or {})
+        if attached:
+            self._runtimes[job["job_id"]] = _JobRuntime(attached=True)
+        self._queue.put_nowait(job["job_id"])
+        logger.bind(tag=TAG).info(
+            f"📦 专辑下载任务已提交 {job['job_id']}: {album_name}，曲目数 {len(track_ids)}"
+            f"{'' if attached else '，排队中（开始时解析）'}"
+        )
+        return {**job, "attached": attached}
+
+    async def offer(self, job_id: str, sound: Dict):
+        """交付一个已解析的音频：任务运行中直接进入流水线，否则暂存到任务开始（过期的在开始时重新解析）"""
+        runtime = self._runtimes.get(job_id)
+        if runtime is None:
+            # 任务已暂停 / 取消 / 结束：恢复时会重新解析
+            return
+        if runtime.pipeline is not None:
+            await runtime.pipeline.put(sound)
+        else:
+            runtime.prefetched.append((time.monotonic(), sound))
+
+    def resolution_finished(self, job_id: str):
+        """提交方解析结束"""
+        runtime = self._runtimes.get(job_id)
+        if runtime is not None:
+            runtime.resolution_done.set()
+
+    def _require_job(self, job_id: str) -> Dict[str, Any]:
+        job = self.get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="下载任务不存在")
+        return job
+
+    async def _interrupt(self, job_id: str):
+        """中止任务的运行期状态（正在下载时等待流水线退出）"""
+        runtime = self._runtimes.pop(job_id, None)
+        if runtime is not None and runtime.task is not None and not runtime.task.done():
+            runtime.task.cancel()
+            await asyncio.gather(runtime.task, return_exceptions=True)
+
+    async def pause(self, job_id: str) -> Dict[str, Any]:
+        """暂停排队中或下载中的任务"""
+        job = self._require_job(job_id)
+        if job["status"] not in ACTIVE_STATUSES:
+            raise HTTPException(status_code=400, detail=f"任务状态为 {job['status']}，不能暂停")
+        job = self._update_job(job_id, status=XmlyDownloadJobStatus.PAUSED)
+        await self._interrupt(job_id)
+        logger.bind(tag=TAG).info(f"⏸️ 专辑下载任务已暂停 {job_id}")
+        return job
+
+    async def resume(self, job_id: str) -> Dict[str, Any]:
+        """恢复已暂停的任务，或重试有失败音频的任务（失败的音频重置为待下载后重新排队）"""
+        job = self._require_job(job_id)
+        if job["status"] not in (XmlyDownloadJobStatus.PAUSED, XmlyDownloadJobStatus.FAILED):
+            raise HTTPException(status_code=400, detail=f"任务状态为 {job['status']}，不能恢复")
+        if self._queue is None:
+            raise HTTPException(status_code=503, detail="专辑下载任务队列未启动")
+        # 手动恢复即重试：失败的音频（包括已重试满3次的）重新待下载
+        download_manager = create_download_manager(job["download_path"])
+        reset_count = await download_manager.reset_failed(job["album_name"], job["track_ids"])
+        job = self._update_job(job_id, status=XmlyDownloadJobStatus.QUEUED, error_message=None)
+        self._queue.put_nowait(job_id)
+        logger.bind(tag=TAG).info(f"▶️ 专辑下载任务已恢复 {job_id}，重置失败音频 {reset_count} 个")
+        return job
+
+    async def cancel(self, job_id: str) -> Dict[str, Any]:
+        """取消任务（已下载的音频保留）"""
+        job = self._require_job(job_id)
+        if job["status"] in (XmlyDownloadJobStatus.COMPLETED, XmlyDownloadJobStatus.CANCELLED):
+            raise HTTPException(status_code=400, detail=f"任务状态为 {job['status']}，不能取消")
+        job = self._update_job(job_id, status=XmlyDownloadJobStatus.CANCELLED, finished_at=datetime.now())
+        await self._interrupt(job_id)
+        logger.bind(tag=TAG).info(f"⏹️ 专辑下载任务已取消 {job_id}")
+        return job
+
+    def status(self) -> Dict[str, Any]:
+        """任务队列状态（供调试）"""
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": sum(1 for runtime in self._runtimes.values()
+                           if runtime.task is not None and not runtime.task.done()),
+        }
+
+
+# 全局单例
+xmly_download_jobs = XmlyDownloadJobManager()
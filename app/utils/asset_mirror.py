@@ -0,0 +1,271 @@
+"""
+文章静态资源本地镜像 - 内容寻址（SHA-256）去重存储
+
+保存文章时可选地把图片（data-src / src / 内联样式 url()）和 res.wx.qq.com 上的 CSS/JS 下载到本地，
+并把 HTML 中的引用改写为本地相对路径，离线打开也能正常显示。
+
+资源按内容的 SHA-256 存储在保存根目录下的 _assets 目录（所有公众号共享）：
+    <保存根目录>/_assets/ab/abcdef....jpg
+    <保存根目录>/_assets/manifest.json   资源URL -> 本地相对路径，已镜像过的URL不会重复下载
+公众号 logo、二维码、文末图片等在成千上万篇文章中反复出现，只会存储一份。
+"""
+import asyncio
+import hashlib
+import html
+import json
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+from loguru import logger
+
+from app.core.config import settings
+from app.utils.blocking_executor import run_blocking
+from app.utils.http_client_manager import http_client_manager
+
+
+# 共享资源目录名（位于保存根目录下）
+ASSET_DIR_NAME = "_assets"
+MANIFEST_FILE_NAME = "manifest.json"
+
+# 需要镜像的资源主机
+_ASSET_HOSTS = r'(?:mmbiz\.qpic\.cn|mmbiz\.qlogo\.cn|res\.wx\.qq\.com)'
+# 标签属性中的资源地址：data-src="..." / src="..." / href="..."
+ASSET_ATTR_PATTERN = re.compile(
+    r'(\b(?:data-src|src|href)\s*=\s*)(["\'])((?:https?:)?//' + _ASSET_HOSTS + r'/[^"\']+)\2',
+    re.IGNORECASE
+)
+# 内联样式中的资源地址：url("...") / url(&quot;...&quot;)
+ASSET_CSS_URL_PATTERN = re.compile(
+    r'(url\(\s*(?:&quot;|["\'])?)((?:https?:)?//' + _ASSET_HOSTS + r'/[^"\')\s]+?)((?:&quot;|["\'])?\s*\))',
+    re.IGNORECASE
+)
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_SRC_ATTR_PATTERN = re.compile(r'\s\bsrc\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE)
+IMG_DATA_SRC_PATTERN = re.compile(r'\bdata-src\s*=\s*(["\'])(.*?)\1', re.IGNORECASE)
+
+# 内容类型 -> 扩展名（mimetypes 对部分类型的默认扩展名不理想）
+_CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+    "text/css": ".css",
+    "application/javascript": ".js",
+    "application/x-javascript": ".js",
+    "text/javascript": ".js",
+}
+
+_fetch_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_fetch_semaphore() -> asyncio.Semaphore:
+    """全局资源下载并发限制（批量下载多篇文章时共享）"""
+    global _fetch_semaphore
+    if _fetch_semaphore is None:
+        _fetch_semaphore = asyncio.Semaphore(settings.ASSET_MIRROR_CONCURRENCY)
+    return _fetch_semaphore
+
+
+def _normalize_asset_url(raw_url: str) -> str:
+    """HTML 中的原始地址 -> 可请求的地址（反转义 &amp;，补全协议）"""
+    url = html.unescape(raw_url).strip()
+    if url.startswith("//"):
+        url = "https:" + url
+    return url
+
+
+def _guess_extension(url: str, content_type: str) -> str:
+    """根据 Content-Type / wx_fmt 参数 / 路径后缀推断扩展名"""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in _CONTENT_TYPE_EXTENSIONS:
+        return _CONTENT_TYPE_EXTENSIONS[content_type]
+    parsed = urlparse(url)
+    wx_fmt = parse_qs(parsed.query).get("wx_fmt")
+    if wx_fmt:
+        return "." + ("jpg" if wx_fmt[0] == "jpeg" else wx_fmt[0])
+    suffix = os.path.splitext(parsed.path)[1]
+    if suffix and len(suffix) <= 6:
+        return suffix
+    return mimetypes.guess_extension(content_type) or ""
+
+
+class AssetStore:
+    """单个保存根目录下的内容寻址资源库"""
+
+    def __init__(self, base_dir: str):
+        self.asset_dir = os.path.join(base_dir, ASSET_DIR_NAME)
+        self._manifest_path = os.path.join(self.asset_dir, MANIFEST_FILE_NAME)
+        self._manifest: Dict[str, str] = self._load_manifest()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._dirty = False
+        # 串行写清单（多篇文章并发保存时共用同一个临时文件）
+        self._manifest_lock: Optional[asyncio.Lock] = None
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            if os.path.exists(self._manifest_path):
+                with open(self._manifest_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ 读取资源清单失败，将重新生成: {e}")
+        return {}
+
+    def _write_manifest(self, manifest: Dict[str, str]):
+        os.makedirs(self.asset_dir, exist_ok=True)
+        temp_path = f"{self._manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(temp_path, self._manifest_path)
+
+    def _write_content(self, content: bytes, extension: str) -> str:
+        """按 SHA-256 写入资源（已存在则跳过），返回资源库内的相对路径"""
+        digest = hashlib.sha256(content).hexdigest()
+        relative_path = f"{digest[:2]}/{digest}{extension}"
+        file_path = os.path.join(self.asset_dir, digest[:2], f"{digest}{extension}")
+        if not os.path.exists(file_path):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, file_path)
+        return relative_path
+
+    async def get_or_fetch(self, url: str) -> Optional[str]:
+        """
+        获取资源的本地相对路径，未镜像过则下载（同一 URL 并发请求只下载一次）
+
+        Returns:
+            资源库内的相对路径，下载失败返回 None（调用方保留原始地址）
+        """
+        relative_path = self._manifest.get(url)
+        if relative_path and os.path.exists(os.path.join(self.asset_dir, relative_path)):
+            return relative_path
+
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        relative_path = None
+        try:
+            relative_path = await self._fetch_and_store(url)
+            self._manifest[url] = relative_path
+            self._dirty = True
+        except Exception as e:
+            logger.warning(f"⚠️ 资源镜像失败，保留原始地址: {url}, {e}")
+            relative_path = None
+        finally:
+            self._inflight.pop(url, None)
+            future.set_result(relative_path)
+        return relative_path
+
+    async def _fetch_and_store(self, url: str) -> str:
+        client = await http_client_manager.get_client(urlparse(url).hostname)
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        }
+        async with _get_fetch_semaphore():
+            response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        if len(response.content) > settings.ASSET_MIRROR_MAX_BYTES:
+            raise ValueError(f"资源过大: {len(response.content)} bytes")
+        extension = _guess_extension(url, response.headers.get("content-type", ""))
+        return await run_blocking(self._write_content, response.content, extension)
+
+    async def save_manifest(self):
+        """有新增资源时保存清单（失败只记录日志，下次保存时重试，不影响文章保存）"""
+        if self._manifest_lock is None:
+            self._manifest_lock = asyncio.Lock()
+        async with self._manifest_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            try:
+                await run_blocking(self._write_manifest, dict(self._manifest))
+            except Exception as e:
+                self._dirty = True
+                logger.warning(f"⚠️ 保存资源清单失败: {self._manifest_path}, {e}")
+
+
+_stores: Dict[str, AssetStore] = {}
+
+
+def get_asset_store(base_dir: str) -> AssetStore:
+    """获取（不存在则创建）保存根目录对应的资源库"""
+    base_dir = os.path.abspath(base_dir)
+    store = _stores.get(base_dir)
+    if store is None:
+        store = AssetStore(base_dir)
+        _stores[base_dir] = store
+    return store
+
+
+async def mirror_article_assets(html_content: str, base_dir: str, article_dir: str) -> str:
+    """
+    镜像文章中的图片和静态资源，并把引用改写为本地相对路径
+
+    Args:
+        html_content: 文章 HTML
+        base_dir: 保存根目录（_assets 所在目录）
+        article_dir: 文章 HTML 所在目录（用于计算相对路径）
+
+    Returns:
+        改写后的 HTML（下载失败的资源保留原始地址）
+    """
+    store = get_asset_store(base_dir)
+    raw_urls = await run_blocking(_extract_asset_urls, html_content)
+    if not raw_urls:
+        return html_content
+
+    urls = {raw_url: _normalize_asset_url(raw_url) for raw_url in raw_urls}
+    unique_urls = list(set(urls.values()))
+    relative_paths = await asyncio.gather(*[store.get_or_fetch(url) for url in unique_urls])
+    await store.save_manifest()
+
+    asset_dir_from_article = os.path.relpath(store.asset_dir, article_dir).replace(os.sep, "/")
+    fetched = dict(zip(unique_urls, relative_paths))
+    local_paths = {
+        raw_url: f"{asset_dir_from_article}/{fetched[url]}"
+        for raw_url, url in urls.items() if fetched.get(url)
+    }
+    html_content = await run_blocking(_rewrite_asset_urls, html_content, local_paths)
+    logger.info(f"🖼️ 资源镜像完成: 共{len(unique_urls)}个, 成功{sum(1 for path in relative_paths if path)}个")
+    return html_content
+
+
+def _extract_asset_urls(html_content: str) -> set:
+    """提取 HTML 中需要镜像的原始资源地址"""
+    raw_urls = {match.group(3) for match in ASSET_ATTR_PATTERN.finditer(html_content)}
+    raw_urls.update(match.group(2) for match in ASSET_CSS_URL_PATTERN.finditer(html_content))
+    return raw_urls
+
+
+def _rewrite_asset_urls(html_content: str, local_paths: Dict[str, str]) -> str:
+    """把原始资源地址改写为本地相对路径（local_paths: 原始地址 -> 本地路径）"""
+
+    def _rewrite_img(match: re.Match) -> str:
+        # 懒加载图片只有 data-src，离线时脚本不会执行，需要同时写入 src
+        tag = match.group(0)
+        data_src = IMG_DATA_SRC_PATTERN.search(tag)
+        local_path = local_paths.get(data_src.group(2)) if data_src else None
+        if not local_path:
+            return tag
+        tag = IMG_SRC_ATTR_PATTERN.sub("", tag)
+        return re.sub(r'^<img\b', f'<img src="{local_path}"', tag, count=1, flags=re.IGNORECASE)
+
+    def _rewrite_attr(match: re.Match) -> str:
+        local_path = local_paths.get(match.group(3))
+        return f"{match.group(1)}{match.group(2)}{local_path}{match.group(2)}" if local_path else match.group(0)
+
+    def _rewrite_css_url(match: re.Match) -> str:
+        local_path = local_paths.get(match.group(2))
+        return f"{match.group(1)}{local_path}{match.group(3)}" if local_path else match.group(0)
+
+    html_content = IMG_TAG_PATTERN.sub(_rewrite_img, html_content)
+    html_content = ASSET_ATTR_PATTERN.sub(_rewrite_attr, html_content)
+    return ASSET_CSS_URL_PATTERN.sub(_rewrite_css_url, html_content)
@@ -0,0 +1,257 @@
+"""
+音频下载引擎 - 共享 aiohttp 会话 + 全局并发 + 单主机连接上限 + 全局带宽预算
+
+CDN 音频下载主要受延迟影响，适合并发。原来每个专辑各自创建 ClientSession、逐个下载，
+旧版 Ximalaya.async_get_sound 还用全局锁把所有下载串行化。这里统一由一个引擎负责：
+- 整个应用复用一个 aiohttp.ClientSession（TCPConnector 复用连接、缓存 DNS）
+- 同时下载的文件数由 AUDIO_DOWNLOAD_MAX_CONCURRENT 限制（所有专辑共享）
+- 单个主机的连接数由 AUDIO_DOWNLOAD_PER_HOST_LIMIT 限制，避免压垮同一个 CDN 节点
+- 所有下载共享一个带宽令牌桶（AUDIO_DOWNLOAD_BANDWIDTH_LIMIT 字节/秒，0 表示不限速）
+- 响应按固定大小分块流式写入 <文件名>.part，大小校验通过后才原子重命名为目标文件，
+  每个下载的内存占用是常量，中途失败也不会留下"已存在"的残缺文件
+- 失败（或进程崩溃）时保留 .part，重试 / 下次下载时用 Range: bytes=N- 断点续传；
+  CDN 不支持 Range（返回 200）时从头下载
+
+会话在首次下载时创建，在 app/main.py 的 lifespan 中关闭。
+"""
+import asyncio
+import os
+import re
+import time
+from typing import Dict, Any, Optional, Callable
+
+import aiofiles
+import aiohttp
+from loguru import logger
+
+from app.core.config import settings
+
+
+# 速率限制错误信息（与 DownloadManager.rate_limit_errors 对应，调用方据此识别）
+RATE_LIMITED_ERROR = "请求过于频繁"
+# 下载中的临时文件后缀
+PART_SUFFIX = ".part"
+# Content-Range 响应头：bytes 100-199/1000 或 bytes */1000
+CONTENT_RANGE_PATTERN = re.compile(r'bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)')
+
+# 下载进度回调：(已写入字节数, 总字节数或 None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class BandwidthLimiter:
+    """全局带宽令牌桶（字节/秒），桶容量为 1 秒的流量"""
+
+    def __init__(self, bytes_per_second: int):
+        self.rate = bytes_per_second
+        self._tokens = float(bytes_per_second)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def consume(self, size: int):
+        """消耗 size 字节的额度，不足时异步等待（单次超过桶容量时按比例等待）"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.rate), self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= size
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            # 持锁等待：欠下的额度还清前其他下载也要排队，保证总带宽不超预算
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+
+class AudioDownloadEngine:
+    """音频下载引擎单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._session = None
+            cls._instance._slots = None
+            cls._instance._bandwidth = None
+            cls._instance.active_downloads = 0
+            cls._instance.completed_count = 0
+            cls._instance.failed_count = 0
+            cls._instance.bytes_downloaded = 0
+            cls._instance.resumed_count = 0
+            cls._instance._progress = {}  # 进度 key（默认目标文件路径）-> {"file", "bytes_written", "total_bytes"}
+        return cls._instance
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享会话（首次调用时创建）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.AUDIO_DOWNLOAD_MAX_CONCURRENT * settings.AUDIO_DOWNLOAD_PER_HOST_LIMIT,
+                limit_per_host=settings.AUDIO_DOWNLOAD_PER_HOST_LIMIT,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=None,  # 大文件不设总超时，只限制连接和单次读取
+                sock_connect=settings.AUDIO_DOWNLOAD_CONNECT_TIMEOUT,
+                sock_read=settings.AUDIO_DOWNLOAD_READ_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._slots = asyncio.Semaphore(settings.AUDIO_DOWNLOAD_MAX_CONCURRENT)
+            self._bandwidth = BandwidthLimiter(settings.AUDIO_DOWNLOAD_BANDWIDTH_LIMIT)
+            logger.info(
+                f"🎧 音频下载引擎已创建: concurrent={settings.AUDIO_DOWNLOAD_MAX_CONCURRENT}, "
+                f"per_host={settings.AUDIO_DOWNLOAD_PER_HOST_LIMIT}, "
+                f"bandwidth={settings.AUDIO_DOWNLOAD_BANDWIDTH_LIMIT or '不限'}"
+            )
+        return self._session
+
+    async def close(self):
+        """关闭共享会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("🎧 音频下载引擎已关闭")
+        self._session = None
+
+    async def download(self, url: str, file_path: str, headers: Optional[Dict[str, str]] = None,
+                       retries: int = 3, on_progress: Optional[ProgressCallback] = None,
+                       progress_key: Optional[str] = None) -> bool:
+        """
+        下载单个文件（失败重试，429 直接抛出速率限制错误）
+
+        Args:
+            url: 下载地址
+            file_path: 保存路径
+            headers: 请求头
+            retries: 最大尝试次数
+            on_progress: 每写入一个分块后调用，参数为 (已写入字节数, 总字节数或 None)
+            progress_key: 进度查询 key（get_progress），默认使用目标文件路径
+
+        Returns:
+            bool: 是否下载成功
+
+        Raises:
+            Exception: 服务端返回 429 时抛出（错误信息为 RATE_LIMITED_ERROR）
+        """
+        session = self._get_session()
+        progress_key = progress_key or file_path
+        async with self._slots:
+            self.active_downloads += 1
+            try:
+                for attempt in range(1, retries + 1):
+                    try:
+                        await self._fetch(session, url, file_path, headers, on_progress, progress_key)
+                        self.completed_count += 1
+                        return True
+                    except Exception as e:
+                        if RATE_LIMITED_ERROR in str(e):
+                            raise
+                        logger.debug(f'{os.path.basename(file_path)}第{attempt}次下载失败: {e}')
+                        if attempt < retries:
+                            await asyncio.sleep(2)  # 重试前等待2秒
+                self.failed_count += 1
+                return False
+            finally:
+                self.active_downloads -= 1
+                self._progress.pop(progress_key, None)
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, file_path: str,
+                     headers: Optional[Dict[str, str]], on_progress: Optional[ProgressCallback],
+                     progress_key: str):
+        """
+        流式下载到 .part 临时文件（每个分块计入全局带宽预算），大小校验通过后原子重命名
+
+        .part 已有 N 字节时请求 Range: bytes=N-：
+        - 206：从第 N 字节继续追加
+        - 200：服务端不支持 Range，清空后从头下载
+        - 416：.part 已是完整大小则直接完成，否则删除后从头下载
+        失败时保留 .part 供下次续传。
+        """
+        part_path = file_path + PART_SUFFIX
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        request_headers = dict(headers or {})
+        if offset > 0:
+            request_headers["Range"] = f"bytes={offset}-"
+
+        async with session.get(url, headers=request_headers) as response:
+            if response.status == 429:  # Too Many Requests
+                raise Exception(RATE_LIMITED_ERROR)
+
+            if response.status == 416:
+                total_bytes = self._parse_content_range(response.headers.get("Content-Range"))[1]
+                if total_bytes is not None and offset == total_bytes:
+                    logger.info(f"♻️ {os.path.basename(file_path)} 临时文件已完整，直接完成")
+                    os.replace(part_path, file_path)
+                    return
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise IOError(f"断点续传位置无效（{offset}/{total_bytes} 字节），已删除临时文件")
+            response.raise_for_status()
+
+            if response.status == 206:
+                start, total_bytes = self._parse_content_range(response.headers.get("Content-Range"))
+                if start != offset:
+                    os.remove(part_path)
+                    raise IOError(f"断点续传响应的起始位置不一致: {start} != {offset}")
+                self.resumed_count += 1
+                logger.info(f"♻️ {os.path.basename(file_path)} 从第 {offset} 字节继续下载")
+                mode = "ab"
+            else:
+                if offset > 0:
+                    logger.info(f"{os.path.basename(file_path)} 服务端不支持断点续传，从头下载")
+                offset = 0
+                total_bytes = response.content_length
+                mode = "wb"
+
+            progress = {"file": os.path.basename(file_path), "bytes_written": offset,
+                        "total_bytes": total_bytes, "resumed_from": offset}
+            self._progress[progress_key] = progress
+            async with aiofiles.open(part_path, mode=mode) as f:
+                async for chunk in response.content.iter_chunked(settings.AUDIO_DOWNLOAD_CHUNK_SIZE):
+                    await self._bandwidth.consume(len(chunk))
+                    await f.write(chunk)
+                    progress["bytes_written"] += len(chunk)
+                    self.bytes_downloaded += len(chunk)
+                    if on_progress is not None:
+                        on_progress(progress["bytes_written"], total_bytes)
+
+        # 大小校验通过才算下载完成
+        written = os.path.getsize(part_path)
+        if total_bytes is not None and written != total_bytes:
+            if written > total_bytes:
+                os.remove(part_path)
+            raise IOError(f"下载不完整: {written}/{total_bytes} 字节")
+        os.replace(part_path, file_path)
+
+    @staticmethod
+    def _parse_content_range(content_range: Optional[str]):
+        """解析 Content-Range，返回 (起始字节, 总字节数)，无法解析的部分为 None"""
+        match = CONTENT_RANGE_PATTERN.search(content_range or "")
+        if not match:
+            return None, None
+        start, total = match.groups()
+        return (int(start) if start is not None else None,
+                int(total) if total and total != "*" else None)
+
+    def status(self) -> Dict[str, Any]:
+        """下载引擎状态（供调试）"""
+        return {
+            "session_open": self._session is not None and not self._session.closed,
+            "active_downloads": self.active_downloads,
+            "max_concurrent": settings.AUDIO_DOWNLOAD_MAX_CONCURRENT,
+            "per_host_limit": settings.AUDIO_DOWNLOAD_PER_HOST_LIMIT,
+            "bandwidth_limit": settings.AUDIO_DOWNLOAD_BANDWIDTH_LIMIT,
+            "completed_count": self.completed_count,
+            "failed_count": self.failed_count,
+            "bytes_downloaded": self.bytes_downloaded,
+            "resumed_count": self.resumed_count,
+            "downloads": [dict(progress) for progress in self._progress.values()],
+        }
+
+    def get_progress(self, progress_key: str) -> Optional[Dict[str, Any]]:
+        """正在下载的文件进度（已写入字节数 / 总字节数），未在下载时返回 None"""
+        progress = self._progress.get(progress_key)
+        return dict(progress) if progress else None
+
+
+# 全局单例
+audio_download_engine = AudioDownloadEngine()
@@ -0,0 +1,73 @@
+"""
+阻塞任务执行器 - 把 CPU/磁盘密集的同步操作移出事件循环
+
+HTML 解析、文件写入、OSS 上传等同步操作如果直接在 async 接口中执行，会阻塞整个 uvicorn 事件循环。
+这里用一个有界线程池执行这些操作：
+- 线程池大小由 BLOCKING_POOL_MAX_WORKERS 控制
+- 排队任务数由 BLOCKING_POOL_QUEUE_SIZE 控制，队列满时调用方异步等待（背压），避免无限堆积内存
+线程池在 app/main.py 的 lifespan 中关闭。
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class BlockingTaskExecutor:
+    """有界线程池单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._executor = None
+            cls._instance._slots = None
+        return cls._instance
+
+    def _ensure_started(self):
+        """首次使用时创建线程池和排队信号量"""
+        if self._executor is None:
+            max_workers = settings.BLOCKING_POOL_MAX_WORKERS
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking-task")
+            # 正在执行 + 排队中的任务总数上限
+            self._slots = asyncio.Semaphore(max_workers + settings.BLOCKING_POOL_QUEUE_SIZE)
+            logger.info(f"🧵 阻塞任务线程池已创建: workers={max_workers}, queue={settings.BLOCKING_POOL_QUEUE_SIZE}")
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在线程池中执行同步函数并等待结果
+
+        Args:
+            func: 同步函数
+            *args, **kwargs: 函数参数
+
+        Returns:
+            函数返回值（函数抛出的异常会原样抛出）
+        """
+        self._ensure_started()
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        """关闭线程池（等待正在执行的任务完成）"""
+        executor: Optional[ThreadPoolExecutor] = self._executor
+        self._executor = None
+        self._slots = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("🧵 阻塞任务线程池已关闭")
+
+
+# 全局单例
+blocking_executor = BlockingTaskExecutor()
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """在有界线程池中执行同步函数"""
+    return await blocking_executor.run(func, *args, **kwargs)
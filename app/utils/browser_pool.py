@@ -0,0 +1,176 @@
+"""
+Playwright 浏览器池 - 常驻一个预热的 Chromium，按次分配隔离的浏览器上下文
+
+滑块验证、扫码登录后的 Cookie 刷新等操作原来每次都冷启动 Chromium（1~3 秒 + 内存抖动）。
+浏览器池在 app/main.py 的 lifespan 中启动：
+- 只保留一个常驻 Chromium，每次使用创建新的 BrowserContext（cookies / 存储互相隔离），用完即关闭
+- 同时打开的上下文数由 BROWSER_POOL_MAX_CONTEXTS 限制，并发风控事件不会拉起大量页面
+- 浏览器使用 BROWSER_POOL_RECYCLE_AFTER 次后回收重建（等正在使用的上下文结束后再关闭旧浏览器），
+  浏览器崩溃 / 断开时下一次使用前自动重新启动
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any
+
+from loguru import logger
+from playwright.async_api import async_playwright, Browser, BrowserContext
+
+from app.core.config import settings
+from app.utils.playright_manager import PlaywrightManager
+
+
+class BrowserPool:
+    """Playwright 浏览器池单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._playwright = None
+            cls._instance._browser = None
+            cls._instance._browser_uses = 0
+            cls._instance._active = {}  # 浏览器 -> 正在使用的上下文数
+            cls._instance._retired = set()  # 已回收、等待上下文结束后关闭的浏览器
+            cls._instance._slots = None
+            cls._instance._launch_lock = None
+            cls._instance.launch_count = 0
+        return cls._instance
+
+    @property
+    def is_running(self) -> bool:
+        """浏览器池是否已启动（未启动时调用方自行冷启动浏览器）"""
+        return self._playwright is not None
+
+    async def start(self):
+        """启动 Playwright 并预热一个 Chromium"""
+        if self.is_running:
+            return
+        PlaywrightManager.setup_browser_path()
+        self._slots = asyncio.Semaphore(settings.BROWSER_POOL_MAX_CONTEXTS)
+        self._launch_lock = asyncio.Lock()
+        self._playwright = await async_playwright().start()
+        try:
+            await self._get_browser()
+        except Exception:
+            await self._playwright.stop()
+            self._playwright = None
+            raise
+
+    async def stop(self):
+        """关闭所有浏览器并停止 Playwright"""
+        browsers = set(self._active) | self._retired
+        if self._browser is not None:
+            browsers.add(self._browser)
+        for browser in browsers:
+            await self._close_browser(browser)
+        self._browser = None
+        self._active.clear()
+        self._retired.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+            logger.info("🌐 浏览器池已关闭")
+
+    async def _launch(self) -> Browser:
+        browser = await self._playwright.chromium.launch(
+            headless=settings.BROWSER_POOL_HEADLESS,
+            args=PlaywrightManager.DEFAULT_BROWSER_ARGS
+        )
+        browser.on("disconnected", self._on_disconnected)
+        self.launch_count += 1
+        logger.info(f"🌐 浏览器池已启动 Chromium（第{self.launch_count}次, headless={settings.BROWSER_POOL_HEADLESS}）")
+        return browser
+
+    def _on_disconnected(self, browser: Browser):
+        """浏览器崩溃或被关闭：下一次使用时重新启动"""
+        if browser is self._browser:
+            logger.warning("⚠️ 浏览器池中的 Chromium 已断开，将在下次使用时重新启动")
+            self._browser = None
+        self._retired.discard(browser)
+
+    async def _get_browser(self) -> Browser:
+        """获取当前浏览器，达到回收次数或已断开时重建"""
+        async with self._launch_lock:
+            browser = self._browser
+            if browser is not None and browser.is_connected() and self._browser_uses < settings.BROWSER_POOL_RECYCLE_AFTER:
+                return browser
+            if browser is not None:
+                # 回收旧浏览器：没有正在使用的上下文时立即关闭，否则等最后一个上下文结束
+                if self._active.get(browser, 0) > 0:
+                    self._retired.add(browser)
+                else:
+                    await self._close_browser(browser)
+                logger.info(f"♻️ 浏览器已使用{self._browser_uses}次，回收重建")
+            self._browser = await self._launch()
+            self._browser_uses = 0
+            return self._browser
+
+    async def _close_browser(self, browser: Browser):
+        self._active.pop(browser, None)
+        self._retired.discard(browser)
+        try:
+            if browser.is_connected():
+                await browser.close()
+        except Exception as e:
+            logger.warning(f"⚠️ 关闭浏览器失败: {e}")
+
+    @asynccontextmanager
+    async def new_context(self, extra_options: Optional[Dict[str, Any]] = None):
+        """
+        租用一个隔离的浏览器上下文，退出时关闭
+
+        参数:
+            extra_options: 额外的上下文选项（默认使用 PlaywrightManager 的视口和 UA）
+
+        用法:
+            async with browser_pool.new_context() as context:
+                page = await context.new_page()
+        """
+        if not self.is_running:
+            raise RuntimeError("浏览器池未启动")
+        async with self._slots:
+            browser = await self._get_browser()
+            self._browser_uses += 1
+            self._active[browser] = self._active.get(browser, 0) + 1
+            context: Optional[BrowserContext] = None
+            try:
+                options = {
+                    'viewport': PlaywrightManager.DEFAULT_VIEWPORT,
+                    'user_agent': PlaywrightManager.DEFAULT_USER_AGENT,
+                }
+                if extra_options:
+                    options.update(extra_options)
+                context = await browser.new_context(**options)
+                await context.add_init_script(PlaywrightManager.ANTI_DETECTION_SCRIPT)
+                yield context
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        logger.debug(f"关闭浏览器上下文失败: {e}")
+                remaining = self._active.get(browser, 0) - 1
+                if remaining > 0:
+                    self._active[browser] = remaining
+                else:
+                    self._active.pop(browser, None)
+                    if browser in self._retired:
+                        await self._close_browser(browser)
+
+    def status(self) -> Dict[str, Any]:
+        """浏览器池状态（供调试）"""
+        return {
+            "running": self.is_running,
+            "connected": bool(self._browser and self._browser.is_connected()),
+            "browser_uses": self._browser_uses,
+            "recycle_after": settings.BROWSER_POOL_RECYCLE_AFTER,
+            "active_contexts": sum(self._active.values()),
+            "max_contexts": settings.BROWSER_POOL_MAX_CONTEXTS,
+            "retired_browsers": len(self._retired),
+            "launch_count": self.launch_count,
+        }
+
+
+# 全局单例
+browser_pool = BrowserPool()
@@ -0,0 +1,142 @@
+"""
+下载进度事件总线 - 下载器推送事件，SSE 接口订阅（替代轮询 /album/download-status）
+
+前端原来定时轮询下载状态，每次都要从磁盘读取全局状态和下载进度。现在下载过程直接发布事件：
+- progress：正在下载的音频已写入字节数（每个分块都会发布，总线只保留每个音频的最新值）
+- completed / failed：单个音频下载结束
+- album：专辑下载汇总；job：专辑下载任务状态变化
+订阅方按 DOWNLOAD_EVENTS_MIN_INTERVAL 合并 progress 事件（同一音频在一个间隔内只推送最新的一条），
+其他事件立即推送；每个订阅方的待发送队列有上限，消费过慢时丢弃最旧的事件。
+"""
+import asyncio
+import time
+from typing import Dict, Any, Optional, AsyncIterator
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+# 下载结束事件（发布后移除该音频的进度）
+TRACK_FINISHED_EVENTS = ("completed", "failed")
+
+
+class _Subscription:
+    """单个订阅方（album_id 为 None 时接收所有专辑的事件）"""
+
+    def __init__(self, album_id: Optional[str]):
+        self.album_id = album_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.DOWNLOAD_EVENTS_QUEUE_SIZE)
+        self.wake = asyncio.Event()
+        # 订阅时先推送当前所有进度
+        self.progress_dirty = True
+        self.wake.set()
+        self.last_seq = 0
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return self.album_id is None or event.get("album_id") == self.album_id
+
+
+class DownloadEventBus:
+    """下载进度事件总线单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._subscribers = set()
+            cls._instance._progress = {}  # "专辑ID:音频ID" -> 最新的 progress 事件
+            cls._instance._seq = 0
+            cls._instance.published_count = 0
+            cls._instance.dropped_count = 0
+        return cls._instance
+
+    def publish_progress(self, album_id, track_id, title: str, bytes_written: int,
+                         total_bytes: Optional[int]):
+        """发布音频下载进度（只更新最新值，由订阅方按间隔合并推送）"""
+        self._seq += 1
+        event = {
+            "type": "progress",
+            "album_id": str(album_id),
+            "track_id": str(track_id),
+            "title": title,
+            "bytes_written": bytes_written,
+            "total_bytes": total_bytes,
+            "seq": self._seq,
+        }
+        self._progress[f"{album_id}:{track_id}"] = event
+        for subscription in self._subscribers:
+            if subscription.matches(event):
+                subscription.progress_dirty = True
+                subscription.wake.set()
+
+    def discard_progress(self, album_id, track_id):
+        """下载被中止（暂停 / 取消）时移除音频的进度"""
+        self._progress.pop(f"{album_id}:{track_id}", None)
+
+    def publish(self, event_type: str, album_id, **fields):
+        """发布离散事件（completed / failed / album / job），立即推送给订阅方"""
+        self._seq += 1
+        event = {"type": event_type, "album_id": str(album_id), **fields, "seq": self._seq}
+        if event_type in TRACK_FINISHED_EVENTS:
+            self._progress.pop(f"{album_id}:{fields.get('track_id')}", None)
+        self.published_count += 1
+        for subscription in self._subscribers:
+            if not subscription.matches(event):
+                continue
+            if subscription.queue.full():
+                # 消费过慢：丢弃最旧的事件
+                subscription.queue.get_nowait()
+                self.dropped_count += 1
+            subscription.queue.put_nowait(event)
+            subscription.wake.set()
+
+    async def subscribe(self, album_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        订阅下载事件（异步迭代，调用方断开时退出）
+
+        Args:
+            album_id: 只接收该专辑的事件，为空时接收所有专辑
+        """
+        subscription = _Subscription(str(album_id) if album_id else None)
+        self._subscribers.add(subscription)
+        logger.info(f"📡 下载事件订阅: album={album_id or 'all'}，当前订阅数 {len(self._subscribers)}")
+        last_progress_at = 0.0
+        try:
+            while True:
+                await subscription.wake.wait()
+                subscription.wake.clear()
+
+                while not subscription.queue.empty():
+                    yield subscription.queue.get_nowait()
+
+                if subscription.progress_dirty:
+                    # 距上次推送不足一个间隔时等待，期间的进度更新合并为最新值
+                    delay = last_progress_at + settings.DOWNLOAD_EVENTS_MIN_INTERVAL - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    subscription.progress_dirty = False
+                    last_seq = subscription.last_seq
+                    subscription.last_seq = self._seq
+                    for event in list(self._progress.values()):
+                        if event["seq"] > last_seq and subscription.matches(event):
+                            yield event
+                    last_progress_at = time.monotonic()
+        finally:
+            self._subscribers.discard(subscription)
+            logger.info(f"📡 下载事件订阅结束: album={album_id or 'all'}，当前订阅数 {len(self._subscribers)}")
+
+    def status(self) -> Dict[str, Any]:
+        """事件总线状态（供调试）"""
+        return {
+            "subscribers": len(self._subscribers),
+            "active_downloads": len(self._progress),
+            "published_count": self.published_count,
+            "dropped_count": self.dropped_count,
+            "min_interval": settings.DOWNLOAD_EVENTS_MIN_INTERVAL,
+        }
+
+
+# 全局单例
+download_event_bus = DownloadEventBus()
@@ -1,8 +1,12 @@
 # -*- coding:utf-8 -*-
 """
 下载管理器 - 实现断点续传和速率限制处理
+
+专辑信息、下载进度、metadata 使用追加日志 + 定期压缩快照（app/utils/progress_journal.py），
+每次更新只追加一行事件，读取走内存视图；快照文件保持原来的 JSON 格式。
 """
 import asyncio
+import copy
 import json
 import os
 import time
@@ -12,11 +16,114 @@ import aiohttp
 import colorama
 import logging
 from typing import Dict, List, Optional
+from app.core.config import settings
+from app.utils.progress_journal import JournaledDocument, get_journaled_document
 from app.utils.src_path import get_xmly_download_path
 
 logger = logging.getLogger('logger')
 colorama.init(autoreset=True)
 
+# 文件锁：多个下载 worker 并发更新同一专辑的进度/元数据/全局状态文件时，读-改-写需要串行
+_file_locks: Dict[str, asyncio.Lock] = {}
+
+# 全局状态中已标记为 processing 的专辑（全局状态文件路径, 专辑ID）：解析过程中不再逐首重写全局状态文件
+_processing_albums = set()
+
+
+def _get_file_lock(path: str) -> asyncio.Lock:
+    """获取（不存在则创建）文件对应的锁"""
+    path = os.path.abspath(path)
+    lock = _file_locks.get(path)
+    if lock is None:
+        lock = asyncio.Lock()
+        _file_locks[path] = lock
+    return lock
+
+
+def _new_track_progress(title: str) -> Dict:
+    return {
+        "status": "pending",  # pending, success, failed
+        "title": title,
+        "retry_count": 0,
+        "last_attempt": None,
+        "error_message": None
+    }
+
+
+def _apply_progress_event(progress: Optional[Dict], event: Dict) -> Dict:
+    """下载进度日志事件：add_tracks（登记曲目）、status（更新单个音频状态）、reset_failed（失败的音频重新待下载）"""
+    if progress is None:
+        progress = {
+            "last_update": event["at"],
+            "total_count": 0,
+            "success_count": 0,
+            "failed_count": 0,
+            "downloads": {}
+        }
+
+    if event["op"] == "add_tracks":
+        for track in event["tracks"]:
+            if track["track_id"] not in progress["downloads"]:
+                progress["downloads"][track["track_id"]] = _new_track_progress(track["title"])
+        progress["total_count"] = event["total_count"]
+
+    elif event["op"] == "status":
+        info = progress["downloads"].get(event["track_id"])
+        if info is not None:
+            old_status = info["status"]
+            status = event["status"]
+            info["status"] = status
+            info["last_attempt"] = event["at"]
+            if event.get("error_message"):
+                info["error_message"] = event["error_message"]
+            # 更新重试计数
+            if status == "failed":
+                info["retry_count"] += 1
+            # 更新统计
+            if old_status != "success" and status == "success":
+                progress["success_count"] += 1
+            elif old_status != "failed" and status == "failed":
+                progress["failed_count"] += 1
+
+    elif event["op"] == "reset_failed":
+        for track_id in event["track_ids"]:
+            info = progress["downloads"].get(track_id)
+            if info is not None and info["status"] == "failed":
+                info.update(status="pending", retry_count=0, error_message=None)
+                progress["failed_count"] = max(0, progress["failed_count"] - 1)
+
+    progress["last_update"] = event["at"]
+    return progress
+
+
+def _apply_album_info_event(album_info: Optional[Dict], event: Dict) -> Dict:
+    """专辑信息日志事件：save（更新专辑字段并追加新曲目）"""
+    if album_info is None:
+        album_info = {**event["info"], "total_count": 0, "sounds": []}
+    album_info.update(event["info"])
+    album_info["sounds"].extend(event["sounds"])
+    album_info["total_count"] = len(album_info["sounds"])
+    return album_info
+
+
+def _apply_metadata_event(metadata: Optional[Dict], event: Dict) -> Dict:
+    """metadata 日志事件：append（追加成功下载的音频，首个事件携带专辑头信息）"""
+    if metadata is None:
+        metadata = {**event["header"], "success_count": 0, "resources": []}
+    track = event["track"]
+    if all(resource["track_id"] != track["track_id"] for resource in metadata["resources"]):
+        metadata["resources"].append(track)
+        metadata["success_count"] = len(metadata["resources"])
+    return metadata
+
+
+def create_download_manager(base_path: str = "") -> "DownloadManager":
+    """按 DOWNLOAD_STATE_BACKEND 创建下载管理器（json：JSON 文件 + 追加日志，sqlite：SQLite 状态库）"""
+    if settings.DOWNLOAD_STATE_BACKEND == "sqlite":
+        from app.utils.download_state_store import SqliteDownloadManager
+        return SqliteDownloadManager(base_path)
+    return DownloadManager(base_path)
+
 
 class DownloadManager:
     """管理专辑下载流程,支持断点续传和速率限制"""
@@ -24,7 +131,7 @@ class DownloadManager:
     def __init__(self, base_path: str = ""):
         self.base_path = base_path if base_path else get_xmly_download_path()
         self.rate_limit_errors = ["系统繁忙", "请求过于频繁", "Too Many Requests"]
-        self.global_status_file = os.path.join(base_path, "albums_status.json")
+        self.global_status_file = os.path.join(self.base_path, "albums_status.json")
 
     def _get_album_cache_path(self, album_name: str) -> str:
         """获取专辑缓存目录路径"""
@@ -69,6 +176,17 @@ class DownloadManager:
         async with aiofiles.open(self.global_status_file, mode="w", encoding="utf-8") as f:
             await f.write(json.dumps(status_data, ensure_ascii=False, indent=2))
 
+    async def get_album_record(self, album_id: int) -> Optional[Dict]:
+        """
+        获取专辑的全局状态记录
+
+        Returns:
+            Dict: album_id / album_name / status / total_count / success_count / last_update / cache_path，
+            未记录时返回 None
+        """
+        status_data = await self._load_global_status()
+        return status_data.get(str(album_id))
+
     async def get_album_status(self, album_id: int) -> Optional[str]:
         """
         获取专辑处理状态
@@ -97,20 +215,25 @@ class DownloadManager:
             total_count: 总音频数
             success_count: 成功下载数
         """
-        status_data = await self._load_global_status()
-        album_key = str(album_id)
+        async with _get_file_lock(self.global_status_file):
+            status_data = await self._load_global_status()
+            album_key = str(album_id)
 
-        status_data[album_key] = {
-            "album_id": album_id,
-            "album_name": album_name,
-            "status": status,
-            "total_count": total_count,
-            "success_count": success_count,
-            "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "cache_path": self._get_album_cache_path(album_name)
-        }
+            status_data[album_key] = {
+                "album_id": album_id,
+                "album_name": album_name,
+                "status": status,
+                "total_count": total_count,
+                "success_count": success_count,
+                "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "cache_path": self._get_album_cache_path(album_name)
+            }
 
-        await self._save_global_status(status_data)
+            await self._save_global_status(status_data)
+            if status == "processing":
+                _processing_albums.add((os.path.abspath(self.global_status_file), album_key))
+            else:
+                _processing_albums.discard((os.path.abspath(self.global_status_file), album_key))
         logger.info(f"专辑 {album_id} 状态更新为: {status}")
 
     async def get_album_info_by_id(self, album_id: int) -> Optional[Dict]:
@@ -129,16 +252,7 @@ class DownloadManager:
         if album_key not in status_data:
             return None
 
-        # 获取缓存路径
-        album_name = status_data[album_key]["album_name"]
-        info_path = self._get_album_info_path(album_name)
-
-        if not os.path.exists(info_path):
-            return None
-
-        async with aiofiles.open(info_path, mode="r", encoding="utf-8") as f:
-            content = await f.read()
-            return json.loads(content)
+        return await self.load_album_info(status_data[album_key]["album_name"])
 
     async def list_all_albums(self) -> List[Dict]:
         """
@@ -163,7 +277,7 @@ class DownloadManager:
                               album_cover: str, sounds: List[Dict],
                               resource_type: str):
         """
-        保存专辑解析结果到JSON文件，支持增量更新
+        保存专辑解析结果，支持增量更新（只把新增曲目追加到专辑信息和下载进度日志）
 
         Args:
             album_id: 专辑ID
@@ -172,218 +286,156 @@ class DownloadManager:
             sounds: 音频列表(来自analyze_album的结果)
             resource_type: 资源类型(歌曲/故事)
         """
+        async with _get_file_lock(self._get_progress_path(album_name)):
+            await self._save_album_info(album_id, album_name, album_cover, sounds, resource_type)
+
+    async def _save_album_info(self, album_id: int, album_name: str,
+                               album_cover: str, sounds: List[Dict],
+                               resource_type: str):
+        """保存专辑解析结果（调用方持有专辑文件锁）"""
+        album_info = await self._append_album_info(album_id, album_name, album_cover, sounds, resource_type)
+        total_count = album_info["total_count"]
+
+        # 初始化或更新下载进度（已有的曲目保留原状态）
+        progress = await self._get_progress_document(album_name).append({
+            "op": "add_tracks",
+            "tracks": [{"track_id": str(sound.get("trackId")), "title": sound.get("title", "")} for sound in sounds],
+            "total_count": total_count,
+            "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+
+        # 边解析边下载时每个曲目都会调用：只在专辑开始下载时标记 processing、随进度日志压缩同步一次，
+        # 不再逐首重写全局状态文件（结束时由调用方汇总）
+        album_key = (os.path.abspath(self.global_status_file), str(album_id))
+        if album_key not in _processing_albums or self._get_progress_document(album_name).journal_events == 0:
+            await self.update_album_status(
+                album_id, album_name, "processing",
+                total_count=total_count, success_count=progress["success_count"]
+            )
+
+    async def _append_album_info(self, album_id: int, album_name: str, album_cover: str,
+                                 sounds: List[Dict], resource_type: str) -> Dict:
+        """把新增曲目追加到专辑信息日志，返回更新后的专辑信息"""
         cache_path = self._get_album_cache_path(album_name)
         logger.info(f"专辑缓存目录路径: {cache_path}")
-        logger.info(f"专辑信息sounds: {sounds}")
         os.makedirs(cache_path, exist_ok=True)
 
-        # 检查是否已存在专辑信息
-        existing_info = await self.get_album_info_by_id(album_id)
-        existing_sounds = []
-
+        # 只追加新的曲目
+        info_document = self._get_album_info_document(album_name)
+        existing_info = await info_document.load()
+        existing_track_ids = {str(s.get("trackId")) for s in existing_info["sounds"]} if existing_info else set()
+        new_sounds = [sound for sound in sounds if str(sound.get("trackId")) not in existing_track_ids]
         if existing_info:
-            # 获取已存在的sounds列表
-            existing_sounds = existing_info.get("sounds", [])
-            existing_track_ids = {str(s.get("trackId")) for s in existing_sounds}
-            logger.info(f"已存在专辑信息，现有曲目数: {len(existing_sounds)}")
-
-            # 合并sounds，只添加新的曲目
-            merged_sounds = existing_sounds.copy()
-            new_sounds = []
-
-            for sound in sounds:
-                track_id = str(sound.get("trackId"))
-                if track_id not in existing_track_ids:
-                    merged_sounds.append(sound)
-                    new_sounds.append(sound)
-                    logger.info(f"新增曲目: {track_id} - {sound.get('title', '')}")
-
-            sounds = merged_sounds
-            logger.info(f"合并后总曲目数: {len(sounds)}，新增曲目数: {len(new_sounds)}")
+            logger.info(f"已存在专辑信息，现有曲目数: {len(existing_track_ids)}，新增曲目数: {len(new_sounds)}")
         else:
-            logger.info(f"新建专辑信息，曲目数: {len(sounds)}")
-
-        album_info = {
-            "album_id": album_id,
-            "album_name": album_name,
-            "album_cover": album_cover,
-            "resource_type": resource_type,
-            "total_count": len(sounds),
-            "parsed_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "sounds": sounds
-        }
-
-        info_path = self._get_album_info_path(album_name)
-        async with aiofiles.open(info_path, mode="w", encoding="utf-8") as f:
-            await f.write(json.dumps(album_info, ensure_ascii=False, indent=2))
+            logger.info(f"新建专辑信息，曲目数: {len(new_sounds)}")
 
-        print(colorama.Fore.GREEN + f"✓ 专辑信息已保存: {info_path}")
-        logger.info(f"专辑 {album_name} 信息已保存")
-
-        # 更新全局状态为 processing
-        await self.update_album_status(
-            album_id, album_name, "processing",
-            total_count=len(sounds), success_count=0
-        )
-
-        # 初始化或更新下载进度文件
-        await self._init_or_update_progress(album_name, sounds)
-
-    async def _init_progress(self, album_name: str, sounds: List[Dict]):
-        """初始化下载进度记录"""
-        progress_path = self._get_progress_path(album_name)
-
-        # 如果进度文件已存在,不覆盖
-        if os.path.exists(progress_path):
-            print(colorama.Fore.YELLOW + f"⚠ 检测到已有下载进度,将从断点继续")
-            return
-
-        progress = {
-            "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "total_count": len(sounds),
-            "success_count": 0,
-            "failed_count": 0,
-            "downloads": {}
-        }
-
-        # 为每个音频初始化状态
-        for sound in sounds:
-            track_id = str(sound.get("trackId"))
-            progress["downloads"][track_id] = {
-                "status": "pending",  # pending, success, failed
-                "title": sound.get("title", ""),
-                "retry_count": 0,
-                "last_attempt": None,
-                "error_message": None
-            }
+        album_info = await info_document.append({
+            "op": "save",
+            "info": {
+                "album_id": album_id,
+                "album_name": album_name,
+                "album_cover": album_cover,
+                "resource_type": resource_type,
+                "parsed_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            },
+            "sounds": new_sounds,
+        })
+        logger.info(f"专辑 {album_name} 信息已保存，总曲目数: {album_info['total_count']}")
+        return album_info
 
-        async with aiofiles.open(progress_path, mode="w", encoding="utf-8") as f:
-            await f.write(json.dumps(progress, ensure_ascii=False, indent=2))
+    def _get_album_info_document(self, album_name: str) -> JournaledDocument:
+        return get_journaled_document(self._get_album_info_path(album_name), _apply_album_info_event)
 
-        print(colorama.Fore.GREEN + f"✓ 下载进度文件已初始化: {progress_path}")
+    def _get_progress_document(self, album_name: str) -> JournaledDocument:
+        return get_journaled_document(self._get_progress_path(album_name), _apply_progress_event)
 
-    async def _init_or_update_progress(self, album_name: str, sounds: List[Dict]):
-        """
-        初始化或更新下载进度记录，支持增量更新
-
-        Args:
-            album_name: 专辑名称
-            sounds: 音频列表
-        """
-        progress_path = self._get_progress_path(album_name)
-
-        # 检查进度文件是否已存在
-        if os.path.exists(progress_path):
-            # 加载现有进度
-            async with aiofiles.open(progress_path, mode="r", encoding="utf-8") as f:
-                content = await f.read()
-                progress = json.loads(content)
-
-            print(colorama.Fore.YELLOW + f"⚠ 检测到已有下载进度，准备合并...")
-
-            # 获取现有的track IDs
-            existing_track_ids = set(progress["downloads"].keys())
-
-            # 只添加新的曲目到进度中
-            new_count = 0
-            for sound in sounds:
-                track_id = str(sound.get("trackId"))
-                if track_id not in existing_track_ids:
-                    progress["downloads"][track_id] = {
-                        "status": "pending",
-                        "title": sound.get("title", ""),
-                        "retry_count": 0,
-                        "last_attempt": None,
-                        "error_message": None
-                    }
-                    new_count += 1
-                    logger.info(f"新增曲目到进度文件: {track_id} - {sound.get('title', '')}")
-
-            # 更新总数
-            progress["total_count"] = len(sounds)
-            progress["last_update"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # 保存更新后的进度
-            async with aiofiles.open(progress_path, mode="w", encoding="utf-8") as f:
-                await f.write(json.dumps(progress, ensure_ascii=False, indent=2))
-
-            print(colorama.Fore.GREEN + f"✓ 下载进度文件已更新，新增 {new_count} 个曲目")
-            logger.info(f"下载进度文件已更新，新增 {new_count} 个曲目")
-        else:
-            # 首次初始化进度文件
-            await self._init_progress(album_name, sounds)
+    def _get_metadata_document(self, album_name: str) -> JournaledDocument:
+        return get_journaled_document(self._get_metadata_path(album_name), _apply_metadata_event)
 
     async def load_album_info(self, album_name: str) -> Optional[Dict]:
         """加载专辑信息"""
-        info_path = self._get_album_info_path(album_name)
-        if not os.path.exists(info_path):
-            return None
-
-        async with aiofiles.open(info_path, mode="r", encoding="utf-8") as f:
-            content = await f.read()
-            return json.loads(content)
+        album_info = await self._get_album_info_document(album_name).load()
+        return copy.deepcopy(album_info)
 
     async def load_progress(self, album_name: str) -> Optional[Dict]:
-        """加载下载进度"""
-        progress_path = self._get_progress_path(album_name)
-        if not os.path.exists(progress_path):
-            return None
+        """加载下载进度（内存视图的副本）"""
+        progress = await self._get_progress_document(album_name).load()
+        return copy.deepcopy(progress)
 
-        async with aiofiles.open(progress_path, mode="r", encoding="utf-8") as f:
-            content = await f.read()
-            return json.loads(content)
+    async def load_metadata(self, album_name: str) -> Optional[Dict]:
+        """加载已下载音频的元数据"""
+        metadata = await self._get_metadata_document(album_name).load()
+        return copy.deepcopy(metadata)
 
     async def update_download_status(self, album_name: str, track_id: str,
                                     status: str, error_message: Optional[str] = None,
                                     album_id: Optional[int] = None):
         """
-        更新单个音频的下载状态
+        更新单个音频的下载状态（追加一条日志事件）
 
         Args:
             album_name: 专辑名称
             track_id: 音频ID
             status: 状态(success/failed/pending)
             error_message: 错误信息(可选)
-            album_id: 专辑ID(可选,用于更新全局状态)
+            album_id: 专辑ID(可选,日志压缩时同步更新全局状态)
         """
-        progress = await self.load_progress(album_name)
-        if not progress:
-            return
-
+        async with _get_file_lock(self._get_progress_path(album_name)):
+            await self._update_download_status(album_name, track_id, status, error_message, album_id)
+
+    async def _update_download_status(self, album_name: str, track_id: str,
+                                      status: str, error_message: Optional[str] = None,
+                                      album_id: Optional[int] = None):
+        """更新单个音频的下载状态（调用方持有专辑文件锁）"""
+        document = self._get_progress_document(album_name)
+        progress = await document.load()
         track_id = str(track_id)
-        if track_id in progress["downloads"]:
-            old_status = progress["downloads"][track_id]["status"]
-            progress["downloads"][track_id]["status"] = status
-            progress["downloads"][track_id]["last_attempt"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            if error_message:
-                progress["downloads"][track_id]["error_message"] = error_message
-
-            # 更新重试计数
-            if status == "failed":
-                progress["downloads"][track_id]["retry_count"] += 1
-
-            # 更新统计
-            if old_status != "success" and status == "success":
-                progress["success_count"] += 1
-            elif old_status != "failed" and status == "failed":
-                progress["failed_count"] += 1
+        if not progress or track_id not in progress["downloads"]:
+            return
 
-            progress["last_update"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        progress = await document.append({
+            "op": "status",
+            "track_id": track_id,
+            "status": status,
+            "error_message": error_message,
+            "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+
+        # 全局状态文件是整体重写的，不再每首更新：随进度日志压缩同步一次，结束时由调用方汇总
+        if album_id and document.journal_events == 0:
+            await self.update_album_status(
+                album_id, album_name,
+                "processing",
+                total_count=progress["total_count"],
+                success_count=progress["success_count"]
+            )
+
+    async def reset_failed(self, album_name: str, track_ids: List[str]) -> int:
+        """
+        把下载失败的音频重置为待下载并清空重试次数（手动重试任务时调用，否则重试满3次的音频不会再下载）
 
-            # 保存进度
-            progress_path = self._get_progress_path(album_name)
-            async with aiofiles.open(progress_path, mode="w", encoding="utf-8") as f:
-                await f.write(json.dumps(progress, ensure_ascii=False, indent=2))
+        Returns:
+            重置的音频数
+        """
+        async with _get_file_lock(self._get_progress_path(album_name)):
+            return await self._reset_failed(album_name, [str(track_id) for track_id in track_ids])
 
-            # 更新全局状态
-            if album_id:
-                await self.update_album_status(
-                    album_id, album_name,
-                    "processing",
-                    total_count=progress["total_count"],
-                    success_count=progress["success_count"]
-                )
+    async def _reset_failed(self, album_name: str, track_ids: List[str]) -> int:
+        """重置失败的音频（调用方持有专辑文件锁）"""
+        document = self._get_progress_document(album_name)
+        progress = await document.load()
+        if not progress:
+            return 0
+        failed = [track_id for track_id in track_ids
+                  if progress["downloads"].get(track_id, {}).get("status") == "failed"]
+        if failed:
+            await document.append({
+                "op": "reset_failed",
+                "track_ids": failed,
+                "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            })
+        return len(failed)
 
     async def append_to_metadata(self, album_name: str, track_info: Dict):
         """
@@ -393,36 +445,32 @@ class DownloadManager:
             album_name: 专辑名称
             track_info: 音频信息
         """
-        metadata_path = self._get_metadata_path(album_name)
-
-        # 读取现有metadata
-        if os.path.exists(metadata_path):
-            async with aiofiles.open(metadata_path, mode="r", encoding="utf-8") as f:
-                content = await f.read()
-                metadata = json.loads(content)
-        else:
+        async with _get_file_lock(self._get_metadata_path(album_name)):
+            await self._append_to_metadata(album_name, track_info)
+
+    async def _append_to_metadata(self, album_name: str, track_info: Dict):
+        """追加 metadata（调用方持有 metadata 文件锁）"""
+        document = self._get_metadata_document(album_name)
+        event = {"op": "append", "track": track_info}
+        if await document.load() is None:
             # 首次创建metadata
             album_info = await self.load_album_info(album_name)
-            metadata = {
+            event["header"] = {
                 "album_name": album_name,
                 "album_id": album_info["album_id"],
                 "cover_url": album_info["album_cover"],
                 "resource_type": album_info["resource_type"],
                 "download_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "total_count": album_info["total_count"],
-                "success_count": 0,
-                "resources": []
             }
+        await document.append(event)
 
-        # 检查是否已存在该track_id
-        existing_ids = {r["track_id"] for r in metadata["resources"]}
-        if track_info["track_id"] not in existing_ids:
-            metadata["resources"].append(track_info)
-            metadata["success_count"] = len(metadata["resources"])
-
-        # 保存metadata
-        async with aiofiles.open(metadata_path, mode="w", encoding="utf-8") as f:
-            await f.write(json.dumps(metadata, ensure_ascii=False, indent=2))
+    async def flush(self, album_name: str):
+        """把专辑的进度日志压缩进 JSON 快照（专辑下载结束时调用，文件内容与旧格式一致）"""
+        for document in (self._get_album_info_document(album_name),
+                         self._get_progress_document(album_name),
+                         self._get_metadata_document(album_name)):
+            await document.compact()
 
     def is_rate_limited(self, error_message: str) -> bool:
         """检测是否触发速率限制"""
@@ -494,11 +542,14 @@ class DownloadManager:
 
     def get_pending_downloads(self, progress: Dict) -> List[str]:
         """获取待下载的音频ID列表"""
-        pending = []
-        for track_id, info in progress["downloads"].items():
-            if info["status"] == "pending" or (info["status"] == "failed" and info["retry_count"] < 3):
-                pending.append(track_id)
-        return pending
+        return [track_id for track_id in progress["downloads"] if self.is_download_pending(progress, track_id)]
+
+    def is_download_pending(self, progress: Dict, track_id: str) -> bool:
+        """音频是否需要下载（未下载，或失败且重试次数未满3次）"""
+        info = progress["downloads"].get(str(track_id))
+        if not info:
+            return False
+        return info["status"] == "pending" or (info["status"] == "failed" and info["retry_count"] < 3)
 
     def is_album_complete(self, progress: Dict) -> bool:
         """检查专辑是否全部下载完成"""
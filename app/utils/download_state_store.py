@@ -0,0 +1,482 @@
+"""
+SQLite 下载状态存储 - DownloadManager 的可选后端（DOWNLOAD_STATE_BACKEND = "sqlite"）
+
+JSON 后端把全局状态放在 albums_status.json、每个专辑的进度和元数据放在 download_progress.json /
+metadata.json，查询一个专辑的下载状态要解析整个文件，多个专辑并发更新全局状态文件时还要串行。
+SQLite 后端把这些状态放在下载目录下的 download_state.db（WAL 模式，读写互不阻塞）：
+- albums：专辑状态和统计（album_id 主键，album_name / status 索引）
+- track_progress：每个音频的下载状态（(album_id, track_id) 主键，(album_id, status) / track_id 索引）
+- track_metadata：成功下载的音频信息（原 metadata.json 的 resources）
+单个音频的状态和专辑统计在同一个事务中更新；album_info.json（曲目列表）仍使用 JSON 日志。
+首次打开时自动导入已有的 JSON 状态（只执行一次）。
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.utils.blocking_executor import run_blocking
+from app.utils.download_manager import DownloadManager
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS albums (
+    album_id INTEGER PRIMARY KEY,
+    album_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_count INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    failed_count INTEGER NOT NULL DEFAULT 0,
+    album_cover TEXT,
+    resource_type TEXT,
+    cache_path TEXT,
+    download_time TEXT,
+    last_update TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_albums_name ON albums(album_name);
+CREATE INDEX IF NOT EXISTS idx_albums_status ON albums(status);
+
+CREATE TABLE IF NOT EXISTS track_progress (
+    album_id INTEGER NOT NULL,
+    track_id TEXT NOT NULL,
+    title TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    last_attempt TEXT,
+    error_message TEXT,
+    PRIMARY KEY (album_id, track_id)
+);
+CREATE INDEX IF NOT EXISTS idx_track_progress_status ON track_progress(album_id, status);
+CREATE INDEX IF NOT EXISTS idx_track_progress_track ON track_progress(track_id);
+
+CREATE TABLE IF NOT EXISTS track_metadata (
+    album_id INTEGER NOT NULL,
+    track_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (album_id, track_id)
+);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# store_meta 中记录 JSON 状态已导入的 key
+JSON_IMPORTED_KEY = "json_imported_at"
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SqliteDownloadStateStore:
+    """单个下载目录的 SQLite 状态库（同步方法，由 SqliteDownloadManager 放到线程池执行）"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        # 一个连接在多个线程间共享，语句需要串行执行
+        self._lock = threading.Lock()
+        # 导入 JSON 状态时的协程锁（首次使用时创建）；imported 为 True 后不再查库、不再加锁
+        self.import_lock: Optional[asyncio.Lock] = None
+        self.imported = False
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------
+    # 专辑
+    # ------------------------------------------------------------
+
+    def _album_row(self, album_name: str) -> Optional[sqlite3.Row]:
+        return self._conn.execute(
+            "SELECT * FROM albums WHERE album_name = ? ORDER BY last_update DESC LIMIT 1", (album_name,)
+        ).fetchone()
+
+    def get_album(self, album_id: int) -> Optional[Dict]:
+        """专辑状态记录（字段与 albums_status.json 中的条目一致）"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM albums WHERE album_id = ?", (album_id,)).fetchone()
+        return self._album_record(row) if row else None
+
+    def list_albums(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM albums ORDER BY last_update DESC").fetchall()
+        return [self._album_record(row) for row in rows]
+
+    @staticmethod
+    def _album_record(row: sqlite3.Row) -> Dict:
+        return {
+            "album_id": row["album_id"],
+            "album_name": row["album_name"],
+            "status": row["status"],
+            "total_count": row["total_count"],
+            "success_count": row["success_count"],
+            "last_update": row["last_update"],
+            "cache_path": row["cache_path"],
+        }
+
+    def upsert_album(self, album_id: int, album_name: str, status: str, total_count: int,
+                     success_count: int, cache_path: str, album_cover: Optional[str] = None,
+                     resource_type: Optional[str] = None):
+        """
+        写入专辑状态（已存在时只更新名称、状态、总数等字段；
+        成功 / 失败数由 update_track_status 在同一事务中维护，不被覆盖）
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO albums (album_id, album_name, status, total_count, success_count,
+                                    album_cover, resource_type, cache_path, last_update)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(album_id) DO UPDATE SET
+                    album_name = excluded.album_name,
+                    status = excluded.status,
+                    total_count = excluded.total_count,
+                    album_cover = COALESCE(excluded.album_cover, albums.album_cover),
+                    resource_type = COALESCE(excluded.resource_type, albums.resource_type),
+                    cache_path = excluded.cache_path,
+                    last_update = excluded.last_update
+                """,
+                (album_id, album_name, status, total_count, success_count,
+                 album_cover, resource_type, cache_path, _now())
+            )
+
+    # ------------------------------------------------------------
+    # 下载进度
+    # ------------------------------------------------------------
+
+    def add_tracks(self, album_id: int, tracks: List[Dict]):
+        """登记曲目（已有的曲目保留原状态）"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO track_progress (album_id, track_id, title) VALUES (?, ?, ?)",
+                [(album_id, track["track_id"], track["title"]) for track in tracks]
+            )
+
+    def load_progress(self, album_name: str) -> Optional[Dict]:
+        """下载进度（结构与 download_progress.json 一致）"""
+        with self._lock:
+            album = self._album_row(album_name)
+            if album is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT * FROM track_progress WHERE album_id = ? ORDER BY rowid", (album["album_id"],)
+            ).fetchall()
+        return {
+            "last_update": album["last_update"],
+            "total_count": album["total_count"],
+            "success_count": album["success_count"],
+            "failed_count": album["failed_count"],
+            "downloads": {
+                row["track_id"]: {
+                    "status": row["status"],
+                    "title": row["title"],
+                    "retry_count": row["retry_count"],
+                    "last_attempt": row["last_attempt"],
+                    "error_message": row["error_message"],
+                }
+                for row in rows
+            },
+        }
+
+    def update_track_status(self, album_name: str, track_id: str, status: str,
+                            error_message: Optional[str] = None):
+        """更新单个音频的下载状态，并在同一事务中更新专辑统计"""
+        with self._lock, self._conn:
+            album = self._album_row(album_name)
+            if album is None:
+                return
+            row = self._conn.execute(
+                "SELECT status FROM track_progress WHERE album_id = ? AND track_id = ?",
+                (album["album_id"], track_id)
+            ).fetchone()
+            if row is None:
+                return
+            old_status = row["status"]
+            now = _now()
+            self._conn.execute(
+                """
+                UPDATE track_progress
+                SET status = ?, last_attempt = ?, error_message = COALESCE(?, error_message),
+                    retry_count = retry_count + ?
+                WHERE album_id = ? AND track_id = ?
+                """,
+                (status, now, error_message or None, 1 if status == "failed" else 0,
+                 album["album_id"], track_id)
+            )
+            self._conn.execute(
+                """
+                UPDATE albums
+                SET success_count = success_count + ?, failed_count = failed_count + ?, last_update = ?
+                WHERE album_id = ?
+                """,
+                (1 if old_status != "success" and status == "success" else 0,
+                 1 if old_status != "failed" and status == "failed" else 0,
+                 now, album["album_id"])
+            )
+
+    def reset_failed(self, album_name: str, track_ids: List[str]) -> int:
+        """失败的音频重新待下载（清空重试次数），返回重置的数量"""
+        with self._lock, self._conn:
+            album = self._album_row(album_name)
+            if album is None:
+                return 0
+            cursor = self._conn.executemany(
+                """
+                UPDATE track_progress
+                SET status = 'pending', retry_count = 0, error_message = NULL
+                WHERE album_id = ? AND track_id = ? AND status = 'failed'
+                """,
+                [(album["album_id"], track_id) for track_id in track_ids]
+            )
+            reset_count = max(cursor.rowcount, 0)
+            if reset_count:
+                self._conn.execute(
+                    "UPDATE albums SET failed_count = MAX(failed_count - ?, 0), last_update = ? WHERE album_id = ?",
+                    (reset_count, _now(), album["album_id"])
+                )
+        return reset_count
+
+    # ------------------------------------------------------------
+    # 元数据
+    # ------------------------------------------------------------
+
+    def append_metadata(self, album_name: str, track_info: Dict):
+        """追加成功下载的音频信息（同一 track_id 只保留第一条）"""
+        with self._lock, self._conn:
+            album = self._album_row(album_name)
+            if album is None:
+                return
+            self._conn.execute(
+                "INSERT OR IGNORE INTO track_metadata (album_id, track_id, data) VALUES (?, ?, ?)",
+                (album["album_id"], str(track_info["track_id"]), json.dumps(track_info, ensure_ascii=False))
+            )
+            self._conn.execute(
+                "UPDATE albums SET download_time = COALESCE(download_time, ?) WHERE album_id = ?",
+                (_now(), album["album_id"])
+            )
+
+    def load_metadata(self, album_name: str) -> Optional[Dict]:
+        """元数据（结构与 metadata.json 一致）"""
+        with self._lock:
+            album = self._album_row(album_name)
+            if album is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT data FROM track_metadata WHERE album_id = ? ORDER BY rowid", (album["album_id"],)
+            ).fetchall()
+        if not rows:
+            return None
+        resources = [json.loads(row["data"]) for row in rows]
+        return {
+            "album_name": album["album_name"],
+            "album_id": album["album_id"],
+            "cover_url": album["album_cover"],
+            "resource_type": album["resource_type"],
+            "download_time": album["download_time"],
+            "total_count": album["total_count"],
+            "success_count": len(resources),
+            "resources": resources,
+        }
+
+    # ------------------------------------------------------------
+    # JSON 状态导入
+    # ------------------------------------------------------------
+
+    def is_json_imported(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_meta WHERE key = ?", (JSON_IMPORTED_KEY,)).fetchone()
+        return row is not None
+
+    def import_album(self, record: Dict, progress: Optional[Dict], metadata: Optional[Dict],
+                     album_info: Optional[Dict]):
+        """导入一个专辑的 JSON 状态（同一事务，已存在的行不覆盖）"""
+        album_id = int(record["album_id"])
+        album_info = album_info or {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR IGNORE INTO albums (album_id, album_name, status, total_count, success_count,
+                                              failed_count, album_cover, resource_type, cache_path,
+                                              download_time, last_update)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (album_id, record["album_name"], record["status"], record.get("total_count", 0),
+                 (progress or record).get("success_count", 0), (progress or {}).get("failed_count", 0),
+                 album_info.get("album_cover"), album_info.get("resource_type"), record.get("cache_path"),
+                 (metadata or {}).get("download_time"), record.get("last_update"))
+            )
+            if progress:
+                self._conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO track_progress (album_id, track_id, title, status, retry_count,
+                                                          last_attempt, error_message)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [(album_id, track_id, info.get("title"), info.get("status", "pending"),
+                      info.get("retry_count", 0), info.get("last_attempt"), info.get("error_message"))
+                     for track_id, info in progress["downloads"].items()]
+                )
+            if metadata:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO track_metadata (album_id, track_id, data) VALUES (?, ?, ?)",
+                    [(album_id, str(resource["track_id"]), json.dumps(resource, ensure_ascii=False))
+                     for resource in metadata.get("resources", [])]
+                )
+
+    def mark_json_imported(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", (JSON_IMPORTED_KEY, _now())
+            )
+
+
+_stores: Dict[str, SqliteDownloadStateStore] = {}
+
+
+def get_download_state_store(base_path: str) -> SqliteDownloadStateStore:
+    """获取（不存在则打开）下载目录对应的状态库"""
+    db_path = os.path.abspath(os.path.join(base_path, settings.DOWNLOAD_STATE_DB_NAME))
+    store = _stores.get(db_path)
+    if store is None:
+        store = SqliteDownloadStateStore(db_path)
+        _stores[db_path] = store
+        logger.info(f"🗄️ 下载状态库已打开: {db_path}")
+    return store
+
+
+def close_all_stores():
+    """关闭所有状态库连接（应用关闭时调用）"""
+    for store in list(_stores.values()):
+        try:
+            store.close()
+        except Exception as e:
+            logger.warning(f"⚠️ 关闭下载状态库失败: {store.db_path}, {e}")
+    _stores.clear()
+
+
+class SqliteDownloadManager(DownloadManager):
+    """使用 SQLite 保存专辑状态、下载进度和元数据的下载管理器"""
+
+    async def _get_store(self) -> SqliteDownloadStateStore:
+        """状态库（首次使用时导入已有的 JSON 状态）"""
+        store = get_download_state_store(self.base_path)
+        if store.imported:
+            return store
+        if store.import_lock is None:
+            store.import_lock = asyncio.Lock()
+        async with store.import_lock:
+            if not store.imported:
+                if not await run_blocking(store.is_json_imported):
+                    await self._import_json_state(store)
+                store.imported = True
+        return store
+
+    async def _import_json_state(self, store: SqliteDownloadStateStore):
+        """一次性导入 albums_status.json 以及各专辑的 download_progress.json / metadata.json"""
+        json_manager = DownloadManager(self.base_path)
+        status_data = await json_manager._load_global_status()
+        for record in status_data.values():
+            album_name = record["album_name"]
+            try:
+                progress = await json_manager.load_progress(album_name)
+                metadata = await json_manager._get_metadata_document(album_name).load()
+                album_info = await json_manager.load_album_info(album_name)
+                await run_blocking(store.import_album, record, progress, metadata, album_info)
+            except Exception as e:
+                logger.warning(f"⚠️ 导入专辑 {album_name} 的 JSON 状态失败: {e}")
+        await run_blocking(store.mark_json_imported)
+        if status_data:
+            logger.info(f"🗄️ 已从 JSON 导入 {len(status_data)} 个专辑的下载状态")
+
+    async def get_album_status(self, album_id: int) -> Optional[str]:
+        record = await self.get_album_record(album_id)
+        return record["status"] if record else None
+
+    async def get_album_record(self, album_id: int) -> Optional[Dict]:
+        """专辑状态记录（主键查询）"""
+        store = await self._get_store()
+        return await run_blocking(store.get_album, int(album_id))
+
+    async def update_album_status(self, album_id: int, album_name: str, status: str,
+                                  total_count: int = 0, success_count: int = 0):
+        store = await self._get_store()
+        await run_blocking(
+            store.upsert_album, int(album_id), album_name, status, total_count, success_count,
+            self._get_album_cache_path(album_name)
+        )
+        logger.info(f"专辑 {album_id} 状态更新为: {status}")
+
+    async def get_album_info_by_id(self, album_id: int) -> Optional[Dict]:
+        record = await self.get_album_record(album_id)
+        return await self.load_album_info(record["album_name"]) if record else None
+
+    async def list_all_albums(self) -> List[Dict]:
+        store = await self._get_store()
+        return [
+            {
+                "album_id": info["album_id"],
+                "album_name": info["album_name"],
+                "status": info["status"],
+                "progress": f"{info['success_count']}/{info['total_count']}",
+                "last_update": info["last_update"]
+            }
+            for info in await run_blocking(store.list_albums)
+        ]
+
+    async def _save_album_info(self, album_id: int, album_name: str,
+                               album_cover: str, sounds: List[Dict],
+                               resource_type: str):
+        """保存专辑解析结果：曲目列表写入 album_info.json 日志，专辑状态和曲目进度写入 SQLite"""
+        album_info = await self._append_album_info(album_id, album_name, album_cover, sounds, resource_type)
+        store = await self._get_store()
+        await run_blocking(
+            store.upsert_album, int(album_id), album_name, "processing", album_info["total_count"], 0,
+            self._get_album_cache_path(album_name), album_cover, resource_type
+        )
+        await run_blocking(
+            store.add_tracks, int(album_id),
+            [{"track_id": str(sound.get("trackId")), "title": sound.get("title", "")} for sound in sounds]
+        )
+
+    async def load_progress(self, album_name: str) -> Optional[Dict]:
+        store = await self._get_store()
+        return await run_blocking(store.load_progress, album_name)
+
+    async def _update_download_status(self, album_name: str, track_id: str,
+                                      status: str, error_message: Optional[str] = None,
+                                      album_id: Optional[int] = None):
+        # 专辑统计与音频状态在同一事务中更新，不需要再单独更新全局状态
+        store = await self._get_store()
+        await run_blocking(store.update_track_status, album_name, str(track_id), status, error_message)
+
+    async def _reset_failed(self, album_name: str, track_ids: List[str]) -> int:
+        store = await self._get_store()
+        return await run_blocking(store.reset_failed, album_name, track_ids)
+
+    async def _append_to_metadata(self, album_name: str, track_info: Dict):
+        store = await self._get_store()
+        await run_blocking(store.append_metadata, album_name, track_info)
+
+    async def load_metadata(self, album_name: str) -> Optional[Dict]:
+        store = await self._get_store()
+        return await run_blocking(store.load_metadata, album_name)
+
+    async def flush(self, album_name: str):
+        # 状态已实时提交到 SQLite，只需压缩专辑信息日志
+        await self._get_album_info_document(album_name).compact()
@@ -0,0 +1,128 @@
+"""
+HTTP 客户端连接池管理器 - 应用生命周期内复用 httpx.AsyncClient
+
+每个目标主机对应一个长生命周期的 AsyncClient，复用 TCP/TLS 连接（keep-alive），
+避免每次请求都重新握手。客户端在 app/main.py 的 lifespan 中统一创建和关闭。
+"""
+import asyncio
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Dict, Optional
+
+import httpx
+from loguru import logger
+
+from app.core.config import settings
+
+
+# 微信公众平台主机
+WX_MP_HOST = "mp.weixin.qq.com"
+
+
+def _is_http2_available() -> bool:
+    """检查 HTTP/2 依赖（h2）是否已安装"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpClientManager:
+    """按主机管理共享 httpx.AsyncClient 的单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._clients = {}
+            cls._instance._lock = asyncio.Lock()
+            cls._instance._started = False
+        return cls._instance
+
+    def _build_client(self, host: str) -> httpx.AsyncClient:
+        """创建一个带连接池限制和超时配置的 AsyncClient"""
+        http2 = settings.HTTP_HTTP2_ENABLED
+        if http2 and not _is_http2_available():
+            # NOTE: h2 是可选依赖，缺失时降级为 HTTP/1.1，不影响功能
+            logger.warning("⚠️ 未安装 h2，HTTP/2 已禁用，降级为 HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(
+            settings.HTTP_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        )
+        # NOTE: 共享客户端会被不同账号的请求复用，必须禁止客户端级别的 cookie 持久化，
+        # 否则 A 账号响应中的 Set-Cookie 会被自动带到 B 账号的请求里。
+        # cookies 一律通过每次请求的 cookies 参数传入，响应 cookies 仍可通过 response.cookies 读取。
+        no_persist_jar = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+        logger.info(f"🔌 创建 HTTP 客户端: host={host}, http2={http2}, max_connections={limits.max_connections}")
+        return httpx.AsyncClient(
+            verify=False,
+            http2=http2,
+            limits=limits,
+            timeout=timeout,
+            cookies=httpx.Cookies(no_persist_jar),
+        )
+
+    async def startup(self, hosts: Optional[list] = None):
+        """
+        应用启动时预创建客户端
+
+        Args:
+            hosts: 需要预创建客户端的主机列表，默认只创建微信公众平台
+        """
+        for host in hosts or [WX_MP_HOST]:
+            await self.get_client(host)
+        self._started = True
+        logger.info(f"✅ HTTP 客户端连接池已启动: {list(self._clients.keys())}")
+
+    async def get_client(self, host: str = WX_MP_HOST) -> httpx.AsyncClient:
+        """
+        获取指定主机的共享客户端（不存在或已关闭时自动创建）
+
+        Args:
+            host: 目标主机名
+
+        Returns:
+            httpx.AsyncClient: 共享客户端，调用方不要关闭
+        """
+        client = self._clients.get(host)
+        if client is not None and not client.is_closed:
+            return client
+
+        async with self._lock:
+            client = self._clients.get(host)
+            if client is None or client.is_closed:
+                client = self._build_client(host)
+                self._clients[host] = client
+            return client
+
+    async def shutdown(self):
+        """应用关闭时关闭所有客户端，释放连接"""
+        async with self._lock:
+            clients: Dict[str, httpx.AsyncClient] = self._clients
+            self._clients = {}
+        for host, client in clients.items():
+            try:
+                await client.aclose()
+                logger.info(f"🔌 HTTP 客户端已关闭: {host}")
+            except Exception as e:
+                logger.warning(f"⚠️ 关闭 HTTP 客户端失败 {host}: {e}")
+        self._started = False
+
+
+# 全局单例
+http_client_manager = HttpClientManager()
+
+
+async def get_wx_client() -> httpx.AsyncClient:
+    """获取微信公众平台（mp.weixin.qq.com）的共享客户端"""
+    return await http_client_manager.get_client(WX_MP_HOST)
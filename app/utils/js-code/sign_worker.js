@@ -0,0 +1,34 @@
+/**
+ * 常驻 xm-sign 签名 worker
+ *
+ * 由 app/utils/sign_generator.py 中的 XimalayaSignWorkerPool 启动，JIMI.JS 只加载一次，
+ * 之后按行读取 stdin 的 JSON 请求，每个请求向 stdout 输出一行 JSON 响应：
+ *   请求: {"id": 1}
+ *   响应: {"id": 1, "sign": "..."} 或 {"id": 1, "error": "..."}
+ * 启动完成后先输出 {"ready": true}。stdin 关闭时退出。
+ */
+const readline = require('readline');
+
+// stdout 只用于协议输出，JIMI.JS 内部的 console.log 转到 stderr
+const writeLine = (data) => process.stdout.write(JSON.stringify(data) + '\n');
+console.log = (...args) => console.error(...args);
+
+const { get_data } = require('./JIMI.JS');
+
+const rl = readline.createInterface({ input: process.stdin });
+
+rl.on('line', (line) => {
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (error) {
+        return;
+    }
+    get_data()
+        .then((result) => writeLine({ id: request.id, sign: JSON.parse(result).sign }))
+        .catch((error) => writeLine({ id: request.id, error: String((error && error.message) || error) }));
+});
+
+rl.on('close', () => process.exit(0));
+
+writeLine({ ready: true });
@@ -0,0 +1,236 @@
+"""
+阿里云 OSS 上传器 - 复用客户端 + 后台队列 + 重试 + 分片上传 + MD5 去重
+
+- 整个应用只创建一个 oss.Client（凭证和配置只加载一次）
+- 上传任务进入后台队列，由 OSS_UPLOAD_CONCURRENCY 个 worker 并发执行，接口立即返回任务 ID
+- 上传失败按指数退避重试 OSS_UPLOAD_MAX_RETRIES 次
+- 文件超过 OSS_MULTIPART_THRESHOLD 时使用分片上传
+- 上传前比较本地 MD5 与远端 ETag（分片上传的 ETag 不是 MD5，额外比较对象元数据中的 md5），一致则跳过
+
+worker 在 app/main.py 的 lifespan 中启动和停止。
+"""
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
+
+import alibabacloud_oss_v2 as oss
+from loguru import logger
+
+from app.core.config import settings
+
+
+# 上传任务状态
+class OssUploadStatus:
+    PENDING = "pending"
+    UPLOADING = "uploading"
+    SUCCESS = "success"
+    SKIPPED = "skipped"  # 远端已存在相同内容
+    FAILED = "failed"
+
+
+def _file_md5(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """分块计算文件 MD5（十六进制小写）"""
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+class OssUploader:
+    """OSS 上传器单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._client = None
+            cls._instance._queue = None
+            cls._instance._workers = []
+            cls._instance._executor = None
+            cls._instance._jobs = OrderedDict()
+        return cls._instance
+
+    # ------------------------------------------------------------
+    # 同步上传（在线程中执行）
+    # ------------------------------------------------------------
+
+    def _get_client(self) -> oss.Client:
+        """获取共享 OSS 客户端（首次调用时创建）"""
+        if self._client is None:
+            credentials_provider = oss.credentials.StaticCredentialsProvider(
+                access_key_id=settings.ACCESS_KEY_ID,
+                access_key_secret=settings.ACCESS_KEY_SECRET
+            )
+            cfg = oss.config.load_default()
+            cfg.credentials_provider = credentials_provider
+            cfg.region = settings.REGION
+            cfg.endpoint = settings.ENDPOINT
+            self._client = oss.Client(cfg)
+        return self._client
+
+    @staticmethod
+    def build_key(local_file_path: str) -> str:
+        """默认对象名（与原 upload_to_aliyun 一致）"""
+        return f"wx_public/{os.path.basename(local_file_path)}"
+
+    @staticmethod
+    def build_url(key: str) -> str:
+        return f'https://{settings.BUCKET_NAME}.{settings.ENDPOINT}/{key}'
+
+    def _remote_matches(self, key: str, local_md5: str) -> bool:
+        """远端对象是否已是相同内容（对象不存在或查询失败都视为不一致）"""
+        try:
+            result = self._get_client().head_object(oss.HeadObjectRequest(bucket=settings.BUCKET_NAME, key=key))
+        except Exception:
+            return False
+        etag = (result.etag or "").strip('"').lower()
+        remote_md5 = ((result.metadata or {}).get("md5") or "").lower()
+        return local_md5 in (etag, remote_md5)
+
+    def upload_file_sync(self, local_file_path: str, key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        同步上传单个文件（阻塞，应在线程中调用）
+
+        Returns:
+            {"status": success/skipped, "oss_file_path": ..., "md5": ...}
+        """
+        key = key or self.build_key(local_file_path)
+        local_md5 = _file_md5(local_file_path)
+        oss_file_path = self.build_url(key)
+        if self._remote_matches(key, local_md5):
+            logger.info(f"☁️ OSS 已存在相同内容，跳过上传: {key}")
+            return {"status": OssUploadStatus.SKIPPED, "oss_file_path": oss_file_path, "md5": local_md5}
+
+        request = oss.PutObjectRequest(bucket=settings.BUCKET_NAME, key=key, metadata={"md5": local_md5})
+        client = self._get_client()
+        if os.path.getsize(local_file_path) >= settings.OSS_MULTIPART_THRESHOLD:
+            uploader = client.uploader(part_size=settings.OSS_MULTIPART_PART_SIZE,
+                                       parallel_num=settings.OSS_MULTIPART_PARALLEL)
+            result = uploader.upload_file(request, local_file_path)
+        else:
+            result = client.put_object_from_file(request, local_file_path)
+        if result.status_code != 200:
+            raise RuntimeError(f"OSS 上传失败，状态码: {result.status_code}, request id: {result.request_id}")
+        logger.info(f"☁️ OSS 上传成功: {key}, etag: {result.etag}")
+        return {"status": OssUploadStatus.SUCCESS, "oss_file_path": oss_file_path, "md5": local_md5}
+
+    # ------------------------------------------------------------
+    # 后台队列
+    # ------------------------------------------------------------
+
+    async def start(self):
+        """启动上传 worker"""
+        if self._workers:
+            return
+        concurrency = settings.OSS_UPLOAD_CONCURRENCY
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="oss-upload")
+        self._workers = [asyncio.create_task(self._worker(index)) for index in range(concurrency)]
+        logger.info(f"☁️ OSS 上传队列已启动: workers={concurrency}")
+
+    async def stop(self):
+        """停止上传 worker（队列中未开始的任务会标记为失败）"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job in self._jobs.values():
+            if job["status"] in (OssUploadStatus.PENDING, OssUploadStatus.UPLOADING):
+                self._update_job(job, status=OssUploadStatus.FAILED, error="应用关闭，上传任务已中止")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        logger.info("☁️ OSS 上传队列已停止")
+
+    def submit(self, local_file_path: str, key: Optional[str] = None) -> str:
+        """
+        提交上传任务，立即返回任务 ID
+
+        Args:
+            local_file_path: 本地文件路径
+            key: OSS 对象名，默认 wx_public/<文件名>
+
+        Returns:
+            str: 任务 ID
+        """
+        if self._queue is None:
+            raise RuntimeError("OSS 上传队列未启动")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        job = {
+            "job_id": job_id,
+            "local_file_path": local_file_path,
+            "key": key or self.build_key(local_file_path),
+            "status": OssUploadStatus.PENDING,
+            "attempts": 0,
+            "oss_file_path": "",
+            "error": "",
+            "created_at": now,
+            "updated_at": now,
+        }
+        self._jobs[job_id] = job
+        # 只保留最近的任务记录
+        while len(self._jobs) > settings.OSS_UPLOAD_JOB_HISTORY:
+            self._jobs.popitem(last=False)
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """查询上传任务状态"""
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """最近的上传任务（按提交时间倒序）"""
+        return [dict(job) for job in list(self._jobs.values())[::-1][:limit]]
+
+    @staticmethod
+    def _update_job(job: Dict[str, Any], **fields):
+        job.update(fields)
+        job["updated_at"] = time.time()
+
+    async def _worker(self, index: int):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                await self._run_job(loop, job)
+            except Exception as e:
+                logger.error(f"❌ OSS 上传 worker-{index} 异常: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, loop: asyncio.AbstractEventLoop, job: Dict[str, Any]):
+        """执行单个任务，失败按指数退避重试"""
+        max_attempts = settings.OSS_UPLOAD_MAX_RETRIES + 1
+        while True:
+            self._update_job(job, status=OssUploadStatus.UPLOADING, attempts=job["attempts"] + 1)
+            try:
+                result = await loop.run_in_executor(
+                    self._executor, self.upload_file_sync, job["local_file_path"], job["key"]
+                )
+                self._update_job(job, status=result["status"], oss_file_path=result["oss_file_path"], error="")
+                return
+            except Exception as e:
+                if job["attempts"] >= max_attempts:
+                    self._update_job(job, status=OssUploadStatus.FAILED, error=str(e))
+                    logger.error(f"❌ OSS 上传失败（已重试{job['attempts'] - 1}次）: {job['key']}, {e}")
+                    return
+                delay = settings.OSS_UPLOAD_RETRY_BACKOFF * (2 ** (job["attempts"] - 1))
+                self._update_job(job, error=str(e))
+                logger.warning(f"⚠️ OSS 上传失败，{delay}s 后重试: {job['key']}, {e}")
+                await asyncio.sleep(delay)
+
+
+# 全局单例
+oss_uploader = OssUploader()
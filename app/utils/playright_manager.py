@@ -3,10 +3,14 @@ Playwright 浏览器管理基类
 提供通用的 Playwright 浏览器操作功能
 """
 
+import asyncio
 import os
 import sys
+from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 from loguru import logger
 
 
@@ -26,6 +30,19 @@ class PlaywrightManager:
     DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36'
     DEFAULT_BROWSER_ARGS = ['--disable-blink-features=AutomationControlled']
     
+    # 快速模式下拦截的资源类型（滑块验证 / Cookie 刷新只需要验证 iframe 和 cookies）
+    BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+    # 快速模式下拦截的第三方统计 / 埋点主机（按后缀匹配）
+    BLOCKED_TRACKER_HOSTS = (
+        'hm.baidu.com', 'cnzz.com', 'umeng.com', 'growingio.com', 'sensorsdata.cn',
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+        'xdcs-collector.ximalaya.com',
+    )
+    # 验证码 iframe 内的资源不拦截（滑块图片等）
+    VERIFY_FRAME_KEYWORD = 'verify'
+    # 等待网络空闲的默认超时（毫秒）
+    NETWORK_IDLE_TIMEOUT = 5000
+    
     # 反爬虫检测绕过脚本
     ANTI_DETECTION_SCRIPT = """
         Object.defineProperty(navigator, 'webdriver', {
@@ -157,6 +174,112 @@ class PlaywrightManager:
         logger.info("✅ 浏览器上下文已创建")
         return self._context
     
+    @asynccontextmanager
+    async def browser_session(
+        self,
+        extra_options: Optional[Dict[str, Any]] = None,
+        block_resources: bool = False
+    ):
+        """
+        获取一个浏览器上下文，退出时释放
+
+        浏览器池（app.utils.browser_pool）已在 lifespan 中启动时，从池中租用隔离的上下文（不冷启动 Chromium）；
+        否则（如单独运行脚本）按原方式启动浏览器，退出时关闭。
+
+        参数:
+            extra_options: 额外的上下文选项
+            block_resources: 是否开启快速模式（拦截图片、媒体、字体和第三方统计脚本）
+
+        用法:
+            async with self.browser_session() as context:
+                page = await context.new_page()
+        """
+        # 延迟导入以避免循环依赖
+        from app.utils.browser_pool import browser_pool
+
+        if browser_pool.is_running:
+            async with browser_pool.new_context(extra_options) as context:
+                if block_resources:
+                    await self.enable_resource_blocking(context)
+                yield context
+            return
+        await self.launch_browser()
+        try:
+            context = await self.create_context(extra_options=extra_options)
+            if block_resources:
+                await self.enable_resource_blocking(context)
+            yield context
+        finally:
+            await self.close()
+
+    @classmethod
+    async def enable_resource_blocking(cls, context: BrowserContext):
+        """
+        为上下文安装路由拦截：中止图片、媒体、字体和第三方统计请求
+
+        验证码 iframe 内发起的请求不拦截，避免影响滑块加载。
+        """
+        async def _route(route: Route):
+            request = route.request
+            try:
+                in_verify_frame = cls.VERIFY_FRAME_KEYWORD in request.frame.url
+            except Exception:
+                # Service Worker 等请求没有所属 frame
+                in_verify_frame = False
+            host = urlparse(request.url).hostname or ''
+            is_tracker = any(host == blocked or host.endswith('.' + blocked) for blocked in cls.BLOCKED_TRACKER_HOSTS)
+            if is_tracker or (request.resource_type in cls.BLOCKED_RESOURCE_TYPES and not in_verify_frame):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route('**/*', _route)
+        logger.info("⚡ 已开启资源拦截（图片/媒体/字体/统计脚本）")
+
+    @classmethod
+    async def wait_for_network_idle(cls, page: Page, timeout: Optional[int] = None) -> bool:
+        """
+        等待页面网络空闲（替代固定 sleep），超时不抛异常
+
+        返回:
+            bool: 是否在超时前进入网络空闲
+        """
+        try:
+            await page.wait_for_load_state('networkidle', timeout=timeout or cls.NETWORK_IDLE_TIMEOUT)
+            return True
+        except PlaywrightTimeout:
+            logger.debug("等待网络空闲超时，继续执行")
+            return False
+
+    @staticmethod
+    async def wait_for_cookies(
+        context: BrowserContext,
+        baseline: Optional[Dict[str, str]] = None,
+        timeout: float = 5.0,
+        interval: float = 0.2
+    ) -> list:
+        """
+        等待上下文中出现新的 cookie（或已有 cookie 的值发生变化），超时返回当前 cookies
+
+        参数:
+            context: 浏览器上下文
+            baseline: 对比用的 cookies 字典（None 表示等待任意 cookie 出现）
+            timeout: 最长等待秒数
+            interval: 轮询间隔秒数
+
+        返回:
+            list: Playwright cookies 列表
+        """
+        baseline = baseline or {}
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            cookies = await context.cookies()
+            current = {cookie['name']: cookie['value'] for cookie in cookies}
+            changed = any(baseline.get(name) != value for name, value in current.items())
+            if changed or asyncio.get_running_loop().time() >= deadline:
+                return cookies
+            await asyncio.sleep(interval)
+
     async def new_page(self) -> Page:
         """
         创建新页面
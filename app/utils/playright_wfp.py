@@ -7,6 +7,7 @@ import asyncio
 from typing import Dict
 from loguru import logger
 
+from app.core.config import settings
 from app.utils.playright_manager import PlaywrightManager
 
 
@@ -38,51 +39,43 @@ class CookieBrowserManager(PlaywrightManager):
             logger.info(f"正在打开浏览器访问: {url}")
             logger.info(f"Cookies 数量: {len(cookies)}")
             
-            # 启动浏览器和创建上下文
-            await self.launch_browser()
-            await self.create_context()
+            # 从浏览器池租用隔离的上下文（池未启动时冷启动浏览器），退出时自动释放
+            # 快速模式：拦截图片、媒体、字体和统计脚本
+            async with self.browser_session(block_resources=settings.PLAYWRIGHT_BLOCK_RESOURCES) as context:
+                # 创建新页面
+                page = await context.new_page()
+                
+                # 先访问域名以设置 cookies
+                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                
+                # 将 cookies 字典转换为 Playwright 格式并添加到上下文
+                playwright_cookies = self.dict_to_playwright_cookies(
+                    cookies,
+                    domain='.ximalaya.com'
+                )
+                
+                # 添加 cookies 到浏览器上下文
+                await context.add_cookies(playwright_cookies)
+                logger.info("✓ Cookies 已添加到浏览器")
+                
+                # 重新加载页面以应用 cookies
+                await page.reload(wait_until='domcontentloaded')
+                await self.wait_for_network_idle(page)  # 等待网络空闲（替代固定等待）
+                
+                logger.info(f"✓ 页面加载完成")
+                
+                # 获取所有 cookies（更新后的）
+                all_cookies = await context.cookies()
+                new_cookies = self.cookies_to_dict(all_cookies)
+                
+                logger.info(f"✓ 获取到 {len(new_cookies)} 个 Cookie")
             
-            # 创建新页面
-            page = await self.new_page()
-            
-            # 先访问域名以设置 cookies
-            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            
-            # 将 cookies 字典转换为 Playwright 格式并添加到上下文
-            playwright_cookies = self.dict_to_playwright_cookies(
-                cookies,
-                domain='.ximalaya.com'
-            )
-            
-            # 添加 cookies 到浏览器上下文
-            await self._context.add_cookies(playwright_cookies)
-            logger.info("✓ Cookies 已添加到浏览器")
-            
-            # 重新加载页面以应用 cookies
-            await page.reload(wait_until='domcontentloaded')
-            await asyncio.sleep(2)  # 等待页面加载
-            
-            logger.info(f"✓ 页面加载完成")
-            
-            # 获取所有 cookies（更新后的）
-            all_cookies = await self.get_cookies()
-            new_cookies = self.cookies_to_dict(all_cookies)
-            
-            logger.info(f"✓ 获取到 {len(new_cookies)} 个 Cookie")
-            
-            # 关闭浏览器
-            await self.close()
-            logger.info("✓ 浏览器已关闭")
+            logger.info("✓ 浏览器上下文已释放")
             
             return new_cookies
             
         except Exception as e:
             logger.error(f"✗ 打开浏览器失败: {e}")
-            # 确保浏览器被关闭
-            try:
-                await self.close()
-            except:
-                pass
             raise
 
 
@@ -0,0 +1,160 @@
+"""
+追加日志（JSONL）+ 定期压缩快照的 JSON 文档
+
+下载进度、metadata 等文件原来每次更新都整体读取并重写（indent=2），一个 N 曲目的专辑
+要产生 O(N²) 字节的 I/O，并发写入还会互相覆盖。这里改为：
+- 每次更新只向 <文件名>.journal.jsonl 追加一行事件
+- 内存中保留物化视图（快照 + 回放日志），读取时不再解析文件
+- 日志累计 DOWNLOAD_JOURNAL_COMPACT_EVERY 条后压缩：视图原子写入快照文件（保持原来的 JSON 格式）并清空日志
+- 快照中记录已合并的事件序号（_journal_seq），压缩中途崩溃时回放会跳过已合并的事件
+"""
+import asyncio
+import json
+import os
+from typing import Callable, Dict, Optional
+
+import aiofiles
+from loguru import logger
+
+from app.core.config import settings
+
+
+# 日志文件后缀：download_progress.json -> download_progress.journal.jsonl
+JOURNAL_SUFFIX = ".journal.jsonl"
+# 快照中记录已合并事件序号的字段
+SEQ_KEY = "_journal_seq"
+
+# 事件应用函数：(当前视图或 None, 事件) -> 新视图
+ApplyEvent = Callable[[Optional[Dict], Dict], Dict]
+
+
+class JournaledDocument:
+    """快照 + 追加日志的 JSON 文档"""
+
+    def __init__(self, snapshot_path: str, apply_event: ApplyEvent):
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + JOURNAL_SUFFIX
+        self._apply_event = apply_event
+        self._data: Optional[Dict] = None
+        self._loaded = False
+        self._seq = 0
+        self._journal_events = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def journal_events(self) -> int:
+        """日志中尚未压缩的事件数"""
+        return self._journal_events
+
+    async def load(self) -> Optional[Dict]:
+        """物化视图（首次调用时读取快照并回放日志），文档不存在时返回 None"""
+        async with self._lock:
+            await self._ensure_loaded()
+            return self._data
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        data = None
+        if os.path.exists(self.snapshot_path):
+            async with aiofiles.open(self.snapshot_path, mode="r", encoding="utf-8") as f:
+                data = json.loads(await f.read())
+        seq = data.pop(SEQ_KEY, 0) if data else 0
+
+        replayed = 0
+        corrupted = False
+        if os.path.exists(self.journal_path):
+            async with aiofiles.open(self.journal_path, mode="r", encoding="utf-8") as f:
+                lines = (await f.read()).splitlines()
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # 崩溃时最后一行可能只写了一半
+                    logger.warning(f"⚠️ 跳过损坏的日志行: {self.journal_path}")
+                    corrupted = True
+                    continue
+                if event.get("seq", 0) <= seq:
+                    continue
+                data = self._apply_event(data, event)
+                seq = event["seq"]
+                replayed += 1
+            if replayed:
+                logger.info(f"📒 已回放 {replayed} 条日志: {self.journal_path}")
+
+        self._data = data
+        self._seq = seq
+        self._journal_events = replayed
+        self._loaded = True
+        if corrupted:
+            # 立即压缩，避免之后追加的事件接在半行后面
+            await self._compact(force=True)
+
+    async def append(self, event: Dict) -> Dict:
+        """
+        追加一条事件并更新视图，日志达到阈值时自动压缩
+
+        Returns:
+            更新后的视图
+        """
+        async with self._lock:
+            await self._ensure_loaded()
+            self._seq += 1
+            line = json.dumps({**event, "seq": self._seq}, ensure_ascii=False)
+            os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+            async with aiofiles.open(self.journal_path, mode="a", encoding="utf-8") as f:
+                await f.write(line + "\n")
+            # 用序列化后的事件更新视图，保证与重启回放的结果一致（如字典的整数 key 会变成字符串）
+            self._data = self._apply_event(self._data, json.loads(line))
+            self._journal_events += 1
+            if self._journal_events >= settings.DOWNLOAD_JOURNAL_COMPACT_EVERY:
+                await self._compact()
+            return self._data
+
+    async def compact(self):
+        """把视图写入快照（原子替换）并清空日志"""
+        async with self._lock:
+            await self._ensure_loaded()
+            await self._compact()
+
+    async def _compact(self, force: bool = False):
+        if self._journal_events == 0 and not force:
+            return
+        if self._data is None:
+            os.remove(self.journal_path)
+            self._journal_events = 0
+            return
+        snapshot = {**self._data, SEQ_KEY: self._seq}
+        temp_path = f"{self.snapshot_path}.tmp"
+        async with aiofiles.open(temp_path, mode="w", encoding="utf-8") as f:
+            await f.write(json.dumps(snapshot, ensure_ascii=False, indent=2))
+        os.replace(temp_path, self.snapshot_path)
+        # 快照已包含全部事件，此后崩溃也不会重复应用（回放按序号跳过）
+        async with aiofiles.open(self.journal_path, mode="w", encoding="utf-8") as f:
+            await f.write("")
+        self._journal_events = 0
+
+
+_documents: Dict[str, JournaledDocument] = {}
+
+
+def get_journaled_document(snapshot_path: str, apply_event: ApplyEvent) -> JournaledDocument:
+    """获取（不存在则创建）快照文件对应的文档，同一文件在进程内共享一个物化视图"""
+    snapshot_path = os.path.abspath(snapshot_path)
+    document = _documents.get(snapshot_path)
+    if document is None:
+        document = JournaledDocument(snapshot_path, apply_event)
+        _documents[snapshot_path] = document
+    return document
+
+
+async def compact_all():
+    """压缩所有有未合并日志的文档（应用关闭时调用）"""
+    for document in list(_documents.values()):
+        if document.journal_events:
+            try:
+                await document.compact()
+            except Exception as e:
+                logger.warning(f"⚠️ 压缩日志失败: {document.journal_path}, {e}")
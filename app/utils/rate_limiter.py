@@ -0,0 +1,176 @@
+"""
+自适应限流器 - 令牌桶 + AIMD（加性增、乘性减）
+
+按凭证（如微信公众号的 slave_user / token、喜马拉雅登录 cookie）分别维护一个令牌桶：
+- 每次请求前 acquire() 获取令牌，没有令牌时异步等待
+- 请求成功时 on_success()，速率按固定步长缓慢增加（加性增）
+- 命中平台频控时 on_throttle()，速率按比例快速下降（乘性减），并暂停一段冷却时间
+
+这样每个账号都能跑在接近平台允许的最大安全吞吐量上，而不需要手动猜 sleep 间隔。
+"""
+import asyncio
+import time
+from typing import Dict, Any, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+# 微信公众平台频控返回码（base_resp.ret）
+WX_FREQ_CONTROL_RETS = {200013}
+
+
+class AdaptiveRateLimiter:
+    """单个凭证的自适应令牌桶限流器"""
+
+    def __init__(self, key: str, rate: float, burst: int, min_rate: float, max_rate: float,
+                 increase_step: float, decrease_factor: float, penalty_seconds: float):
+        self.key = key
+        self.rate = rate  # 当前速率（令牌/秒）
+        self.burst = burst  # 桶容量（允许的突发请求数）
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.penalty_seconds = penalty_seconds
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self.success_count = 0
+        self.throttle_count = 0
+        self.last_throttle_at: Optional[float] = None
+
+    def _refill(self, now: float):
+        """按当前速率补充令牌"""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """获取令牌，令牌不足或处于频控冷却期时异步等待"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return
+                    wait = (tokens - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """请求成功：加性增加速率"""
+        self.success_count += 1
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self, coalesce: bool = False):
+        """
+        命中频控：乘性降低速率，清空令牌并进入冷却期
+
+        coalesce=True 时冷却期内的频控不再重复降速（并发请求在冷却开始前已发出，会一起返回频控）
+        """
+        now = time.monotonic()
+        if coalesce and now < self._blocked_until:
+            return
+        self.throttle_count += 1
+        self.last_throttle_at = time.time()
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + self.penalty_seconds)
+        # 冷却期内不积累令牌，冷却结束后从空桶开始按新速率补充
+        self._last_refill = self._blocked_until
+        logger.warning(f"⚠️ 触发频控，限流降速: key={self.key}, rate={self.rate:.3f}/s, 冷却{self.penalty_seconds}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前预算快照（供接口查询）"""
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "key": self.key,
+            "rate": round(self.rate, 4),
+            "burst": self.burst,
+            "available_tokens": round(self._tokens, 3),
+            "blocked_seconds": round(max(0.0, self._blocked_until - now), 3),
+            "min_rate": self.min_rate,
+            "max_rate": self.max_rate,
+            "success_count": self.success_count,
+            "throttle_count": self.throttle_count,
+            "last_throttle_at": self.last_throttle_at,
+        }
+
+
+class RateLimiterRegistry:
+    """按凭证 key 管理限流器，首次使用时按统一参数创建"""
+
+    def __init__(self, name: str, rate: float, burst: int, min_rate: float, max_rate: float,
+                 increase_step: float, decrease_factor: float, penalty_seconds: float):
+        self.name = name
+        self._limiter_kwargs = {
+            "rate": rate,
+            "burst": burst,
+            "min_rate": min_rate,
+            "max_rate": max_rate,
+            "increase_step": increase_step,
+            "decrease_factor": decrease_factor,
+            "penalty_seconds": penalty_seconds,
+        }
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+    def get(self, key: str) -> AdaptiveRateLimiter:
+        """获取（不存在则创建）指定凭证的限流器"""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(key, **self._limiter_kwargs)
+            self._limiters[key] = limiter
+        return limiter
+
+    def snapshot(self, key: Optional[str] = None) -> Dict[str, Any]:
+        """查询单个凭证或全部凭证的预算"""
+        if key is not None:
+            return self.get(key).snapshot()
+        return {
+            "name": self.name,
+            "limiters": [limiter.snapshot() for limiter in self._limiters.values()],
+        }
+
+
+def get_wx_credential_key(cookies: Dict[str, str], token: str) -> str:
+    """微信凭证的限流 key：优先使用 slave_user（账号维度），否则使用 token"""
+    return (cookies or {}).get('slave_user') or token or "anonymous"
+
+
+def get_xmly_credential_key(cookies: Dict[str, str]) -> str:
+    """喜马拉雅凭证的限流 key：使用登录态 cookie（1&_token），未登录时共用 anonymous"""
+    return (cookies or {}).get('1&_token') or "anonymous"
+
+
+# 微信公众平台全局限流器（按账号）
+wx_rate_limiters = RateLimiterRegistry(
+    name="wx_public",
+    rate=settings.WX_RATE_LIMIT_RATE,
+    burst=settings.WX_RATE_LIMIT_BURST,
+    min_rate=settings.WX_RATE_LIMIT_MIN_RATE,
+    max_rate=settings.WX_RATE_LIMIT_MAX_RATE,
+    increase_step=settings.WX_RATE_LIMIT_INCREASE_STEP,
+    decrease_factor=settings.WX_RATE_LIMIT_DECREASE_FACTOR,
+    penalty_seconds=settings.WX_RATE_LIMIT_PENALTY_SECONDS,
+)
+
+# 喜马拉雅曲目解析限流器（按账号）
+xmly_rate_limiters = RateLimiterRegistry(
+    name="xmly",
+    rate=settings.XMLY_RATE_LIMIT_RATE,
+    burst=settings.XMLY_RATE_LIMIT_BURST,
+    min_rate=settings.XMLY_RATE_LIMIT_MIN_RATE,
+    max_rate=settings.XMLY_RATE_LIMIT_MAX_RATE,
+    increase_step=settings.XMLY_RATE_LIMIT_INCREASE_STEP,
+    decrease_factor=settings.XMLY_RATE_LIMIT_DECREASE_FACTOR,
+    penalty_seconds=settings.XMLY_RATE_LIMIT_PENALTY_SECONDS,
+)
@@ -3,17 +3,26 @@
 这是最简单、最可靠的方式
 """
 
+import asyncio
+import functools
 import subprocess
 import platform
 import json
 import os
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 
+from app.core.config import settings
 
+
+@functools.lru_cache(maxsize=None)
 def get_node_executable():
     """
-    获取 Node.js 可执行文件路径
+    获取 Node.js 可执行文件路径（结果缓存，目录检查和日志只在首次调用时执行）
     
     在打包环境中，使用内置的 Node.js
     在开发环境中，使用系统的 node 命令
@@ -90,6 +99,50 @@ def parse_node_version(version_string: str) -> tuple[int, int, int]:
         return (0, 0, 0)
 
 
+def get_jimi_js_path() -> str:
+    """
+    获取 JIMI.JS 的路径
+
+    在打包环境中，JS 文件会被打包到 _MEIPASS 目录
+    """
+    if getattr(sys, 'frozen', False):
+        base_dir = sys._MEIPASS
+        jimi_js_path = os.path.join(base_dir, 'app', 'utils', 'js-code', 'JIMI.JS')
+        logger.info(f"🔧 打包环境 - JIMI.JS 路径: {jimi_js_path}")
+    else:
+        jimi_js_path = os.path.join(os.path.dirname(__file__), 'js-code', 'JIMI.JS')
+        logger.info(f"🔧 开发环境 - JIMI.JS 路径: {jimi_js_path}")
+    return jimi_js_path
+
+
+def check_xm_sign_format(xm_sign) -> bool:
+    """
+    验证xm-sign格式是否正确
+
+    参数:
+        xm_sign: 待验证的签名
+    返回: True/False
+    """
+    if not xm_sign or "&&" not in xm_sign:
+        return False
+
+    parts = xm_sign.split("&&")
+    if len(parts) != 2:
+        return False
+
+    browser_id, session_id = parts
+
+    # 验证browser_id长度
+    if len(browser_id) < 10:
+        return False
+
+    # 验证session_id长度
+    if len(session_id) < 10:
+        return False
+
+    return True
+
+
 class XimalayaSignNode:
     """通过Node.js调用JIMI.JS生成xm-sign"""
 
@@ -99,14 +152,7 @@ class XimalayaSignNode:
         logger.info(f"Node.js 可执行文件: {self.node_executable}")
         
         # 获取JIMI.JS的路径
-        # 在打包环境中，JS 文件会被打包到 _MEIPASS 目录
-        if getattr(sys, 'frozen', False):
-            base_dir = sys._MEIPASS
-            self.jimi_js_path = os.path.join(base_dir, 'app', 'utils', 'js-code', 'JIMI.JS')
-            logger.info(f"🔧 打包环境 - JIMI.JS 路径: {self.jimi_js_path}")
-        else:
-            self.jimi_js_path = os.path.join(os.path.dirname(__file__),'js-code' ,'JIMI.JS')
-            logger.info(f"🔧 开发环境 - JIMI.JS 路径: {self.jimi_js_path}")
+        self.jimi_js_path = get_jimi_js_path()
         
         self.is_available = False  # 签名生成器是否可用
 
@@ -302,24 +348,667 @@ class XimalayaSignNode:
             xm_sign: 待验证的签名
         返回: True/False
         """
-        if not xm_sign or "&&" not in xm_sign:
-            return False
+        return check_xm_sign_format(xm_sign)
+
+
+class SignBackend:
+    """
+    xm-sign 签名后端接口
+
+    - node: 常驻 Node.js worker 池（XimalayaSignWorkerPool），默认后端，多个 worker 并行签名
+    - quickjs: 进程内嵌入式 JS 引擎（QuickJSSignBackend），无子进程，但单次签名更慢且只能串行执行
+    由 XMLY_SIGN_BACKEND 配置选择，见 get_sign_backend()
+    """
+
+    name = ""
+
+    @property
+    def is_available(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    def error_message(self) -> Optional[str]:
+        raise NotImplementedError
+
+    async def start(self):
+        """预热（加载 JS / 启动进程）"""
+
+    async def stop(self):
+        """释放资源"""
+
+    async def get_xm_sign(self) -> Tuple[bool, Optional[str], Optional[str]]:
+        """返回: (success, xm_sign, error_message)，与 XimalayaSignNode.get_xm_sign 一致"""
+        raise NotImplementedError
+
+    @property
+    def parallelism(self) -> int:
+        """可同时执行的签名数（签名池按此并发预生成）"""
+        return 1
+
+    def verify_xm_sign(self, xm_sign) -> bool:
+        return check_xm_sign_format(xm_sign)
+
+    def status(self) -> Dict[str, object]:
+        return {}
+
+
+class _SignWorker:
+    """单个常驻 Node.js 签名进程（JSON Lines 协议，见 js-code/sign_worker.js）"""
+
+    def __init__(self, index: int, node_executable: str, worker_js_path: str):
+        self.index = index
+        self.node_executable = node_executable
+        self.worker_js_path = worker_js_path
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.restart_count = 0
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def ensure_started(self):
+        """进程未启动或已退出时（重新）启动，并等待 ready"""
+        async with self._start_lock:
+            if self.alive:
+                return
+            if self.process is not None:
+                self.restart_count += 1
+                logger.warning(f"⚠️ 签名 worker-{self.index} 已退出（code={self.process.returncode}），正在重启")
+            self.process = await asyncio.create_subprocess_exec(
+                self.node_executable, self.worker_js_path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=os.path.dirname(self.worker_js_path),
+            )
+            timeout_seconds = 60 if getattr(sys, 'frozen', False) else 30
+            try:
+                ready_line = await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout_seconds)
+                if not json.loads(ready_line or b'{}').get('ready'):
+                    raise RuntimeError(f"签名 worker 启动失败: {ready_line!r}")
+            except Exception:
+                self._kill()
+                raise
+            self._reader_task = asyncio.create_task(self._read_responses(self.process))
+            self._stderr_task = asyncio.create_task(self._drain_stderr(self.process))
+            logger.info(f"✅ 签名 worker-{self.index} 已启动: pid={self.process.pid}")
+
+    async def _read_responses(self, process: asyncio.subprocess.Process):
+        """读取响应并分发给对应请求；进程退出时让未完成的请求失败"""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    response = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.debug(f"签名 worker-{self.index} 非协议输出: {line!r}")
+                    continue
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("签名 worker 进程已退出"))
+            self._pending.clear()
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process):
+        """持续读取 stderr，避免管道写满阻塞 Node.js"""
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+            logger.debug(f"签名 worker-{self.index} stderr: {line.decode(errors='replace').rstrip()}")
+
+    async def sign(self, timeout: float) -> str:
+        """发送一次签名请求并等待结果"""
+        await self.ensure_started()
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self.process.stdin.write(json.dumps({"id": request_id}).encode() + b"\n")
+            await self.process.stdin.drain()
+            response = await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        if response.get('error'):
+            raise RuntimeError(response['error'])
+        return response.get('sign', '')
+
+    def _kill(self):
+        if self.alive:
+            self.process.kill()
+
+    async def stop(self):
+        """关闭 stdin 让进程自行退出，超时则强制结束"""
+        if not self.alive:
+            return
+        try:
+            self.process.stdin.close()
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except Exception:
+            self._kill()
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None:
+                task.cancel()
+
+
+class XimalayaSignWorkerPool(SignBackend):
+    """
+    常驻 Node.js 签名进程池（单例，签名后端 node）
+
+    JIMI.JS 只在每个 worker 启动时加载一次，之后通过 stdin/stdout 的 JSON Lines 交换签名请求，
+    省去每次请求 spawn node + 加载 JS 的开销。worker 崩溃时在下一次请求前自动重启；
+    常驻进程不可用（如事件循环不支持子进程）时回退为 XimalayaSignNode 单次执行。
+    """
+
+    name = "node"
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._node = None
+            cls._instance._workers = []
+            cls._instance._use_fallback = False
+        return cls._instance
+
+    def _get_node(self) -> XimalayaSignNode:
+        """Node.js 环境检查只做一次"""
+        if self._node is None:
+            self._node = XimalayaSignNode()
+        return self._node
+
+    @property
+    def is_available(self) -> bool:
+        return self._get_node().is_available
+
+    @property
+    def error_message(self) -> Optional[str]:
+        return self._get_node().error_message
+
+    @property
+    def parallelism(self) -> int:
+        return max(1, settings.XMLY_SIGN_WORKER_POOL_SIZE)
+
+    def _ensure_workers(self) -> List[_SignWorker]:
+        if not self._workers:
+            node = self._get_node()
+            worker_js_path = os.path.join(os.path.dirname(node.jimi_js_path), 'sign_worker.js')
+            self._workers = [
+                _SignWorker(index, node.node_executable, worker_js_path)
+                for index in range(max(1, settings.XMLY_SIGN_WORKER_POOL_SIZE))
+            ]
+        return self._workers
+
+    async def start(self):
+        """预热：启动所有 worker（在 lifespan 中调用）"""
+        if not self.is_available:
+            logger.info(f"ℹ️ 签名生成器不可用，跳过签名 worker 预热: {self.error_message}")
+            return
+        workers = self._ensure_workers()
+        results = await asyncio.gather(*[worker.ensure_started() for worker in workers], return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            logger.warning(f"⚠️ 部分签名 worker 启动失败: {errors[0]}")
+        if len(errors) == len(workers) and isinstance(errors[0], NotImplementedError):
+            # Windows SelectorEventLoop 不支持子进程
+            self._use_fallback = True
+            logger.warning("⚠️ 当前事件循环不支持子进程，签名回退为单次执行 Node.js")
+
+    async def stop(self):
+        """关闭所有 worker"""
+        await asyncio.gather(*[worker.stop() for worker in self._workers], return_exceptions=True)
+        self._workers = []
+
+    async def get_xm_sign(self) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        生成xm-sign（异步）
 
-        parts = xm_sign.split("&&")
-        if len(parts) != 2:
-            return False
+        返回: (success: bool, xm_sign: str | None, error_message: str | None)，与 XimalayaSignNode.get_xm_sign 一致
+        """
+        node = self._get_node()
+        if not node.is_available:
+            error_msg = node.error_message if node.error_message else "签名生成器不可用"
+            logger.info(f"ℹ️ {error_msg}")
+            return False, None, error_msg
+        if self._use_fallback:
+            return await asyncio.to_thread(node.get_xm_sign)
+
+        # 选择当前请求最少的 worker
+        worker = min(self._ensure_workers(), key=lambda w: w.in_flight)
+        try:
+            xm_sign = await worker.sign(timeout=settings.XMLY_SIGN_TIMEOUT)
+        except NotImplementedError:
+            self._use_fallback = True
+            logger.warning("⚠️ 当前事件循环不支持子进程，签名回退为单次执行 Node.js")
+            return await asyncio.to_thread(node.get_xm_sign)
+        except asyncio.TimeoutError:
+            return False, None, "Node.js执行超时"
+        except Exception as e:
+            return False, None, f"生成xm-sign失败: {e}"
+
+        if not xm_sign:
+            return False, None, "响应中未找到sign字段"
+        logger.debug(f"xm-sign 生成成功（worker-{worker.index}）: {xm_sign}")
+        return True, xm_sign, None
+
+    def status(self) -> Dict[str, object]:
+        """worker 状态（供调试）"""
+        return {
+            "backend": self.name,
+            "fallback": self._use_fallback,
+            "workers": [
+                {"index": w.index, "alive": w.alive, "pid": w.process.pid if w.process else None,
+                 "in_flight": w.in_flight, "restart_count": w.restart_count}
+                for w in self._workers
+            ],
+        }
+
+
+# 全局单例
+xmly_sign_worker_pool = XimalayaSignWorkerPool()
+
+
+# QuickJS 中运行 JIMI.JS 所需的最小 Node.js 环境：
+# - global / module / require：JIMI.JS 以“被加载的模块”方式运行，只导出 get_data
+# - TextEncoder / btoa / atob / performance / 定时器：Node.js 内置而 QuickJS 没有的全局对象
+# - fetch：转发给 Python（__py_fetch），请求体 ArrayBuffer 以字节数组 JSON 传递
+_QUICKJS_PRELUDE = """
+var global = globalThis;
+var module = { exports: {} };
+var require = { main: null };
+var __B64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/';
+function btoa(input) {
+    var str = String(input), output = '';
+    for (var i = 0; i < str.length; i += 3) {
+        var a = str.charCodeAt(i), b = str.charCodeAt(i + 1), c = str.charCodeAt(i + 2);
+        output += __B64.charAt(a >> 2) + __B64.charAt(((a & 3) << 4) | (b >> 4))
+            + (i + 1 < str.length ? __B64.charAt(((b & 15) << 2) | (c >> 6)) : '=')
+            + (i + 2 < str.length ? __B64.charAt(c & 63) : '=');
+    }
+    return output;
+}
+function atob(input) {
+    var str = String(input).replace(/[^A-Za-z0-9+/]/g, ''), output = '', buffer = 0, bits = 0;
+    for (var i = 0; i < str.length; i++) {
+        buffer = (buffer << 6) | __B64.indexOf(str.charAt(i));
+        bits += 6;
+        if (bits >= 8) {
+            bits -= 8;
+            output += String.fromCharCode((buffer >> bits) & 255);
+        }
+    }
+    return output;
+}
+function TextEncoder() {}
+TextEncoder.prototype.encode = function (input) {
+    var binary = unescape(encodeURIComponent(String(input === undefined ? '' : input)));
+    var bytes = new Uint8Array(binary.length);
+    for (var i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    return bytes;
+};
+var performance = { now: function () { return Date.now(); }, timeOrigin: Date.now() };
+var __timer_id = 0;
+function setTimeout(callback) {
+    var args = Array.prototype.slice.call(arguments, 2);
+    Promise.resolve().then(function () { if (typeof callback === 'function') callback.apply(null, args); });
+    return ++__timer_id;
+}
+function setInterval() { return ++__timer_id; }
+function clearTimeout() {}
+function clearInterval() {}
+var console = { log: function () {}, info: function () {}, warn: function () {}, debug: function () {},
+    error: function () { __py_log(Array.prototype.map.call(arguments, String).join(' ')); } };
+function fetch(url, options) {
+    options = options || {};
+    return new Promise(function (resolve) {
+        var body = options.body;
+        if (body instanceof ArrayBuffer) {
+            body = JSON.stringify(Array.from(new Uint8Array(body)));
+        } else if (ArrayBuffer.isView(body)) {
+            body = JSON.stringify(Array.from(new Uint8Array(body.buffer, body.byteOffset, body.byteLength)));
+        } else {
+            body = body == null ? null : JSON.stringify(String(body));
+        }
+        var raw = JSON.parse(__py_fetch(String(url), options.method || 'GET', JSON.stringify(options.headers || {}), body));
+        resolve({
+            ok: raw.status >= 200 && raw.status < 300,
+            status: raw.status,
+            statusText: raw.statusText,
+            text: function () { return Promise.resolve(raw.body); },
+            json: function () { return Promise.resolve(JSON.parse(raw.body)); }
+        });
+    });
+}
+"""
+
+_QUICKJS_CALL = """
+var __sign_result = null, __sign_error = null;
+module.exports.get_data().then(
+    function (result) { __sign_result = JSON.parse(result).sign; },
+    function (error) { __sign_error = String((error && error.message) || error); }
+);
+"""
+
+
+class QuickJSSignBackend(SignBackend):
+    """
+    进程内 QuickJS 签名后端（单例）
+
+    JIMI.JS 只加载一次到 QuickJS 上下文中，签名时直接调用 get_data()，没有子进程和 IPC；
+    JIMI.JS 中的 fetch 由 Python（httpx）完成。QuickJS 上下文不是线程安全的，
+    所有 JS 调用（包括同步的 fetch）都在一个专用线程中串行执行，不阻塞事件循环。
+    签名只能逐个执行，吞吐量低于并行的常驻 Node.js worker 池，
+    因此只在显式配置 XMLY_SIGN_BACKEND = "quickjs" 或没有 Node.js 时使用。
+    需要安装 quickjs（pip install quickjs）。
+    """
+
+    name = "quickjs"
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._executor = None
+            cls._instance._context = None
+            cls._instance._http_client = None
+            cls._instance._loaded = False
+            cls._instance._error_message = None
+            cls._instance._load_lock = asyncio.Lock()
+            cls._instance.sign_count = 0
+        return cls._instance
+
+    @property
+    def is_available(self) -> bool:
+        return self._context is not None
+
+    @property
+    def error_message(self) -> Optional[str]:
+        return self._error_message
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quickjs-sign")
+        return self._executor
+
+    async def start(self):
+        """在专用线程中加载 JIMI.JS（只加载一次）"""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            loop = asyncio.get_running_loop()
+            started_at = time.monotonic()
+            try:
+                await loop.run_in_executor(self._get_executor(), self._load)
+                logger.info(f"✅ QuickJS 签名引擎已加载 JIMI.JS，耗时 {time.monotonic() - started_at:.2f}s")
+            except ImportError:
+                self._error_message = "未安装 quickjs（pip install quickjs）"
+                logger.info(f"ℹ️ {self._error_message}")
+            except Exception as e:
+                self._context = None
+                self._error_message = f"QuickJS 加载 JIMI.JS 失败: {e}"
+                logger.warning(f"⚠️ {self._error_message}")
+
+    def _load(self):
+        import quickjs
+
+        jimi_js_path = get_jimi_js_path()
+        with open(jimi_js_path, "r", encoding="utf-8") as f:
+            source = f.read()
+        context = quickjs.Context()
+        context.add_callable("__py_fetch", self._fetch)
+        context.add_callable("__py_log", lambda message: logger.debug(f"QuickJS console.error: {message}"))
+        context.eval(_QUICKJS_PRELUDE)
+        context.eval(source)
+        if context.eval("typeof module.exports.get_data") != "function":
+            raise RuntimeError("JIMI.JS 未导出 get_data")
+        self._context = context
+
+    def _fetch(self, url: str, method: str, headers_json: str, body_json: Optional[str]) -> str:
+        """JS fetch 的 Python 实现（在引擎线程中同步执行）"""
+        import httpx
+
+        if self._http_client is None:
+            self._http_client = httpx.Client(timeout=settings.XMLY_SIGN_TIMEOUT)
+        content = None
+        if body_json is not None:
+            body = json.loads(body_json)
+            content = bytes(body) if isinstance(body, list) else body.encode("utf-8")
+        try:
+            response = self._http_client.request(method, url, headers=json.loads(headers_json), content=content)
+            return json.dumps({"status": response.status_code, "statusText": response.reason_phrase, "body": response.text})
+        except Exception as e:
+            return json.dumps({"status": 0, "statusText": str(e), "body": ""})
+
+    def _sign(self) -> str:
+        """调用 get_data() 并执行完所有 Promise 任务（fetch 为同步实现，一轮即可完成）"""
+        context = self._context
+        context.eval(_QUICKJS_CALL)
+        while context.execute_pending_job():
+            pass
+        error = context.get("__sign_error")
+        if error:
+            raise RuntimeError(error)
+        xm_sign = context.get("__sign_result")
+        if not xm_sign:
+            raise RuntimeError("响应中未找到sign字段")
+        return xm_sign
+
+    async def stop(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    async def get_xm_sign(self) -> Tuple[bool, Optional[str], Optional[str]]:
+        await self.start()
+        if not self.is_available:
+            return False, None, self._error_message or "签名生成器不可用"
+        loop = asyncio.get_running_loop()
+        try:
+            xm_sign = await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), self._sign), timeout=settings.XMLY_SIGN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            return False, None, "QuickJS 签名超时"
+        except Exception as e:
+            return False, None, f"生成xm-sign失败: {e}"
+        self.sign_count += 1
+        return True, xm_sign, None
+
+    def status(self) -> Dict[str, object]:
+        return {"backend": self.name, "available": self.is_available, "error": self._error_message,
+                "sign_count": self.sign_count}
+
+
+# 全局单例
+quickjs_sign_backend = QuickJSSignBackend()
+
+_sign_backend: Optional[SignBackend] = None
+
+
+async def get_sign_backend() -> SignBackend:
+    """
+    按 XMLY_SIGN_BACKEND 选择签名后端（只选择一次）
+
+    - node（默认）：常驻 Node.js worker
+    - auto：优先使用常驻 Node.js worker，没有可用的 Node.js 时使用进程内 QuickJS
+    - quickjs：优先使用进程内 QuickJS，不可用时回退到 Node.js
+    """
+    global _sign_backend
+    if _sign_backend is not None:
+        return _sign_backend
+    backend = settings.XMLY_SIGN_BACKEND
+    if backend == "quickjs" or (backend == "auto" and not xmly_sign_worker_pool.is_available):
+        await quickjs_sign_backend.start()
+        if quickjs_sign_backend.is_available:
+            _sign_backend = quickjs_sign_backend
+        else:
+            logger.info(f"ℹ️ QuickJS 签名后端不可用，回退到 Node.js: {quickjs_sign_backend.error_message}")
+    if _sign_backend is None:
+        _sign_backend = xmly_sign_worker_pool
+    logger.info(f"✍️ xm-sign 签名后端: {_sign_backend.name}")
+    return _sign_backend
+
+
+class XimalayaSignPool:
+    """
+    预生成 xm-sign 池（单例）
+
+    后台 producer 通过签名后端（get_sign_backend()：常驻 Node.js worker 或 QuickJS）
+    持续把池补满到 XMLY_SIGN_POOL_SIZE 个签名，超过 XMLY_SIGN_MAX_AGE 秒的签名会被丢弃。
+    请求直接从池中取签名（每个签名只使用一次），突发请求不再等待签名生成；
+    池为空时才同步生成一个。超过 XMLY_SIGN_IDLE_SECONDS 秒没有请求时不再补充（避免空闲时
+    每个有效期都重新生成整池签名），下一个请求到来后恢复补充。
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._signs = deque()  # (生成时间, xm_sign)，左侧最旧
+            cls._instance._producer_task = None
+            cls._instance._wakeup = None
+            cls._instance._last_error = None
+            cls._instance._backend = None
+            cls._instance._last_demand = 0.0  # 最近一次取签名的时间
+            cls._instance._next_start_at = 0.0  # 签名后端不可用时，下次尝试启动的时间
+            cls._instance.hit_count = 0
+            cls._instance.miss_count = 0
+            cls._instance.expired_count = 0
+        return cls._instance
+
+    async def _get_backend(self) -> SignBackend:
+        if self._backend is None:
+            self._backend = await get_sign_backend()
+        return self._backend
+
+    def _purge_expired(self):
+        """丢弃超过最大有效期的签名"""
+        deadline = time.monotonic() - settings.XMLY_SIGN_MAX_AGE
+        while self._signs and self._signs[0][0] < deadline:
+            self._signs.popleft()
+            self.expired_count += 1
+
+    async def start(self):
+        """启动后台 producer（在 lifespan 中调用）"""
+        if self._producer_task is not None and not self._producer_task.done():
+            return
+        backend = await self._get_backend()
+        await backend.start()
+        if not backend.is_available:
+            self._next_start_at = time.monotonic() + settings.XMLY_SIGN_RETRY_SECONDS
+            logger.info(f"ℹ️ 签名生成器不可用，跳过签名池预生成: {backend.error_message}")
+            return
+        # 启动时预热一次
+        self._last_demand = time.monotonic()
+        self._wakeup = asyncio.Event()
+        self._producer_task = asyncio.create_task(self._produce())
+        logger.info(f"✍️ xm-sign 预生成池已启动: size={settings.XMLY_SIGN_POOL_SIZE}, max_age={settings.XMLY_SIGN_MAX_AGE}s")
+
+    async def stop(self):
+        """停止后台 producer、清空池并释放签名后端"""
+        if self._producer_task is not None:
+            self._producer_task.cancel()
+            await asyncio.gather(self._producer_task, return_exceptions=True)
+            self._producer_task = None
+        self._signs.clear()
+        if self._backend is not None:
+            await self._backend.stop()
+
+    async def _produce(self):
+        """把池补满；池满后等到有签名被取走或即将过期时再补；空闲时等到下一个请求再补"""
+        max_age = settings.XMLY_SIGN_MAX_AGE
+        backend = await self._get_backend()
+        while True:
+            self._purge_expired()
+            missing = settings.XMLY_SIGN_POOL_SIZE - len(self._signs)
+            if missing > 0 and time.monotonic() - self._last_demand > settings.XMLY_SIGN_IDLE_SECONDS:
+                # 最近没有请求：不再补充，等待下一个请求
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if missing > 0:
+                # 每轮最多并发后端能并行执行的签名数（QuickJS 只能串行）
+                batch = min(missing, backend.parallelism)
+                results = await asyncio.gather(*[backend.get_xm_sign() for _ in range(batch)])
+                produced = 0
+                for success, xm_sign, error_msg in results:
+                    if success:
+                        self._signs.append((time.monotonic(), xm_sign))
+                        produced += 1
+                    else:
+                        self._last_error = error_msg
+                if produced == 0:
+                    logger.warning(f"⚠️ xm-sign 预生成失败，{settings.XMLY_SIGN_RETRY_SECONDS}s 后重试: {self._last_error}")
+                    await asyncio.sleep(settings.XMLY_SIGN_RETRY_SECONDS)
+                continue
+            # 池已满：等待被取走，或最旧的签名过期
+            oldest_age = time.monotonic() - self._signs[0][0]
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.1, max_age - oldest_age))
+            except asyncio.TimeoutError:
+                pass
+
+    async def get_xm_sign(self) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        取一个新鲜的 xm-sign（池为空时同步生成）
+
+        返回: (success: bool, xm_sign: str | None, error_message: str | None)，与 XimalayaSignNode.get_xm_sign 一致
+        """
+        if self._producer_task is None and time.monotonic() >= self._next_start_at:
+            await self.start()
+        self._last_demand = time.monotonic()
+        self._purge_expired()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._signs:
+            self.hit_count += 1
+            return True, self._signs.popleft()[1], None
+        self.miss_count += 1
+        return await (await self._get_backend()).get_xm_sign()
 
-        browser_id, session_id = parts
+    def verify_xm_sign(self, xm_sign) -> bool:
+        return check_xm_sign_format(xm_sign)
 
-        # 验证browser_id长度
-        if len(browser_id) < 10:
-            return False
+    def status(self) -> Dict[str, object]:
+        """池状态（供调试）"""
+        self._purge_expired()
+        now = time.monotonic()
+        return {
+            "size": len(self._signs),
+            "capacity": settings.XMLY_SIGN_POOL_SIZE,
+            "max_age": settings.XMLY_SIGN_MAX_AGE,
+            "oldest_age": round(now - self._signs[0][0], 3) if self._signs else None,
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+            "expired_count": self.expired_count,
+            "last_error": self._last_error,
+            "backend": self._backend.status() if self._backend else None,
+        }
 
-        # 验证session_id长度
-        if len(session_id) < 10:
-            return False
 
-        return True
+# 全局单例
+xmly_sign_pool = XimalayaSignPool()
 
 
 def main():
@@ -0,0 +1,122 @@
+"""
+喜马拉雅滑块验证单飞协调器 - 同一身份的并发验证只打开一次浏览器
+
+喜马拉雅触发风控（riskLevel == 5）时，正在进行的每个请求都会各自调用 solve_slider，
+突发流量下一个验证码会拉起 N 个浏览器。这里按 cookie 身份做单飞（single-flight）：
+- 同一身份第一个请求负责解滑块，并发到达的其他请求等待并共享同一份结果
+- 解出的 cookies 缓存 XMLY_SLIDER_COOKIE_TTL 秒，之后再触发风控的请求直接复用
+- 复用的 cookies 重试仍失败时由调用方 invalidate，下一次重新解滑块
+- 解滑块失败不缓存，所有等待者收到同一个异常（由调用方回退到原始 cookies）
+"""
+import asyncio
+import hashlib
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+# 喜马拉雅登录态 cookie，存在时作为身份标识（其余 cookie 可能随请求变化）
+XMLY_LOGIN_COOKIE = "1&_token"
+
+
+class SliderVerificationCoordinator:
+    """滑块验证单飞协调器单例类"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._inflight = {}  # 身份 -> 正在进行的验证任务
+            cls._instance._cache = {}  # 身份 -> (过期时间, cookies)
+            cls._instance.solve_count = 0
+            cls._instance.shared_count = 0
+            cls._instance.cache_hits = 0
+        return cls._instance
+
+    @staticmethod
+    def make_key(cookies: Optional[Dict[str, str]]) -> str:
+        """cookie 身份：优先使用登录态 cookie，否则使用全部 cookie 的摘要（未登录为 anonymous）"""
+        cookies = cookies or {}
+        identity = cookies.get(XMLY_LOGIN_COOKIE)
+        if identity is None:
+            if not cookies:
+                return "anonymous"
+            identity = ";".join(f"{name}={value}" for name, value in sorted(cookies.items()))
+        return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    def get_cached(self, key: str) -> Optional[Dict[str, str]]:
+        """未过期的已解 cookies"""
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        expires_at, cookies = cached
+        if time.monotonic() >= expires_at:
+            self._cache.pop(key, None)
+            return None
+        return cookies
+
+    def invalidate(self, key: str):
+        """丢弃缓存的 cookies（复用后仍被风控时调用）"""
+        if self._cache.pop(key, None) is not None:
+            logger.info(f"🧩 滑块验证缓存已失效: {key[:8]}")
+
+    async def solve(self, key: str, slider_solver, verify_url: str) -> Tuple[Dict[str, str], bool]:
+        """
+        获取通过滑块验证后的 cookies（缓存命中直接返回，同一身份并发请求只解一次）
+
+        Args:
+            key: cookie 身份（make_key 生成）
+            slider_solver: 滑块验证器实例
+            verify_url: 验证页面 URL（仅第一个请求的 URL 生效）
+
+        Returns:
+            (cookies 字典, 是否来自缓存)
+
+        Raises:
+            Exception: 解滑块失败（所有等待者收到同一个异常）
+        """
+        cookies = self.get_cached(key)
+        if cookies is not None:
+            self.cache_hits += 1
+            logger.info(f"🧩 复用已缓存的滑块验证 cookies: {key[:8]}")
+            return cookies, True
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared_count += 1
+            logger.info(f"🧩 滑块验证进行中，等待共享结果: {key[:8]}")
+        else:
+            self.solve_count += 1
+            task = asyncio.create_task(slider_solver.solve_slider(verify_url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_solved(key, done))
+        # shield：单个请求被取消不会中断其他请求共享的验证
+        return await asyncio.shield(task), False
+
+    def _on_solved(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning(f"⚠️ 滑块验证失败，不缓存结果: {key[:8]}")
+            return
+        self._cache[key] = (time.monotonic() + settings.XMLY_SLIDER_COOKIE_TTL, task.result())
+
+    def status(self) -> Dict[str, Any]:
+        """协调器状态（供调试）"""
+        return {
+            "inflight": len(self._inflight),
+            "cached": sum(1 for key in list(self._cache) if self.get_cached(key) is not None),
+            "cookie_ttl": settings.XMLY_SLIDER_COOKIE_TTL,
+            "solve_count": self.solve_count,
+            "shared_count": self.shared_count,
+            "cache_hits": self.cache_hits,
+        }
+
+
+# 全局单例
+slider_coordinator = SliderVerificationCoordinator()
@@ -8,6 +8,7 @@ import random
 from playwright.async_api import TimeoutError as PlaywrightTimeout
 from loguru import logger
 
+from app.core.config import settings
 from app.utils.playright_manager import PlaywrightManager
 
 
@@ -18,6 +19,13 @@ class SliderSolver(PlaywrightManager):
     继承自 PlaywrightManager，提供自动化滑块验证功能
     """
 
+    # 验证成功标识（根据喜马拉雅实际元素调整）
+    SUCCESS_SELECTORS = (
+        '.verify-success',
+        '[class*="success"]',
+        '.slide-verify-success'
+    )
+
     def __init__(self, headless: bool = False):
         """
         初始化滑块解决器
@@ -38,48 +46,47 @@ class SliderSolver(PlaywrightManager):
             cookies字典
         """
         try:
-            # 启动浏览器和创建上下文
-            await self.launch_browser()
-            await self.create_context()
-            
-            # 创建新页面
-            page = await self.new_page()
-
-            print("=" * 60)
-            print("正在访问专辑页面...")
-            print(f"URL: {album_url}")
-            print("=" * 60)
-
-            # 访问专辑页面，设置60秒超时，使用更宽松的等待条件
-            try:
-                await page.goto(
-                    album_url,
-                    wait_until='domcontentloaded',
-                    timeout=60000  # 60秒超时
-                )
-            except PlaywrightTimeout:
-                print("⚠️ 页面加载超时，但继续尝试获取cookies...")
-            
-            # 等待页面加载完成
-            await asyncio.sleep(2)
-
-            # 检查是否出现滑块验证
-            print("\n检测页面状态...")
-
-            # 方法1: 检查是否有滑块元素
-            slider_exists = await page.locator('iframe[src*="verify"]').count() > 0
-
-            if slider_exists:
-                print("[检测到滑块验证] 准备自动化处理...")
-                await self._handle_slider(page)
-            else:
-                print("[未检测到滑块] 页面正常加载")
-
-            # 等待验证完成后的页面稳定
-            await asyncio.sleep(3)
-
-            # 获取cookies
-            cookies = await self.get_cookies()
+            # 从浏览器池租用隔离的上下文（池未启动时冷启动浏览器），退出时自动释放
+            # 快速模式：拦截图片、媒体、字体和统计脚本（验证码 iframe 内的资源除外）
+            async with self.browser_session(block_resources=settings.PLAYWRIGHT_BLOCK_RESOURCES) as context:
+                # 创建新页面
+                page = await context.new_page()
+
+                print("=" * 60)
+                print("正在访问专辑页面...")
+                print(f"URL: {album_url}")
+                print("=" * 60)
+
+                # 访问专辑页面，设置60秒超时，使用更宽松的等待条件
+                try:
+                    await page.goto(
+                        album_url,
+                        wait_until='domcontentloaded',
+                        timeout=60000  # 60秒超时
+                    )
+                except PlaywrightTimeout:
+                    print("⚠️ 页面加载超时，但继续尝试获取cookies...")
+
+                # 等待网络空闲（替代固定等待，超时后继续）
+                await self.wait_for_network_idle(page)
+
+                # 检查是否出现滑块验证
+                print("\n检测页面状态...")
+
+                # 方法1: 检查是否有滑块元素
+                slider_exists = await page.locator('iframe[src*="verify"]').count() > 0
+
+                if slider_exists:
+                    print("[检测到滑块验证] 准备自动化处理...")
+                    baseline = self.cookies_to_dict(await context.cookies())
+                    await self._handle_slider(page)
+                    # 等待验证通过后服务端下发新的 cookie（替代固定等待）
+                    await self.wait_for_network_idle(page)
+                    cookies = await self.wait_for_cookies(context, baseline)
+                else:
+                    print("[未检测到滑块] 页面正常加载")
+                    # 获取cookies（使用本次的上下文，并发验证互不影响）
+                    cookies = await context.cookies()
 
             # 保存cookies
             self._save_cookies(cookies)
@@ -91,18 +98,10 @@ class SliderSolver(PlaywrightManager):
                 print(f"Cookie: {cookie['name']}: {cookie['value']}")
             print("=" * 60)
 
-            # 关闭浏览器
-            await self.close()
-
             return self.cookies_to_dict(cookies)
             
         except Exception as e:
             logger.error(f"❌ 滑块验证失败: {e}")
-            # 确保浏览器被关闭
-            try:
-                await self.close()
-            except:
-                pass
             raise
 
     async def _handle_slider(self, page):
@@ -157,7 +156,11 @@ class SliderSolver(PlaywrightManager):
             await self._simulate_human_drag(page, iframe, slider_button, button_box)
 
             print("5. 等待验证结果...")
-            await asyncio.sleep(2)
+            try:
+                # 成功标识出现即返回，不再固定等待
+                await iframe.wait_for_selector(', '.join(self.SUCCESS_SELECTORS), timeout=3000)
+            except PlaywrightTimeout:
+                pass
 
             # 检查是否验证成功
             success = await self._check_verification_success(iframe)
@@ -247,13 +250,7 @@ class SliderSolver(PlaywrightManager):
         """
         try:
             # 检查成功标识（根据喜马拉雅实际元素调整）
-            success_elements = [
-                '.verify-success',
-                '[class*="success"]',
-                '.slide-verify-success'
-            ]
-
-            for selector in success_elements:
+            for selector in self.SUCCESS_SELECTORS:
                 element = await iframe.query_selector(selector)
                 if element:
                     return True
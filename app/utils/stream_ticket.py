@@ -0,0 +1,55 @@
+"""
+SSE 订阅票据 - 浏览器原生 EventSource 的短期凭证
+
+EventSource 不能设置 Authorization / X-Device-Id 请求头，凭证只能放在 URL 中，而 URL 会出现在
+访问日志、代理日志和浏览器历史中。因此不在 URL 中放长期有效的 token，而是：
+- 前端先带正常请求头调用签发接口（经过 PermissionMiddleware 权限校验）获取票据
+- 再用 ?ticket=... 建立 SSE 连接；票据只对签发时指定的路径有效，DOWNLOAD_EVENTS_TICKET_TTL 秒后过期
+有效期内可以重复使用，覆盖 EventSource 断线后的自动重连；已建立的连接不受过期影响。
+"""
+import secrets
+import time
+from typing import Dict, Tuple
+
+from app.core.config import settings
+
+
+class StreamTicketStore:
+    """SSE 订阅票据存储单例类（进程内存，重启后失效）"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._tickets = {}  # 票据 -> (路径, 过期时间)
+        return cls._instance
+
+    def issue(self, path: str) -> Dict[str, object]:
+        """签发只对 path 有效的票据"""
+        now = time.monotonic()
+        self._purge_expired(now)
+        ticket = secrets.token_urlsafe(32)
+        ttl = settings.DOWNLOAD_EVENTS_TICKET_TTL
+        self._tickets[ticket] = (path, now + ttl)
+        return {"ticket": ticket, "expires_in": ttl}
+
+    def verify(self, ticket: str, path: str) -> bool:
+        """票据存在、未过期且签发给该路径"""
+        entry: Tuple[str, float] = self._tickets.get(ticket)
+        if entry is None:
+            return False
+        ticket_path, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._tickets.pop(ticket, None)
+            return False
+        return ticket_path == path
+
+    def _purge_expired(self, now: float):
+        expired = [ticket for ticket, (_, expires_at) in self._tickets.items() if expires_at <= now]
+        for ticket in expired:
+            del self._tickets[ticket]
+
+
+# 全局单例
+stream_ticket_store = StreamTicketStore()
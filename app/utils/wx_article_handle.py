@@ -4,9 +4,11 @@ import os
 from datetime import datetime
 from app.utils.src_path import root_path
 import json
+import html
 import argparse
-import alibabacloud_oss_v2 as oss
-from app.core.config import settings
+from typing import Optional
+from app.utils.oss_uploader import oss_uploader
+from app.services.wx_article_index import sanitize_article_title, record_downloaded_article
 def parse_sogou_articles(html_content):
     """解析搜狗微信搜索结果中的文章链接和标题"""
     articles = []
@@ -59,6 +61,55 @@ def parse_sogou_articles(html_content):
     
     return articles
 
+# 协议相对地址 //res.wx.qq.com（前面不是 ":"，即不是 https://res.wx.qq.com）
+RES_WX_RELATIVE_PATTERN = re.compile(r'(?<!:)//res\.wx\.qq\.com')
+# 标题只需要扫描 <head>，最多扫描的字符数（防止没有 </head> 时扫描整个文档）
+TITLE_SCAN_LIMIT = 256 * 1024
+HEAD_END_PATTERN = re.compile(r'</head\s*>', re.IGNORECASE)
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+META_TAG_PATTERN = re.compile(r'<meta\b[^>]*>', re.IGNORECASE)
+META_ATTR_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def extract_html_title(html_content: str) -> Optional[str]:
+    """
+    只扫描 <head> 部分提取标题，不做整文档解析
+
+    优先级与原 BeautifulSoup 实现一致：<title> > og:title > twitter:title
+    """
+    head_match = HEAD_END_PATTERN.search(html_content, 0, TITLE_SCAN_LIMIT)
+    head = html_content[:head_match.start()] if head_match else html_content[:TITLE_SCAN_LIMIT]
+
+    title_match = TITLE_PATTERN.search(head)
+    if title_match:
+        title = html.unescape(title_match.group(1)).strip()
+        if title:
+            return title
+
+    meta_titles = {}
+    for meta_tag in META_TAG_PATTERN.findall(head):
+        attrs = {name.lower(): double or single for name, double, single in META_ATTR_PATTERN.findall(meta_tag)}
+        if attrs.get('property') in ('og:title', 'twitter:title') and attrs.get('content'):
+            meta_titles.setdefault(attrs['property'], html.unescape(attrs['content']).strip())
+    return meta_titles.get('og:title') or meta_titles.get('twitter:title') or None
+
+
+def get_article_save_dirs(wx_public_name: str, path_name: str = 'wx_public', save_to_local_path: str = '', save_to_local_file_name: str = ''):
+    """
+    计算文章保存目录（与 save_html_to_local 一致）
+
+    Returns:
+        (保存根目录, 公众号文章目录)，根目录下的 _assets 为所有公众号共享的资源目录
+    """
+    if len(path_name) > 0 and path_name != '':
+        path_str = os.path.join(root_path, 'crawlFiles', path_name)
+    else:
+        path_str = os.path.join(root_path, save_to_local_path)
+    # 如果传入的save_to_local_file_name存在则用save_to_local_file_name这个，不存在用wx_public_name
+    wx_public_name_path = os.path.join(path_str, wx_public_name if save_to_local_file_name == '' else save_to_local_file_name)
+    return path_str, wx_public_name_path
+
+
 # 存储html到本地 wx_public_id可以不传
 # 参数说明：
 # html_content: html内容
@@ -67,28 +118,14 @@ def parse_sogou_articles(html_content):
 # wx_public_id: 公众号ID
 # is_save_to_local_path: 保存到本地路径
 # is_save_to_local_file_name: 保存到本地文件名
-def save_html_to_local(html_content: str, wx_public_name: str, path_name: str = 'wx_public', wx_public_id: str = None, save_to_local_path: str = '', save_to_local_file_name: str = ''):
-    # 使用正则表达式替换所有的 //res.wx.qq.com 为 https://res.wx.qq.com
-    import re
-    pattern = r'(["\']\s*)(//res\.wx\.qq\.com)'
-    updated_html = re.sub(pattern, r'\1https://res.wx.qq.com', html_content)
-    
-    # 也替换没有引号包裹的情况
-    pattern2 = r'([^"\':])(//res\.wx\.qq\.com)'
-    updated_html = re.sub(pattern2, r'\1https://res.wx.qq.com', updated_html)
-    
-    # 提取html标题
-    soup = BeautifulSoup(updated_html, 'lxml')
-    # 获取 og:title 和 twitter:title 的内容
-    og_title = soup.find('meta', property='og:title')
-    twitter_title = soup.find('meta', property='twitter:title')
+# aid: 文章aid（可选，记录到已下载文章索引）
+def save_html_to_local(html_content: str, wx_public_name: str, path_name: str = 'wx_public', wx_public_id: str = None, save_to_local_path: str = '', save_to_local_file_name: str = '', aid: Optional[str] = None):
+    # NOTE: 同步阻塞函数（正则替换 + 磁盘写入），在 async 接口中请通过 app.utils.blocking_executor.run_blocking 调用
+    # 把所有协议相对地址 //res.wx.qq.com 替换为 https://res.wx.qq.com（单次扫描）
+    updated_html = RES_WX_RELATIVE_PATTERN.sub('https://res.wx.qq.com', html_content)
     
-    # 安全地获取标题
-    title = soup.title.string if soup.title else None
-    if not title and og_title and 'content' in og_title.attrs:
-        title = og_title['content']
-    elif not title and twitter_title and 'content' in twitter_title.attrs:
-        title = twitter_title['content']
+    # 提取html标题（只扫描 <head>）
+    title = extract_html_title(updated_html)
     
     # 如果仍然没有标题，使用时间戳
     if not title:
@@ -96,14 +133,10 @@ def save_html_to_local(html_content: str, wx_public_name: str, path_name: str =
         title = f"article_{int(time.time())}"
     
     # 处理标题中的非法字符（文件名不能包含的字符）
-    title = re.sub(r'[\\/*?:"<>|]', "_", title)
+    title = sanitize_article_title(title)
 
     # 拼接保存路径
-    path_str = ''
-    if len(path_name) > 0 and path_name != '':
-        path_str = os.path.join(root_path, 'crawlFiles', path_name)
-    else:
-        path_str = os.path.join(root_path, save_to_local_path)
+    path_str, wx_public_name_path = get_article_save_dirs(wx_public_name, path_name, save_to_local_path, save_to_local_file_name)
     print("标题:", title)
     print('保存路径:', path_str)
     print('公众号ID:', wx_public_id)
@@ -113,9 +146,6 @@ def save_html_to_local(html_content: str, wx_public_name: str, path_name: str =
     if not os.path.exists(path_str):
         os.makedirs(path_str, exist_ok=True)
     
-    # 如果传入的save_to_local_file_name存在则用save_to_local_file_name这个，不存在用wx_public_name
-    # 使用lambad表达式
-    wx_public_name_path = os.path.join(path_str, wx_public_name if save_to_local_file_name == '' else save_to_local_file_name)
     wx_article_path = os.path.join(wx_public_name_path, title)
     print('文章保存路径:', wx_article_path)
     
@@ -126,65 +156,23 @@ def save_html_to_local(html_content: str, wx_public_name: str, path_name: str =
     # 存储html到本地
     with open(f"{wx_article_path}.html", "w", encoding="utf-8") as f:
         f.write(updated_html)
+    # 记录到已下载文章索引（/check-downloaded 使用）
+    record_downloaded_article(path_str, os.path.basename(wx_public_name_path), title, f"{wx_article_path}.html", aid)
     # 返回文件路径
     return f"{wx_article_path}.html"
 
 
-bucket_name = settings.BUCKET_NAME
-region = settings.REGION
-endpoint = settings.ENDPOINT
 def upload_to_aliyun(local_file_path: str):
-    # 上传到阿里云
-    # 直接设置访问凭证
-    credentials_provider = oss.credentials.StaticCredentialsProvider(
-        access_key_id=settings.ACCESS_KEY_ID,
-        access_key_secret=settings.ACCESS_KEY_SECRET
-    )
-
-    # 加载SDK的默认配置，并设置凭证提供者
-    cfg = oss.config.load_default()
-    cfg.credentials_provider = credentials_provider
-    # 设置配置中的区域信息
-    cfg.region = region
-    # 如果提供了endpoint参数，则设置配置中的endpoint
-    cfg.endpoint = endpoint
-
-    # 使用配置好的信息创建OSS客户端
-    client = oss.Client(cfg)
-
-    # 获取文件名
-    file_name = os.path.basename(local_file_path)
-    # 获取文件内容
-    file_content = open(local_file_path, 'r', encoding='utf-8').read()
-
-    # 定义要上传的数据内容
-    data = file_content.encode('utf-8')  # 确保内容使用 UTF-8 编码
-    key = f"wx_public/{file_name}"
+    """
+    同步上传到阿里云（阻塞，复用全局 OSS 客户端）
 
+    远端已存在相同内容时跳过上传；大文件自动使用分片上传。
+    接口中请使用 oss_uploader.submit() 提交后台任务，不要直接调用本函数。
+    """
     try:
-        # 执行上传对象的请求，指定存储空间名称、对象名称和数据内容
-        result = client.put_object(oss.PutObjectRequest(
-            bucket=bucket_name,
-            key=key,
-            body=data,
-        ))
-        # 输出请求的结果状态码、请求ID、内容MD5、ETag、CRC64校验码和版本ID，用于检查请求是否成功
-        print(f'status code: {result.status_code},'
-                f' request id: {result.request_id},'
-                f' content md5: {result.content_md5},'
-                f' etag: {result.etag},'
-                f' hash crc64: {result.hash_crc64},'
-                f' version id: {result.version_id},'
-            )
-        # 返回文件路径
-        oss_file_path = f'https://{bucket_name}.{endpoint}/{key}'
-        # 判断是否上传成功
-        if result.status_code == 200:
-            # 文件路径
-            print(f'file path: {oss_file_path}')
-            return oss_file_path
-        else:
-            return None
+        result = oss_uploader.upload_file_sync(local_file_path)
+        print(f'file path: {result["oss_file_path"]}')
+        return result["oss_file_path"]
     except Exception as e:
         print(f"Upload error: {str(e)}")
         return None
@@ -10,6 +10,8 @@ import base64
 from Crypto.Cipher import AES
 import re
 
+from app.utils.slider_coordinator import slider_coordinator
+
 async def handle_xmly_risk_verification(
     client: AsyncClient,
     url: str,
@@ -132,7 +134,7 @@ async def _perform_slider_verification(
         raise HTTPException(status_code=400, detail="签名生成器未初始化")
 
     # 生成xm-sign
-    success, xm_sign, error_msg = sign_generator.get_xm_sign()
+    success, xm_sign, error_msg = await sign_generator.get_xm_sign()
 
     if not success:
         logger.error(f"❌ xm-sign 生成失败: {error_msg}")
@@ -151,8 +153,11 @@ async def _perform_slider_verification(
 
         logger.info(f"滑块验证URL: {verify_url}")
 
+        # 同一 cookie 身份的并发验证只解一次滑块，解出的 cookies 在有效期内复用
+        verify_key = slider_coordinator.make_key(merged_cookies)
+        from_cache = False
         try:
-            cookies_dict = await slider_solver.solve_slider(verify_url)
+            cookies_dict, from_cache = await slider_coordinator.solve(verify_key, slider_solver, verify_url)
             logger.info(f"滑块验证响应: {cookies_dict}")
             cookie = slider_solver.cookies_dict_to_string(cookies_dict)
             logger.info(f"滑块验证cookie: {cookie}")
@@ -176,6 +181,9 @@ async def _perform_slider_verification(
         if json_data.get('ret') != 200:
             error_msg = json_data.get('msg', '未知错误')
             logger.error(f"重试后仍然失败: {error_msg}")
+            if from_cache:
+                # 缓存的 cookies 已不可用，下一次重新解滑块
+                slider_coordinator.invalidate(verify_key)
             raise HTTPException(status_code=400, detail=error_msg)
 
         return json_data
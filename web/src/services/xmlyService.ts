@@ -202,6 +202,38 @@ export const xmlyService = {
     return resData;
   },
 
+  /**
+   * 订阅专辑下载进度（SSE，替代轮询 getAlbumDownloadStatus）
+   * 原生 EventSource 不能设置请求头：先获取短期订阅票据，通过 query 参数 ticket 传递
+   * @param albumId 专辑ID
+   * @param onEvent 收到事件时的回调（progress / completed / failed / album / job）
+   * @returns Promise<EventSource> EventSource 实例，调用方负责 close()
+   */
+  subscribeAlbumDownloadEvents: async (
+    albumId: string,
+    onEvent: (type: string, event: any) => void
+  ): Promise<EventSource> => {
+    // EventSource 不能带请求头：先用正常请求头换取短期订阅票据，URL 中不出现 token
+    const { ticket } = await api.post<{ ticket: string; expires_in: number }>(
+      "/xmly/album/download-events/ticket"
+    );
+    const params = new URLSearchParams({ albumId, ticket });
+    const source = new EventSource(
+      `${import.meta.env.VITE_API_BASE_URL}/xmly/album/download-events?${params.toString()}`,
+      { withCredentials: true }
+    );
+    ["progress", "completed", "failed", "album", "job"].forEach((type) => {
+      source.addEventListener(type, (message: MessageEvent) => {
+        try {
+          onEvent(type, JSON.parse(message.data));
+        } catch (e) {
+          console.error("解析下载事件失败:", e);
+        }
+      });
+    });
+    return source;
+  },
+
   /**
    * 获取音频播放链接
    * @param albumId 专辑ID